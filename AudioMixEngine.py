@@ -0,0 +1,237 @@
+import subprocess
+import threading
+from collections import OrderedDict
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+from JobScheduler import JobScheduler
+try:
+    import numpy as np
+except ImportError as e:
+    np = None
+    print(f"Software audio mixing disabled, numpy missing: {e}")
+
+class AudioMixEngine(QObject):
+    SAMPLE_RATE = 48000
+    CHANNELS = 2
+    FRAME_BYTES = 4
+    BLOCK_SEC = 2
+    PREFETCH_BLOCKS = 1
+    MAX_BLOCKS = 48
+    PUSH_INTERVAL_MS = 20
+    BUFFER_MS = 150
+    RESYNC_MS = 200
+
+    def __init__(self, parent=None, scheduler=None):
+        super().__init__(parent)
+        self.available = np is not None
+        self._scheduler = scheduler or JobScheduler.shared()
+        self._lock = threading.Lock()
+        self._blocks = OrderedDict()
+        self._pending = {}
+        self._failed_paths = set()
+        self._sources = []
+        self._sink = None
+        self._device = None
+        self._cursor = 0
+        self._speed = 1.0
+        self._playing = False
+        self._closed = False
+        self.stats = {'underruns': 0, 'resyncs': 0}
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.PUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self._push)
+
+    @property
+    def block_frames(self):
+        return self.BLOCK_SEC * self.SAMPLE_RATE
+
+    def ms_to_frames(self, ms):
+        return int(ms * self.SAMPLE_RATE / 1000)
+
+    def set_sources(self, sources):
+        # fiecare sursa: path, start_ms si end_ms pe timeline, in_ms in fisier, gain liniar
+        self._sources = [{
+            'path': s['path'],
+            'start': self.ms_to_frames(s['start_ms']),
+            'end': self.ms_to_frames(s['end_ms']),
+            'in': self.ms_to_frames(s.get('in_ms', 0)),
+            'gain': float(s.get('gain', 1.0))
+        } for s in sources]
+
+    def sync(self, global_ms, playing, speed=1.0):
+        if not self.available or self._closed:
+            return
+        if not playing or speed <= 0:
+            self.pause()
+            self._request_blocks(self.ms_to_frames(global_ms))
+            return
+        if not self._playing or speed != self._speed:
+            self._speed = speed
+            self._start(global_ms)
+        elif abs(self.position_ms() - global_ms) > self.RESYNC_MS:
+            self.stats['resyncs'] += 1
+            self._start(global_ms)
+
+    def position_ms(self):
+        # ce se aude acum: cursorul de scriere minus ce asteapta inca in bufferul placii
+        queued = 0
+        if self._sink is not None and self._playing:
+            queued = (self._sink.bufferSize() - self._sink.bytesFree()) // self.FRAME_BYTES
+        return (self._cursor - queued * self._speed) * 1000 / self.SAMPLE_RATE
+
+    def pause(self):
+        if not self._playing:
+            return
+        self._playing = False
+        self._timer.stop()
+        self._sink.stop()
+        self._device = None
+
+    def shutdown(self):
+        self.pause()
+        with self._lock:
+            self._closed = True
+            jobs = list(self._pending.values())
+            self._pending.clear()
+            self._blocks.clear()
+        for job in jobs:
+            job.cancel()
+
+    def _open_sink(self):
+        fmt = QAudioFormat()
+        fmt.setSampleRate(self.SAMPLE_RATE)
+        fmt.setChannelCount(self.CHANNELS)
+        fmt.setSampleFormat(QAudioFormat.Int16)
+        device = QMediaDevices.defaultAudioOutput()
+        if device.isNull() or not device.isFormatSupported(fmt):
+            print("Software audio mixing disabled, output device does not accept 48 kHz stereo 16-bit")
+            self.available = False
+            return False
+        self._sink = QAudioSink(device, fmt, self)
+        self._sink.setBufferSize(self.ms_to_frames(self.BUFFER_MS) * self.FRAME_BYTES)
+        return True
+
+    def _start(self, global_ms):
+        if self._sink is None and not self._open_sink():
+            return
+        self._sink.stop()
+        self._cursor = self.ms_to_frames(global_ms)
+        self._device = self._sink.start()
+        self._playing = True
+        self._push()
+        self._timer.start()
+
+    def _push(self):
+        if not self._playing or self._device is None:
+            return
+        frames = self._sink.bytesFree() // self.FRAME_BYTES
+        if frames > 0:
+            self._device.write(self.render(frames).tobytes())
+        self._request_blocks(int(self._cursor))
+
+    def render(self, frames):
+        # la viteza 1 cursorul avanseaza cu un cadru audio pe cadru scris; altfel mixul timeline-ului
+        # se reesantioneaza liniar, ca ceasul audio sa tina pasul cu playhead-ul (tonul se schimba)
+        if self._speed == 1.0:
+            out = self.mix(int(self._cursor), frames)
+            self._cursor += frames
+            return out
+        first = int(self._cursor)
+        positions = (self._cursor - first) + np.arange(frames) * self._speed
+        span = self.mix(first, int(positions[-1]) + 2).astype(np.float32)
+        out = np.empty((frames, self.CHANNELS), dtype=np.float32)
+        for ch in range(self.CHANNELS):
+            out[:, ch] = np.interp(positions, np.arange(len(span)), span[:, ch])
+        self._cursor += frames * self._speed
+        return out.astype(np.int16)
+
+    def mix(self, first, frames):
+        # toate sursele se aduna pe acelasi ceas, deci nu pot deriva una fata de alta
+        out = np.zeros((frames, self.CHANNELS), dtype=np.float32)
+        for src in self._sources:
+            lo = max(first, src['start'])
+            hi = min(first + frames, src['end'])
+            if hi <= lo:
+                continue
+            local = lo - src['start'] + src['in']
+            out[lo - first:hi - first] += self._read(src['path'], local, hi - lo) * src['gain']
+        np.clip(out, -1.0, 1.0, out=out)
+        return (out * 32767).astype(np.int16)
+
+    def _read(self, path, local, count):
+        out = np.zeros((count, self.CHANNELS), dtype=np.float32)
+        filled = 0
+        with self._lock:
+            while filled < count:
+                block, offset = divmod(local + filled, self.block_frames)
+                n = min(count - filled, self.block_frames - offset)
+                data = self._blocks.get((path, block))
+                if data is None:
+                    if path not in self._failed_paths:
+                        self.stats['underruns'] += 1
+                else:
+                    self._blocks.move_to_end((path, block))
+                    part = data[offset:offset + n]
+                    out[filled:filled + len(part)] = part / 32768.0
+                filled += n
+        return out
+
+    def _request_blocks(self, cursor):
+        horizon = cursor + int((self.PREFETCH_BLOCKS + 1) * self.block_frames * max(1.0, self._speed))
+        for src in self._sources:
+            lo = max(cursor, src['start'])
+            hi = min(horizon, src['end'])
+            if hi <= lo:
+                continue
+            first_block = (lo - src['start'] + src['in']) // self.block_frames
+            last_block = (hi - 1 - src['start'] + src['in']) // self.block_frames
+            for block in range(first_block, last_block + 1):
+                priority = JobScheduler.PRIORITY_INTERACTIVE if lo == cursor and block == first_block else JobScheduler.PRIORITY_NORMAL
+                self._schedule(src['path'], block, priority)
+
+    def _schedule(self, path, block, priority):
+        key = (path, block)
+        with self._lock:
+            if self._closed or path in self._failed_paths or key in self._blocks or key in self._pending:
+                return
+            self._pending[key] = self._scheduler.submit(self._decode, key, priority=priority)
+
+    def _store(self, key, data):
+        with self._lock:
+            self._blocks[key] = data
+            while len(self._blocks) > self.MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+
+    def _decode(self, job, key):
+        path, block = key
+        cmd = [
+            'ffmpeg', '-v', 'error', '-ss', str(block * self.BLOCK_SEC), '-i', path,
+            '-t', str(self.BLOCK_SEC), '-vn', '-ac', str(self.CHANNELS), '-ar', str(self.SAMPLE_RATE),
+            '-f', 's16le', '-'
+        ]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            job.attach_process(proc)
+            try:
+                data = proc.stdout.read()
+            finally:
+                proc.stdout.close()
+                proc.wait()
+                job.detach_process(proc)
+            if job.cancelled:
+                return
+            if proc.returncode != 0:
+                with self._lock:
+                    self._failed_paths.add(path)
+                raise RuntimeError("ffmpeg could not decode audio")
+
+            # blocul gol (dupa finalul fisierului sau fara pista audio) se pastreaza ca liniste
+            samples = np.frombuffer(data[:len(data) - len(data) % self.FRAME_BYTES], dtype=np.int16)
+            self._store(key, samples.reshape(-1, self.CHANNELS)[:self.block_frames])
+        except Exception as e:
+            if not job.cancelled:
+                print(f"Audio mix decode failed for {path}: {e}")
+        finally:
+            with self._lock:
+                if self._pending.get(key) is job:
+                    del self._pending[key]
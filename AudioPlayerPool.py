@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+
+class AudioPlayerPool(QObject):
+    player_loaded = Signal(object)
+
+    MAX_PLAYERS = 8
+    # estimare: decoder + buffere audio ale unui QMediaPlayer deschis
+    EST_PLAYER_BYTES = 6 * 1024 * 1024
+
+    def __init__(self, parent=None, max_players=MAX_PLAYERS):
+        super().__init__(parent)
+        self.max_players = max_players
+        self._players = OrderedDict()
+        self._free = []
+        self.stats = {'created': 0, 'reused': 0, 'reloaded': 0, 'evicted': 0, 'released': 0, 'prewarmed': 0}
+
+    def acquire(self, key, path, local_ms, protected=()):
+        player = self._players.pop(key, None)
+        if player is None:
+            player = self._take_player(path, protected)
+        elif player.pool_path == path:
+            self.stats['reused'] += 1
+        self._players[key] = player
+
+        if player.pool_path != path:
+            self._load(player, path, local_ms)
+        return player
+
+    def prewarm(self, key, path, local_ms, protected=()):
+        # clipul porneste in curand: sursa se deschide acum, pe pauza, la punctul de intrare
+        if key in self._players and self._players[key].pool_path == path:
+            return self._players[key]
+        player = self.acquire(key, path, local_ms, protected)
+        player.audioOutput().setVolume(0)
+        player.pool_active = False
+        self.stats['prewarmed'] += 1
+        return player
+
+    def set_active(self, active_keys):
+        for key, player in self._players.items():
+            player.pool_active = key in active_keys
+            if not player.pool_active and player.playbackState() == QMediaPlayer.PlayingState:
+                player.pause()
+        # peste capacitate raman doar daca toate erau in uz; se elibereaza cele mai vechi inactive
+        excess = len(self._players) - self.max_players
+        if excess > 0:
+            for key in [k for k in self._players if k not in active_keys][:excess]:
+                self.release(key)
+
+    def active_players(self):
+        return [p for p in self._players.values() if p.pool_active]
+
+    def release(self, key):
+        player = self._players.pop(key, None)
+        if player is None:
+            return
+        self._unload(player)
+        self.stats['released'] += 1
+        if len(self._players) + len(self._free) < self.max_players:
+            self._free.append(player)
+        else:
+            self._destroy(player)
+
+    def release_missing(self, live_keys):
+        for key in [k for k in self._players if k not in live_keys]:
+            self.release(key)
+
+    def clear(self):
+        for player in list(self._players.values()) + self._free:
+            try:
+                self._unload(player)
+                self._destroy(player)
+            except RuntimeError:
+                pass
+        self._players.clear()
+        self._free.clear()
+
+    def metrics(self):
+        loaded = len(self._players)
+        return {
+            'live': loaded + len(self._free),
+            'loaded': loaded,
+            'free': len(self._free),
+            'playing': sum(1 for p in self._players.values() if p.playbackState() == QMediaPlayer.PlayingState),
+            'approx_bytes': loaded * self.EST_PLAYER_BYTES,
+            **self.stats
+        }
+
+    def _take_player(self, path, protected):
+        # intai un player inactiv care are deja sursa deschisa, apoi unul liber, apoi unul nou,
+        # iar la capacitate maxima cel mai vechi player neprotejat
+        for key, player in self._players.items():
+            if key not in protected and player.pool_path == path:
+                del self._players[key]
+                self.stats['reused'] += 1
+                return player
+        if self._free:
+            return self._free.pop()
+        if len(self._players) >= self.max_players:
+            for key in self._players:
+                if key not in protected:
+                    player = self._players.pop(key)
+                    player.stop()
+                    self.stats['evicted'] += 1
+                    return player
+        return self._create()
+
+    def _create(self):
+        player = QMediaPlayer(self)
+        audio = QAudioOutput(player)
+        player.setAudioOutput(audio)
+        player.pool_path = None
+        player.pool_active = False
+        player.mediaStatusChanged.connect(lambda s, p=player: self._on_status(s, p))
+        self.stats['created'] += 1
+        return player
+
+    def _load(self, player, path, local_ms):
+        player.stop()
+        player.pool_path = path
+        player.waiting_pos = local_ms
+        player.setSource(QUrl.fromLocalFile(path))
+        self.stats['reloaded'] += 1
+
+    def _unload(self, player):
+        player.stop()
+        player.setSource(QUrl())
+        player.pool_path = None
+        player.pool_active = False
+        if hasattr(player, 'waiting_pos'):
+            del player.waiting_pos
+
+    def _destroy(self, player):
+        player.audioOutput().deleteLater()
+        player.deleteLater()
+
+    def _on_status(self, status, player):
+        if status in (QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia) and hasattr(player, 'waiting_pos'):
+            player.setPosition(player.waiting_pos)
+            del player.waiting_pos
+            self.player_loaded.emit(player)
@@ -1,5 +1,5 @@
 import os
-from PySide6.QtWidgets import QWidget, QTabWidget, QListWidget, QVBoxLayout, QListWidgetItem, QSizePolicy
+from PySide6.QtWidgets import QWidget, QTabWidget, QListWidget, QListView, QVBoxLayout, QListWidgetItem, QSizePolicy
 from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QIcon, QPixmap
 
@@ -9,4 +9,11 @@ class ClickableListWidget(QListWidget):
         if not self.itemAt(event.pos()):
             self.clearSelection()
             self.clearFocus()
+        super().mousePressEvent(event)
+
+class ClickableListView(QListView):
+    def mousePressEvent(self, event):
+        if not self.indexAt(event.pos()).isValid():
+            self.clearSelection()
+            self.clearFocus()
         super().mousePressEvent(event)
\ No newline at end of file
@@ -1,14 +1,34 @@
 import os
 import subprocess
 import shutil
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PySide6.QtCore import QThread, Signal
+from base.media_probe import MediaProbe
+from base.media_types import AUDIO_EXT
+from base.ffmpeg_progress import run_ffmpeg, format_progress
 
 class ExportWorker(QThread):
+    TARGET_WIDTH = 1920
+    TARGET_HEIGHT = 1080
+    TARGET_FPS = 30
+    KEYFRAME_TOLERANCE_SEC = 0.5 / 30
+    COPY_PROFILES = ('Constrained Baseline', 'Baseline', 'Main', 'High')
+    MAX_COPY_LEVEL = 42
+    PROGRESS_SCALE = 1000
+    VIDEO_PHASE = 0.9
+    AUDIO_PHASE = 0.08
+    # single-pass: fiecare input e un decoder deschis in acelasi proces ffmpeg
+    MAX_SINGLE_PASS_INPUTS = 32
+    SEEK_GAP_SEC = 30
+
     progress_update = Signal(int, str) 
     finished_success = Signal(str)     
     finished_error = Signal(str)       
 
-    def __init__(self, all_tracks, output_path, temp_folder, img_exts):
+    def __init__(self, all_tracks, output_path, temp_folder, img_exts, max_workers=None, threads_per_encode=2,
+                 allow_stream_copy=True, single_pass=False):
         super().__init__()
 
         self.tracks = all_tracks 
@@ -17,8 +37,29 @@ class ExportWorker(QThread):
         self.img_exts = img_exts
         self.is_cancelled = False
 
+        self.threads_per_encode = max(1, int(threads_per_encode))
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) // self.threads_per_encode
+        self.max_workers = max(1, int(max_workers))
+        self._procs_lock = threading.Lock()
+        self._active_procs = set()
+
+        self.allow_stream_copy = allow_stream_copy
+        self._source_info = {}
+        self.single_pass = single_pass
+
+        self._progress_lock = threading.Lock()
+        self._segment_done = {}
+        self._segment_rates = {}
+        self._video_total_sec = 0.0
+
     def run(self):
         try:
+            if self.single_pass and self._export_single_pass():
+                if self.is_cancelled: return
+                self.finished_success.emit(self.output_path)
+                return
+
             video_parts_dir = os.path.join(self.temp_render_dir, "video_parts")
             os.makedirs(video_parts_dir, exist_ok=True)
             
@@ -26,47 +67,35 @@ class ExportWorker(QThread):
             final_audio_mixed = os.path.join(self.temp_render_dir, "final_mixed.aac")
             render_segments = self._calculate_flattened_timeline()
             total_segments = len(render_segments)
+            chunk_paths = self._render_segments_parallel(render_segments, video_parts_dir)
+            if chunk_paths is None: return
+
             video_chunks_list = []
-            for i, segment in enumerate(render_segments):
-                if self.is_cancelled: return
-                self.progress_update.emit(i, f"Rendering Visual Segment {i+1}/{total_segments}")
-                
-                chunk_name = f"v_chunk_{i:03d}.mp4"
-                chunk_path = os.path.join(video_parts_dir, chunk_name)
-                print(f"Segment {i}: {segment['duration_ms']}ms | Source: {segment['path']}")
-                self._render_video_segment(segment, chunk_path)
-                
+            for chunk_path in chunk_paths:
                 safe_path = chunk_path.replace("\\", "/")
                 video_chunks_list.append(f"file '{safe_path}'")
 
-            self.progress_update.emit(total_segments, "Stitching Visual Track...")
+            self._emit_phase(self.VIDEO_PHASE, "Stitching Visual Track...")
             list_txt = os.path.join(video_parts_dir, "list.txt")
             with open(list_txt, "w", encoding='utf-8') as f:
                 f.write("\n".join(video_chunks_list))
             
-            subprocess.run(
-                f'ffmpeg -y -f concat -safe 0 -i "{list_txt}" -c copy "{final_video_silent}"',
-                shell=True, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            self._run_ffmpeg(['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_txt, '-c', 'copy', final_video_silent])
+            if self.is_cancelled: return
 
 
-            self.progress_update.emit(total_segments + 1, "Mixing Audio Layers...")
+            self._emit_phase(self.VIDEO_PHASE, "Mixing Audio Layers...")
             
             audio_inputs = []
             filter_complex_parts = []
             input_idx = 0
             
-            for track in self.tracks:
-                for clip in track.clips:
-                    if clip.get('is_auto_gap', False): continue
-                    path = clip['path']
-
-                    if path.lower().endswith(tuple(self.img_exts)): continue
-
-                    start_ms = clip['start']
-                    audio_inputs.extend(['-i', path])
-                    filter_complex_parts.append(f"[{input_idx}:a]adelay={start_ms}|{start_ms}[a{input_idx}]")
-                    input_idx += 1
+            for clip in self._collect_audio_clips():
+                start_ms = clip['start']
+                audio_inputs.extend(['-ss', str(clip.get('source_in', 0) / 1000.0),
+                                     '-t', str(clip['duration'] / 1000.0), '-i', clip['path']])
+                filter_complex_parts.append(f"[{input_idx}:a]adelay={start_ms}|{start_ms}[a{input_idx}]")
+                input_idx += 1
             
             has_audio = (input_idx > 0)
             
@@ -85,20 +114,25 @@ class ExportWorker(QThread):
                     '-c:a', 'aac', '-b:a', '192k',
                     final_audio_mixed
                 ]
-                subprocess.run(cmd_audio, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                audio_total_sec = max(c['start'] + c['duration'] for c in self._collect_audio_clips()) / 1000.0
+                self._run_ffmpeg(cmd_audio, audio_total_sec,
+                                 lambda p: self._emit_progress(self.VIDEO_PHASE, self.AUDIO_PHASE, p, "Mixing Audio Layers"))
+                if self.is_cancelled: return
 
-            self.progress_update.emit(total_segments + 2, "Final Muxing...")
+            self._emit_phase(self.VIDEO_PHASE + self.AUDIO_PHASE, "Final Muxing...")
             
             if has_audio:
-                cmd_merge = (
-                    f'ffmpeg -y -i "{final_video_silent}" -i "{final_audio_mixed}" '
-                    f'-c:v copy -c:a copy -shortest "{self.output_path}"'
-                )
+                cmd_merge = [
+                    'ffmpeg', '-y', '-i', final_video_silent, '-i', final_audio_mixed,
+                    '-c:v', 'copy', '-c:a', 'copy', '-shortest', self.output_path
+                ]
             else:
-                cmd_merge = f'ffmpeg -y -i "{final_video_silent}" -c copy "{self.output_path}"'
+                cmd_merge = ['ffmpeg', '-y', '-i', final_video_silent, '-c', 'copy', self.output_path]
                 
-            subprocess.run(cmd_merge, shell=True, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self._run_ffmpeg(cmd_merge)
+            if self.is_cancelled: return
             
+            self._emit_phase(1.0, "Done")
             self.finished_success.emit(self.output_path)
 
         except Exception as e:
@@ -112,98 +146,428 @@ class ExportWorker(QThread):
 
     def cancel(self):
         self.is_cancelled = True
+        with self._procs_lock:
+            procs = list(self._active_procs)
+        for proc in procs:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    def _run_ffmpeg(self, cmd, total_sec=0.0, on_progress=None):
+        if self.is_cancelled: return
+        started = []
+
+        def register(proc):
+            started.append(proc)
+            with self._procs_lock:
+                self._active_procs.add(proc)
+            if self.is_cancelled:
+                proc.kill()
+
+        try:
+            result = run_ffmpeg(cmd, total_sec, on_progress, on_process=register)
+        finally:
+            with self._procs_lock:
+                for proc in started:
+                    self._active_procs.discard(proc)
+        if result.returncode != 0 and not self.is_cancelled:
+            raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
+
+    def _emit_phase(self, fraction, message):
+        self.progress_update.emit(int(fraction * self.PROGRESS_SCALE), message)
+
+    def _emit_progress(self, phase_start, phase_span, progress, label):
+        overall = dict(progress)
+        overall['fraction'] = phase_start + phase_span * progress['fraction']
+        self.progress_update.emit(int(overall['fraction'] * self.PROGRESS_SCALE), f"{label}: {format_progress(overall)}")
+
+    def _on_segment_progress(self, idx, done_sec, progress):
+        # encodarile ruleaza in paralel, deci progresul, fps-ul si viteza se aduna pe toate segmentele active
+        with self._progress_lock:
+            self._segment_done[idx] = done_sec
+            self._segment_rates[idx] = (progress['fps'], progress['speed'])
+            done = sum(self._segment_done.values())
+            fps = sum(rate[0] for rate in self._segment_rates.values())
+            speed = sum(rate[1] for rate in self._segment_rates.values())
+
+        total = self._video_total_sec
+        remaining = max(0.0, total - done)
+        overall = {
+            'fraction': min(1.0, done / total) if total > 0 else 0.0,
+            'fps': fps,
+            'speed': speed,
+            'eta_sec': remaining / speed if speed > 0 else None
+        }
+        self._emit_progress(0.0, self.VIDEO_PHASE, overall, "Rendering video")
+
+    def _on_segment_finished(self, idx, duration_sec):
+        with self._progress_lock:
+            self._segment_done[idx] = duration_sec
+            self._segment_rates.pop(idx, None)
+
+    def _render_segments_parallel(self, render_segments, video_parts_dir):
+        total_segments = len(render_segments)
+        chunk_paths = [
+            os.path.join(video_parts_dir, f"v_chunk_{i:03d}.mp4") for i in range(total_segments)
+        ]
+        rendered_parts = [None] * total_segments
+        copy_plans = self._plan_export_copies(render_segments)
+
+        self._video_total_sec = sum(segment['duration_ms'] for segment in render_segments) / 1000.0
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            for i, segment in enumerate(render_segments):
+                print(f"Segment {i}: {segment['duration_ms']}ms | Source: {segment['path']}")
+                on_progress = lambda done_sec, p, idx=i: self._on_segment_progress(idx, done_sec, p)
+                futures[pool.submit(self._render_video_segment, segment, copy_plans[i], chunk_paths[i], on_progress)] = i
+
+            try:
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    rendered_parts[idx] = future.result()
+                    if self.is_cancelled: break
+                    done += 1
+                    self._on_segment_finished(idx, render_segments[idx]['duration_ms'] / 1000.0)
+                    with self._progress_lock:
+                        finished_sec = sum(self._segment_done.values())
+                    fraction = finished_sec / self._video_total_sec if self._video_total_sec > 0 else 1.0
+                    self._emit_phase(self.VIDEO_PHASE * min(1.0, fraction),
+                                     f"Rendering Visual Segment {done}/{total_segments}")
+            except Exception:
+                self.cancel()
+                raise
+            finally:
+                if self.is_cancelled:
+                    pool.shutdown(wait=True, cancel_futures=True)
+
+        if self.is_cancelled: return None
+        return rendered_parts
+
+    def _probe_source(self, path):
+        if path in self._source_info:
+            return self._source_info[path]
+
+        info = {'conformant': False, 'keyframes': [], 'duration': 0.0, 'codec_config': None}
+        self._source_info[path] = info
+        if path.lower().endswith(tuple(self.img_exts)):
+            return info
+
+        try:
+            probe = MediaProbe.shared()
+            media = probe.probe(path)
+            if not media['has_video']:
+                return info
+
+            info['conformant'] = (
+                media['video_codec'] == 'h264'
+                and media['width'] == self.TARGET_WIDTH
+                and media['height'] == self.TARGET_HEIGHT
+                and media['pix_fmt'] == 'yuv420p'
+                and abs(media['fps'] - self.TARGET_FPS) < 0.01
+                and media['sample_aspect_ratio'] in ('1:1', '0:1')
+                and media['constant_fps']
+                and media['video_profile'] in self.COPY_PROFILES
+                and 0 < media['video_level'] <= self.MAX_COPY_LEVEL
+                and media['video_extradata'] is not None
+            )
+            if not info['conformant']:
+                return info
+
+            # SPS/PPS din avcC: doua surse se pot lipi fara recodare doar daca sunt identice
+            info['codec_config'] = (media['video_profile'], media['video_level'], media['video_extradata'])
+            info['duration'] = media['duration']
+
+            info['keyframes'] = probe.keyframes(path)
+        except Exception as e:
+            print(f"Probe failed for {path}, segment will be re-encoded: {e}")
+            info['conformant'] = False
+
+        return info
+
+    def _plan_stream_copy(self, segment):
+        # (start, durata) cand segmentul incepe pe un keyframe si se termina pe altul sau la finalul sursei
+        info = self._probe_source(segment['path'])
+        if not info['conformant'] or not info['keyframes']:
+            return None
+
+        start = segment['source_start_ms'] / 1000.0
+        end = start + segment['duration_ms'] / 1000.0
+        tol = self.KEYFRAME_TOLERANCE_SEC
+
+        starts_on_key = any(abs(k - start) <= tol for k in info['keyframes'])
+        ends_on_key = any(abs(k - end) <= tol for k in info['keyframes']) or end >= info['duration'] - tol
+        if not (starts_on_key and ends_on_key):
+            return None
+        return start, end - start
+
+    def _plan_export_copies(self, render_segments):
+        # concat-ul MP4 pastreaza doar avcC-ul primului fisier, deci o bucata recodata (sau copiata
+        # din alta configuratie) dupa una copiata se decodeaza gresit; copierea se face doar cand
+        # toata lista iese din copiere cu aceeasi configuratie, altfel se recodeaza tot
+        no_copy = [None] * len(render_segments)
+        if not self.allow_stream_copy:
+            return no_copy
+
+        plans = []
+        configs = set()
+        for segment in render_segments:
+            if segment['is_gap'] or not segment['path']:
+                return no_copy
+            plan = self._plan_stream_copy(segment)
+            if plan is None:
+                return no_copy
+            configs.add(self._source_info[segment['path']]['codec_config'])
+            plans.append(plan)
+        if len(configs) != 1:
+            return no_copy
+        return plans
 
     def _calculate_flattened_timeline(self):
-        cut_points = set()
-        cut_points.add(0)
-        
-        visual_clips_map = [] 
+        return self._merge_contiguous_segments(self._sweep_segments())
+
+    def _sweep_segments(self):
+        cut_points = {0}
+        visual_clips = []
 
         for track_idx, track in enumerate(self.tracks):
             for clip in track.clips:
                 path = clip['path']
-                is_audio_file = path.lower().endswith(('.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'))
+                is_audio_file = os.path.splitext(path)[1].lower() in AUDIO_EXT
                 is_proxy_audio = "_converted.mov" in path or "_converted.mp4" in path
                 
                 if is_audio_file or is_proxy_audio:
+                    # clipurile audio nu au imagine, dar video-ul trebuie sa tina cat ele
+                    cut_points.add(clip['start'] + clip['duration'])
                     continue
 
-                cut_points.add(clip['start'])
-                cut_points.add(clip['start'] + clip['duration'])
-                
-                visual_clips_map.append({
-                    'track_idx': track_idx,
-                    'start': clip['start'],
-                    'end': clip['start'] + clip['duration'],
-                    'data': clip
-                })
-        
-        sorted_points = sorted(list(cut_points))
+                start = clip['start']
+                end = start + clip['duration']
+                cut_points.add(start)
+                cut_points.add(end)
+                if not clip.get('is_auto_gap', False):
+                    visual_clips.append((start, end, len(visual_clips), clip))
+
+        # ordinea de prioritate e (track_idx, pozitia in track), exact ordinea de enumerare
+        visual_clips.sort(key=lambda item: item[0])
+        sorted_points = sorted(cut_points)
         segments = []
-        
+        active = []
+        next_clip = 0
+
         for i in range(len(sorted_points) - 1):
             t_start = sorted_points[i]
-            t_end = sorted_points[i+1]
-            duration = t_end - t_start
-            if duration <= 0: continue
-            winner_clip_data = None
-            candidates = []
-            for item in visual_clips_map:
-                if item['start'] <= t_start and item['end'] >= t_end:
-                    candidates.append(item)
-            candidates.sort(key=lambda x: x['track_idx']) 
-            
-            for cand in candidates:
-                clip_info = cand['data']
-                if not clip_info.get('is_auto_gap', False):
-                    winner_clip_data = clip_info
-                    break 
-            
-            if winner_clip_data:
-                offset_in_clip = t_start - winner_clip_data['start']
+            t_end = sorted_points[i + 1]
+
+            while next_clip < len(visual_clips) and visual_clips[next_clip][0] <= t_start:
+                start, end, order, clip = visual_clips[next_clip]
+                heapq.heappush(active, (order, end, clip))
+                next_clip += 1
+            while active and active[0][1] < t_end:
+                heapq.heappop(active)
+
+            if active:
+                winner_clip_data = active[0][2]
                 seg = {
                     'path': winner_clip_data['path'],
-                    'source_start_ms': offset_in_clip,
-                    'duration_ms': duration,
+                    'source_start_ms': t_start - winner_clip_data['start'] + winner_clip_data.get('source_in', 0),
+                    'duration_ms': t_end - t_start,
                     'is_gap': False
                 }
             else:
                 seg = {
                     'path': None,
                     'source_start_ms': 0,
-                    'duration_ms': duration,
+                    'duration_ms': t_end - t_start,
                     'is_gap': True
                 }
             segments.append(seg)
         return segments
 
-    def _render_video_segment(self, segment, output_path):
+    def _merge_contiguous_segments(self, segments):
+        merged = []
+        for seg in segments:
+            if merged:
+                prev = merged[-1]
+                same_gap = prev['is_gap'] and seg['is_gap']
+                same_source = (not prev['is_gap'] and not seg['is_gap'] and prev['path'] == seg['path'] and
+                               prev['source_start_ms'] + prev['duration_ms'] == seg['source_start_ms'])
+                if same_gap or same_source:
+                    prev['duration_ms'] += seg['duration_ms']
+                    continue
+            merged.append(dict(seg))
+        return merged
+
+    def _collect_audio_clips(self):
+        audio_clips = []
+        for track in self.tracks:
+            for clip in track.clips:
+                if clip.get('is_auto_gap', False): continue
+                if clip['path'].lower().endswith(tuple(self.img_exts)): continue
+                audio_clips.append(clip)
+        return audio_clips
+
+    def _group_source_runs(self, uses):
+        # uses: (path, start_sec, end_sec, tag) in ordinea in care filtrele le consuma. Un input se
+        # refoloseste (split + trim) cat timp sursa se citeste inainte; la intoarcere sau la un salt
+        # mai mare de SEEK_GAP_SEC se deschide alt input cu seek, ca split-ul sa nu tina cadre in memorie
+        runs = []
+        open_runs = {}
+        for path, start, end, tag in uses:
+            run = open_runs.get(path)
+            if run is None or start < run['end'] or start - run['end'] > self.SEEK_GAP_SEC:
+                run = {'path': path, 'start': start, 'end': end, 'uses': []}
+                open_runs[path] = run
+                runs.append(run)
+            run['end'] = end
+            run['uses'].append((start - run['start'], end - start, tag))
+        return runs
+
+    def _split_stream(self, parts, stream, count, prefix, audio=False):
+        if count == 1:
+            return [stream]
+        labels = [f"[{prefix}_{k}]" for k in range(count)]
+        parts.append(f"{stream}{'asplit' if audio else 'split'}={count}{''.join(labels)}")
+        return labels
+
+    def _build_single_pass_command(self, render_segments):
+        fit = (f"scale={self.TARGET_WIDTH}:{self.TARGET_HEIGHT}:force_original_aspect_ratio=decrease,"
+               f"pad={self.TARGET_WIDTH}:{self.TARGET_HEIGHT}:(ow-iw)/2:(oh-ih)/2,setsar=1")
+        vf = f"{fit},fps={self.TARGET_FPS},format=yuv420p"
+        parts = []
+        video_labels = []
+        video_uses = []
+        image_uses = {}
+
+        for i, seg in enumerate(render_segments):
+            duration_sec = seg['duration_ms'] / 1000.0
+            label = f"[v{i}]"
+            if seg['is_gap'] or not seg['path']:
+                parts.append(f"color=c=black:s={self.TARGET_WIDTH}x{self.TARGET_HEIGHT}:r={self.TARGET_FPS}:d={duration_sec},"
+                             f"format=yuv420p{label}")
+            elif seg['path'].lower().endswith(tuple(self.img_exts)):
+                image_uses.setdefault(seg['path'], []).append((duration_sec, label))
+            else:
+                start_sec = seg['source_start_ms'] / 1000.0
+                video_uses.append((seg['path'], start_sec, start_sec + duration_sec, label))
+            video_labels.append(label)
+
+        audio_uses = []
+        for clip in sorted(self._collect_audio_clips(), key=lambda c: c['start']):
+            start_sec = clip.get('source_in', 0) / 1000.0
+            audio_uses.append((clip['path'], start_sec, start_sec + clip['duration'] / 1000.0,
+                               (f"[a{len(audio_uses)}]", clip['start'])))
+
+        video_runs = self._group_source_runs(video_uses)
+        audio_runs = self._group_source_runs(audio_uses)
+        if len(video_runs) + len(image_uses) + len(audio_runs) > self.MAX_SINGLE_PASS_INPUTS:
+            return None
+
+        inputs = []
+        idx = 0
+        for run in video_runs:
+            inputs.extend(['-ss', str(run['start']), '-i', run['path']])
+            branches = self._split_stream(parts, f"[{idx}:v]", len(run['uses']), f"s{idx}")
+            for branch, (offset, duration_sec, label) in zip(branches, run['uses']):
+                parts.append(f"{branch}trim=start={offset}:duration={duration_sec},setpts=PTS-STARTPTS,{vf}{label}")
+            idx += 1
+
+        for path, uses in image_uses.items():
+            # imaginea intra ca un singur cadru; loop il repeta doar cand concat ajunge la segment
+            inputs.extend(['-i', path])
+            branches = self._split_stream(parts, f"[{idx}:v]", len(uses), f"s{idx}")
+            for branch, (duration_sec, label) in zip(branches, uses):
+                frames = max(1, round(duration_sec * self.TARGET_FPS))
+                parts.append(f"{branch}{fit},format=yuv420p,loop=loop={frames - 1}:size=1:start=0,"
+                             f"setpts=N/{self.TARGET_FPS}/TB,fps={self.TARGET_FPS}{label}")
+            idx += 1
+
+        parts.append(f"{''.join(video_labels)}concat=n={len(video_labels)}:v=1:a=0[vout]")
+
+        audio_labels = []
+        for run in audio_runs:
+            inputs.extend(['-ss', str(run['start']), '-i', run['path']])
+            branches = self._split_stream(parts, f"[{idx}:a]", len(run['uses']), f"s{idx}", audio=True)
+            for branch, (offset, duration_sec, (label, delay_ms)) in zip(branches, run['uses']):
+                parts.append(f"{branch}atrim=start={offset}:duration={duration_sec},asetpts=PTS-STARTPTS,"
+                             f"adelay={delay_ms}|{delay_ms}{label}")
+                audio_labels.append(label)
+            idx += 1
+
+        cmd = ['ffmpeg', '-y', *inputs]
+        maps = ['-map', '[vout]']
+        if audio_labels:
+            parts.append(f"{''.join(audio_labels)}amix=inputs={len(audio_labels)}:dropout_transition=0:normalize=0[aout]")
+            maps.extend(['-map', '[aout]', '-c:a', 'aac', '-b:a', '192k', '-shortest'])
+
+        cmd.extend(['-filter_complex', ";".join(parts), *maps])
+        cmd.extend(['-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+                    self.output_path])
+        return cmd
+
+    def _export_single_pass(self):
+        render_segments = self._calculate_flattened_timeline()
+        cmd = self._build_single_pass_command(render_segments)
+        if cmd is None:
+            print(f"Single-pass export needs more than {self.MAX_SINGLE_PASS_INPUTS} inputs, using chunked export")
+            return False
+        self.progress_update.emit(0, f"Rendering {len(render_segments)} segments in a single pass...")
+        total_sec = sum(segment['duration_ms'] for segment in render_segments) / 1000.0
+        self._run_ffmpeg(cmd, total_sec, lambda p: self._emit_progress(0.0, 1.0, p, "Rendering"))
+        return True
+
+    def _render_video_segment(self, segment, copy_plan, output_path, on_progress=None):
+        if copy_plan:
+            self._copy_segment(segment, copy_plan, output_path, on_progress)
+        else:
+            self._encode_segment(segment, output_path, on_progress)
+        return output_path
+
+    def _copy_segment(self, segment, copy_plan, output_path, on_progress=None):
+        start_sec, duration_sec = copy_plan
+        copy_progress = None
+        if on_progress is not None:
+            copy_progress = lambda p: on_progress(min(p['out_time_sec'], duration_sec), p)
+        # -t taie dupa DTS si ar lua si pachetele de inceput ale GOP-ului urmator; numarul de cadre e exact
+        self._run_ffmpeg([
+            'ffmpeg', '-y', '-ss', str(start_sec), '-i', segment['path'],
+            '-frames:v', str(round(duration_sec * self.TARGET_FPS)), '-an', '-c:v', 'copy', output_path
+        ], duration_sec, copy_progress)
+
+    def _encode_segment(self, segment, output_path, on_progress=None):
         duration_sec = segment['duration_ms'] / 1000.0
         start_sec = segment['source_start_ms'] / 1000.0
         path = segment['path']
         is_gap = segment['is_gap']
         vf = "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2,setsar=1,fps=30"
-        cmd = ""
+        encode_args = [
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+            '-threads', str(self.threads_per_encode)
+        ]
         if is_gap or not path:
-             cmd = (
-                f'ffmpeg -y -f lavfi -i color=c=black:s=1920x1080:r=30 '
-                f'-t {duration_sec} -an '
-                f'-c:v libx264 -preset ultrafast -pix_fmt yuv420p '
-                f'"{output_path}"'
-            )
+             cmd = [
+                'ffmpeg', '-y', '-f', 'lavfi', '-i', 'color=c=black:s=1920x1080:r=30',
+                '-t', str(duration_sec), '-an',
+                *encode_args,
+                output_path
+            ]
         elif path.lower().endswith(tuple(self.img_exts)):
-            cmd = (
-                f'ffmpeg -y -loop 1 -i "{path}" '
-                f'-t {duration_sec} -vf "{vf}" -an '
-                f'-c:v libx264 -preset ultrafast -pix_fmt yuv420p '
-                f'"{output_path}"'
-            )
+            cmd = [
+                'ffmpeg', '-y', '-loop', '1', '-i', path,
+                '-t', str(duration_sec), '-vf', vf, '-an',
+                *encode_args,
+                output_path
+            ]
         else:
-            cmd = (
-                f'ffmpeg -y -ss {start_sec} -i "{path}" '
-                f'-t {duration_sec} -vf "{vf}" -an '
-                f'-c:v libx264 -preset ultrafast -pix_fmt yuv420p '
-                f'"{output_path}"'
-            )
-            
-        subprocess.run(cmd, shell=True, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
\ No newline at end of file
+            cmd = [
+                'ffmpeg', '-y', '-ss', str(start_sec), '-i', path,
+                '-t', str(duration_sec), '-vf', vf, '-an',
+                *encode_args,
+                output_path
+            ]
+
+        progress_cb = None
+        if on_progress is not None:
+            progress_cb = lambda p: on_progress(min(p['out_time_sec'], duration_sec), p)
+        self._run_ffmpeg(cmd, duration_sec, progress_cb)
\ No newline at end of file
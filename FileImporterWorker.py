@@ -1,12 +1,17 @@
 import os
+import glob
+import filecmp
 import hashlib
-import subprocess
-import time
-import shutil
 from PySide6.QtCore import QThread, Signal
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 class FileImporterWorker(QThread):
     finished_success = Signal(str, str)
+    SAMPLE_BYTES = 1024 * 1024
+    FICLONE = 0x40049409
     
     def __init__(self, file_path, cache_dir):
         super().__init__()
@@ -19,48 +24,71 @@ class FileImporterWorker(QThread):
             return
         base_name = os.path.basename(self.file_path)
         name, ext = os.path.splitext(base_name)
-        file_hash = hashlib.md5(f"{self.file_path}_{time.time()}".encode()).hexdigest()[:8]
+        ext = ext.lower()
+        file_hash = self._content_fingerprint(self.file_path)
         
-        audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
-        
-        if ext.lower() in audio_exts:
-            new_name = f"{name}_{file_hash}_converted.mov"
-            new_path = os.path.join(self.cache_dir, new_name)
-            
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            bg_image_path = os.path.join(base_dir, "icons", "blackCat.jpg")
-            if not os.path.exists(bg_image_path):
-                bg_image_path = os.path.join(base_dir, "icons", "blackCat.png")
-            
-            if os.path.exists(bg_image_path):
-                cmd = (
-                    f'ffmpeg -y -loop 1 -i "{bg_image_path}" '
-                    f'-i "{self.file_path}" '
-                    f'-c:v libx264 -tune stillimage -pix_fmt yuv420p '
-                    f'-vf "scale=1920:1080,format=yuv420p" '
-                    f'-c:a pcm_s16le -ar 48000 -ac 2 '
-                    f'-shortest "{new_path}"'
-                )
-            else:
-                cmd = (
-                    f'ffmpeg -y -f lavfi -i color=c=black:s=1920x1080:r=30 '
-                    f'-i "{self.file_path}" '
-                    f'-c:v libx264 -g 30 -pix_fmt yuv420p ' 
-                    f'-c:a pcm_s16le -ar 48000 -ac 2 '
-                    f'-shortest "{new_path}"'
-                )
+        existing = self._find_cached(file_hash, ext)
+        if existing:
+            self.finished_success.emit(self.file_path, existing)
+            return
 
+        new_path = os.path.join(self.cache_dir, f"{name}_{file_hash}{ext}")
+        # amprenta e doar pe esantioane; alt continut cu aceeasi amprenta primeste alt nume, nu il suprascrie
+        collision = 1
+        while os.path.lexists(new_path):
+            new_path = os.path.join(self.cache_dir, f"{name}_{file_hash}_{collision}{ext}")
+            collision += 1
+        try:
+            linked = self._link_into_cache(self.file_path, new_path)
+            # fara link posibil, clipul foloseste direct fisierul original
+            self.finished_success.emit(self.file_path, linked or self.file_path)
+        except:
+            self.finished_success.emit(self.file_path, self.file_path)
+
+    def _content_fingerprint(self, path):
+        size = os.path.getsize(path)
+        h = hashlib.md5(f"{size}".encode())
+        with open(path, "rb") as f:
+            for offset in (0, size // 2, max(0, size - self.SAMPLE_BYTES)):
+                f.seek(offset)
+                h.update(f.read(self.SAMPLE_BYTES))
+        return h.hexdigest()[:16]
+
+    def _find_cached(self, file_hash, ext):
+        size = os.path.getsize(self.file_path)
+        for candidate in glob.glob(os.path.join(glob.escape(self.cache_dir), f"*_{file_hash}*")):
+            if os.path.splitext(candidate)[1].lower() != ext:
+                continue
+            if not os.path.exists(candidate):
+                os.unlink(candidate)
+                continue
+            if os.path.getsize(candidate) != size:
+                continue
+            # amprenta vede doar trei esantioane; doua inregistrari CBR pot coincide pe ele
+            if os.path.samefile(candidate, self.file_path) or filecmp.cmp(candidate, self.file_path, shallow=False):
+                return candidate
+        return None
+
+    def _reflink(self, src, dst):
+        if fcntl is None:
+            raise OSError("reflink not supported on this platform")
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), self.FICLONE, s.fileno())
+
+    def _link_into_cache(self, src, dst):
+        src = os.path.abspath(src)
+        tmp_path = dst + ".part"
+        last_error = None
+        for method in (self._reflink, os.link, os.symlink):
             try:
-                subprocess.run(cmd, shell=True, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                self.finished_success.emit(self.file_path, new_path)
-            except Exception as e:
-                print(f"Conversion Error: {e}")
-                self.finished_success.emit(self.file_path, self.file_path)
-        else:
-            new_name = f"{name}_{file_hash}{ext}"
-            new_path = os.path.join(self.cache_dir, new_name)
-            try:
-                shutil.copy2(self.file_path, new_path)
-                self.finished_success.emit(self.file_path, new_path)
-            except:
-                self.finished_success.emit(self.file_path, self.file_path)
\ No newline at end of file
+                if os.path.lexists(tmp_path):
+                    os.unlink(tmp_path)
+                method(src, tmp_path)
+                os.replace(tmp_path, dst)
+                return dst
+            except (OSError, NotImplementedError) as e:
+                last_error = e
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        print(f"Import could not link {src} into the cache, using it in place: {last_error}")
+        return None
\ No newline at end of file
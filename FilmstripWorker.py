@@ -0,0 +1,162 @@
+import math
+import subprocess
+import threading
+from collections import OrderedDict
+from PySide6.QtCore import QObject, Signal, QRect
+from PySide6.QtGui import QImage, QPainter
+from JobScheduler import JobScheduler
+
+class FilmstripWorker(QObject):
+    tile_ready = Signal(str)
+
+    FRAME_WIDTH = 100
+    FRAME_HEIGHT = 56
+    FRAMES_PER_TILE = 16
+    MAX_BYTES = 96 * 1024 * 1024
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes=None, scheduler=None):
+        super().__init__()
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self._scheduler = scheduler or JobScheduler.shared()
+        self._lock = threading.Lock()
+        self._tiles = OrderedDict()
+        self._bytes = 0
+        self._pending = {}
+        self._failed = set()
+        self._failed_paths = set()
+        self._closed = False
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def level_for(self, pixels_per_second):
+        # intervalul dintre cadre e 2^level secunde, cel mult latimea unui cadru pe ecran
+        return int(math.floor(math.log2(self.FRAME_WIDTH / pixels_per_second)))
+
+    def frame_at(self, path, level, frame_idx):
+        tile_idx, offset = divmod(frame_idx, self.FRAMES_PER_TILE)
+        tile = self._tile(path, level, tile_idx)
+        if tile is None or offset * self.FRAME_WIDTH >= tile.width():
+            return None, None
+        return tile, QRect(offset * self.FRAME_WIDTH, 0, self.FRAME_WIDTH, self.FRAME_HEIGHT)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._pending.values())
+        for job in jobs:
+            job.cancel()
+
+    def _tile(self, path, level, tile_idx):
+        key = (path, level, tile_idx)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+
+        tile = self._derive_from_finer(path, level, tile_idx)
+        if tile is not None:
+            self._store(key, tile)
+            return tile
+
+        with self._lock:
+            if self._closed or path in self._failed_paths:
+                return None
+            if key not in self._pending and key not in self._failed:
+                self._pending[key] = self._scheduler.submit(
+                    self._extract, key, priority=JobScheduler.PRIORITY_BACKGROUND)
+        return None
+
+    def _derive_from_finer(self, path, level, tile_idx):
+        with self._lock:
+            first = self._tiles.get((path, level - 1, tile_idx * 2))
+            second = self._tiles.get((path, level - 1, tile_idx * 2 + 1))
+        if first is None:
+            return None
+        last_tile = first.width() < self.FRAMES_PER_TILE * self.FRAME_WIDTH
+        if second is None and not last_tile:
+            return None
+
+        frames = [(first, i) for i in range(0, first.width() // self.FRAME_WIDTH, 2)]
+        if second is not None:
+            frames += [(second, i) for i in range(0, second.width() // self.FRAME_WIDTH, 2)]
+        return self._compose(frames)
+
+    def _compose(self, frames):
+        tile = QImage(len(frames) * self.FRAME_WIDTH, self.FRAME_HEIGHT, QImage.Format_RGB888)
+        painter = QPainter(tile)
+        for n, (source, i) in enumerate(frames):
+            painter.drawImage(n * self.FRAME_WIDTH, 0, source,
+                              i * self.FRAME_WIDTH, 0, self.FRAME_WIDTH, self.FRAME_HEIGHT)
+        painter.end()
+        return tile
+
+    def _store(self, key, tile):
+        with self._lock:
+            if key in self._tiles:
+                self._bytes -= self._tiles[key].sizeInBytes()
+            self._tiles[key] = tile
+            self._bytes += tile.sizeInBytes()
+            while self._bytes > self.max_bytes and len(self._tiles) > 1:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= evicted.sizeInBytes()
+
+    def _extract(self, job, key):
+        path, level, tile_idx = key
+        interval = 2.0 ** level
+        start = tile_idx * self.FRAMES_PER_TILE * interval
+        w, h = self.FRAME_WIDTH, self.FRAME_HEIGHT
+        cmd = [
+            'ffmpeg', '-v', 'error', '-ss', str(start), '-i', path,
+            '-t', str(self.FRAMES_PER_TILE * interval), '-an',
+            '-vf', f"fps=1/{interval},scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                   f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
+            '-frames:v', str(self.FRAMES_PER_TILE),
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'
+        ]
+        try:
+            if self._closed:
+                return
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            job.attach_process(proc)
+            try:
+                data = proc.stdout.read()
+            finally:
+                proc.stdout.close()
+                proc.wait()
+                job.detach_process(proc)
+            if job.cancelled:
+                return
+
+            if proc.returncode != 0:
+                with self._lock:
+                    self._failed_paths.add(path)
+                raise RuntimeError("ffmpeg could not decode video")
+
+            frame_bytes = w * h * 3
+            count = len(data) // frame_bytes
+            if count == 0:
+                raise RuntimeError("ffmpeg produced no frames")
+
+            frames = []
+            for i in range(count):
+                image = QImage(data[i * frame_bytes:(i + 1) * frame_bytes], w, h, w * 3, QImage.Format_RGB888)
+                frames.append((image.copy(), 0))
+            self._store(key, self._compose(frames))
+            self.tile_ready.emit(path)
+        except Exception as e:
+            if job.cancelled:
+                return
+            print(f"Filmstrip tile failed for {path}: {e}")
+            with self._lock:
+                self._failed.add(key)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
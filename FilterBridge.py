@@ -1,11 +1,11 @@
 import os
-import shutil
-import hashlib
 import subprocess
 import tempfile
 # New Block
 import atexit
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 # End OF Block
 from PySide6.QtCore import QObject, Signal, QTimeLine
 try:
@@ -29,18 +29,33 @@ try:
     from composition.echo import Echo
     from composition.delay import Delay
     from composition.chorus import Chorus
+    from base.filter_graph import FilterGraph
+    from base.media_probe import MediaProbe
+    from base.ffmpeg_progress import CancelToken, ProcessingCancelled, run_ffmpeg
+    from RenderCache import RenderCache
 except ImportError as e:
     print(f"Eroare import module externe:{e}")
 
 class FilterBridge(QObject):
-    processing_finished = Signal(str, dict) 
-    processing_error = Signal(str)
+    # ultimul argument e token-ul jobului, ca rezultatele din lot sa ajunga la clipul corect
+    processing_finished = Signal(str, dict, object)
+    processing_error = Signal(str, object)
+    processing_progress = Signal(dict)
+    processing_cancelled = Signal(str, object)
 
-    def __init__(self, cache_dir):
+    def __init__(self, cache_dir, use_filter_graph=True, max_workers=None):
         super().__init__()
         self.cache_dir = cache_dir
+        self.use_filter_graph = use_filter_graph
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) // 2
+        self.max_workers = max(1, int(max_workers))
+        self._pool = None
+        self._tokens_lock = threading.Lock()
+        self._tokens = {}
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
+        self.render_cache = RenderCache.shared(self.cache_dir)
         atexit.register(self._cleanup_on_exit)
 
     def _cleanup_on_exit(self):
@@ -65,18 +80,47 @@ class FilterBridge(QObject):
         except Exception:
             pass 
 
+    # apelate din thread-ul UI, nu prin semnal: process_clip tine ocupat thread-ul bridge-ului
+    def begin_job(self, original_path):
+        token = CancelToken()
+        with self._tokens_lock:
+            stale = self._tokens.get(original_path)
+            self._tokens[original_path] = token
+        if stale is not None:
+            stale.cancel()
+        return token
+
+    def cancel(self, original_path=None):
+        with self._tokens_lock:
+            if original_path is None:
+                tokens = list(self._tokens.values())
+            else:
+                tokens = [t for t in [self._tokens.get(original_path)] if t is not None]
+        for token in tokens:
+            token.cancel()
+
+    def process_batch(self, jobs):
+        # jobs: lista de (original_path, filter_stack, token) cu token-uri din begin_job
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="filter")
+        for original_path, filter_stack, token in jobs:
+            self._pool.submit(self.process_clip, original_path, filter_stack, token)
+
+    def shutdown(self):
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _end_job(self, original_path, token):
+        with self._tokens_lock:
+            if self._tokens.get(original_path) is token:
+                del self._tokens[original_path]
 
     def get_file_duration(self, file_path):
         if not os.path.exists(file_path): return 0
         try:
-            cmd = [
-                'ffprobe', '-v', 'error', 
-                '-show_entries', 'format=duration', 
-                '-of', 'default=noprint_wrappers=1:nokey=1', 
-                file_path
-            ]
-            result = subprocess.check_output(cmd, encoding='utf-8').strip()
-            return int(float(result) * 1000)
+            return MediaProbe.shared().duration_ms(file_path)
         except:
             return 0
 
@@ -84,23 +128,14 @@ class FilterBridge(QObject):
         if not os.path.exists(file_path): 
             return 0, 0
         try:
-            cmd = [
-                'ffprobe', 
-                '-v', 'error', 
-                '-select_streams', 'v:0', 
-                '-show_entries', 'stream=width,height', 
-                '-of', 'csv=s=x:p=0', 
-                file_path
-            ]
-            result = subprocess.check_output(cmd, encoding='utf-8').strip()
-            parts = result.split('x')
-            if len(parts) == 2: 
-                return int(parts[0]), int(parts[1])
+            width, height = MediaProbe.shared().dimensions(file_path)
+            if width and height:
+                return width, height
         except Exception as e:
             pass
         return 1920, 1080
 
-    def _prepare_secondary_clip(self, secondary_path, target_w, target_h):
+    def _prepare_secondary_clip(self, secondary_path, target_w, target_h, cancel_token=None):
         sec_w, sec_h = self.get_video_dimensions(secondary_path)
         if sec_w == target_w and sec_h == target_h:
             return secondary_path
@@ -117,225 +152,376 @@ class FilterBridge(QObject):
             temp_resized
         ]
         
-        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        result = run_ffmpeg(cmd, cancel_token=cancel_token)
+        if result.returncode != 0:
+            if os.path.exists(temp_resized):
+                os.unlink(temp_resized)
+            raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
         return temp_resized
 
-    def process_clip(self, original_path, filter_stack):
-        if not os.path.exists(original_path):
-            self.processing_error.emit("Fisierul sursa nu exista.")
-            return
+    def _build_stages(self, filter_stack, main_w, main_h):
+        stages = []
 
-        qt_timeline = QTimeLine()
-        qt_timeline.setProperty("input_file", original_path)
-        qt_timeline.setProperty("original_file", original_path) 
+        transforms = filter_stack.get('Transforms', {}).get('Video', {})
+        fps_data = transforms.get('Change FPS', {})
+        if fps_data.get('enabled', False):
+            target_fps = int(fps_data.get('fps', 30))
+            stages.append((
+                {'op': 'Change FPS', 'fps': target_fps},
+                lambda t, fps=target_fps: ChangeFPS(fps=fps).applyTransformation(t)
+            ))
 
-        try:
-            main_w, main_h = self.get_video_dimensions(original_path)
-            transforms = filter_stack.get('Transforms', {}).get('Video', {})
-            fps_data = transforms.get('Change FPS', {})
-            if fps_data.get('enabled', False):
-                target_fps = int(fps_data.get('fps', 30))
-                qt_timeline = ChangeFPS(fps=target_fps).applyTransformation(qt_timeline)
-            speed_data = transforms.get('Playback speed', {})
-            if speed_data.get('enabled', False):
-                factor = float(speed_data.get('Factor', 1.0))
-                if factor > 0.01:
-                    qt_timeline = PlaybackSpeed(factor=factor).applyTransformation(qt_timeline)
-            crop_data = transforms.get('Crop', {})
-            if crop_data.get('enabled', False):
-                req_w = int(crop_data.get('Width', 0))
-                req_h = int(crop_data.get('Height', 0))
-                req_x = int(crop_data.get('X', 0))
-                req_y = int(crop_data.get('Y', 0))
-                
-                safe_w = min(req_w, main_w) if req_w > 0 else main_w
-                safe_h = min(req_h, main_h) if req_h > 0 else main_h
-                
-                safe_x = req_x
-                if safe_x + safe_w > main_w:
-                    safe_x = max(0, main_w - safe_w)
-                
-                safe_y = req_y
-                if safe_y + safe_h > main_h:
-                    safe_y = max(0, main_h - safe_h)
-
-                qt_timeline = CropTransform(
-                    x=safe_x, 
-                    y=safe_y, 
-                    width=safe_w, 
-                    height=safe_h
-                ).applyTransformation(qt_timeline)
-                
-                main_w = safe_w
-                main_h = safe_h
-
-            pad_data = transforms.get('Padding', {})
-            if pad_data.get('enabled', False):
-                p_top = max(0, int(pad_data.get('Top', 0)))
-                p_bottom = max(0, int(pad_data.get('Bottom', 0)))
-                p_left = max(0, int(pad_data.get('Left', 0)))
-                p_right = max(0, int(pad_data.get('Right', 0)))
-                p_color = pad_data.get('Color', 'black')
-
-                if p_top > 0 or p_bottom > 0 or p_left > 0 or p_right > 0:
-                    qt_timeline = PaddingTransform(
-                        top=p_top, 
-                        bottom=p_bottom, 
-                        left=p_left, 
-                        right=p_right, 
-                        color=p_color
-                    ).applyTransformation(qt_timeline)
-                    main_w = main_w + p_left + p_right
-                    main_h = main_h + p_top + p_bottom
-
-            rot_data = transforms.get('Rotate', {})
-            if rot_data.get('enabled', False):
-                angle = float(rot_data.get('Angle', 0.0))
-                qt_timeline = Rotate(angle=angle).applyTransformation(qt_timeline)
-
-            scale_data = transforms.get('Scale', {})
-            if scale_data.get('enabled', False):
-                sx = float(scale_data.get('Scale x', 1.0))
-                sy = float(scale_data.get('Scale y', 1.0))
-                if abs(sx - 1.0) > 0.01 or abs(sy - 1.0) > 0.01:
-                    qt_timeline = ScaleTransform(scale_x=sx, scale_y=sy).applyTransformation(qt_timeline)
-                    main_w = int(main_w * sx)
-                    main_h = int(main_h * sy)
-
-            trans_data = transforms.get('Transpose', {})
-            if trans_data.get('enabled', False):
-                mode = trans_data.get('Mode', 'clock')
-                qt_timeline = Transpose(mode=mode).applyTransformation(qt_timeline)
-                if 'clock' in mode and 'flip' not in mode:
-                     main_w, main_h = main_h, main_w
-
-            timing_video = filter_stack.get('Timing', {}).get('Video', {})
-            fade_data = timing_video.get('Fade in', {})
-            if fade_data.get('enabled', False):
-                duration = int(fade_data.get('Duration', 1))
-                fade_type = fade_data.get('Type', 'both')
-                qt_timeline = FadeInOut(duration=duration, type=fade_type).applyOperation(qt_timeline)
-
-            text_ops = filter_stack.get('Text operation', {}).get('Video', {})
-            text_data = text_ops.get('Text', {})
-            if text_data.get('enabled', False):
-                text_content = text_data.get('Text', "")
-                position = text_data.get('Position', (10, 10))
-                font = text_data.get('Font', "Arial")
-                size = text_data.get('Size', 24)
-                color = text_data.get('Color', "white")
-                opacity = float(text_data.get('Opacity', 1.0))
-
-                qt_timeline = DrawText(
-                    text=text_content,
-                    position=position,
-                    font=font,
-                    size=size,
-                    color=color,
-                    opacity=opacity
-                ).applyText(qt_timeline)
-
-            filters_video = filter_stack.get('Filters', {}).get('Video', {})
-            tempo_data = filters_video.get('Tempo', {})
-            if tempo_data.get('enabled', False):
-                factor = float(tempo_data.get('Factor', 1.0))
-                qt_timeline = Tempo(factor=factor).applyFilter(qt_timeline)
+        speed_data = transforms.get('Playback speed', {})
+        if speed_data.get('enabled', False):
+            factor = float(speed_data.get('Factor', 1.0))
+            if factor > 0.01:
+                stages.append((
+                    {'op': 'Playback speed', 'factor': factor},
+                    lambda t, f=factor: PlaybackSpeed(factor=f).applyTransformation(t)
+                ))
+
+        crop_data = transforms.get('Crop', {})
+        if crop_data.get('enabled', False):
+            req_w = int(crop_data.get('Width', 0))
+            req_h = int(crop_data.get('Height', 0))
+            req_x = int(crop_data.get('X', 0))
+            req_y = int(crop_data.get('Y', 0))
             
-            kernel_data = filters_video.get('Kernel Filtering', {})
-            if kernel_data.get('enabled', False):
-                kernel_matrix = kernel_data.get('Kernel', [])
-                normalize = kernel_data.get('Normalize', True)
-                if kernel_matrix and len(kernel_matrix) > 0:
-                    qt_timeline = KernelFiltering(kernel=kernel_matrix, normalize=normalize).applyFilter(qt_timeline)
+            safe_w = min(req_w, main_w) if req_w > 0 else main_w
+            safe_h = min(req_h, main_h) if req_h > 0 else main_h
             
-            edge_data = filters_video.get('Edge Detect', {})
-            if edge_data.get('enabled', False):
-                method = edge_data.get('Method', 'sobel')
-                thresh = float(edge_data.get('Threshold', 0.1))
-                qt_timeline = EdgeDetect(method=method, threshold=thresh).applyFilter(qt_timeline)
-
-            blur_data = filters_video.get('Blur', {})
-            if blur_data.get('enabled', False):
-                radius = int(blur_data.get('Radius', 10))
-                qt_timeline = BlurFilter(radius=radius).applyFilter(qt_timeline)
+            safe_x = req_x
+            if safe_x + safe_w > main_w:
+                safe_x = max(0, main_w - safe_w)
             
-            vol_data = filters_video.get('Volume', {})
-            if vol_data.get('enabled', False):
-                gain = float(vol_data.get('Gain', 0.0))
-                qt_timeline = Volume(gain_db=gain).applyFilter(qt_timeline)
-
-            noise_data = filters_video.get('Noise Reduction', {})
-            if noise_data.get('enabled', False):
-                strength = float(noise_data.get('Strength', 1.0))
-                method = noise_data.get('Method', 'hqdn3d')
-                qt_timeline = NoiseReduction(strength=strength, method=method).applyFilter(qt_timeline)
-
-            comp_data = filter_stack.get('Composition', {}).get('Video', {})
-            overlay_data = comp_data.get('Overlay', {})
+            safe_y = req_y
+            if safe_y + safe_h > main_h:
+                safe_y = max(0, main_h - safe_h)
+
+            stages.append((
+                {'op': 'Crop', 'x': safe_x, 'y': safe_y, 'width': safe_w, 'height': safe_h},
+                lambda t, x=safe_x, y=safe_y, w=safe_w, h=safe_h: CropTransform(
+                    x=x, 
+                    y=y, 
+                    width=w, 
+                    height=h
+                ).applyTransformation(t)
+            ))
             
-            if overlay_data.get('enabled', False):
-                ov_path = overlay_data.get('overlay_path')
-                if ov_path and os.path.exists(ov_path):
-                    alpha = float(overlay_data.get('Alpha', 1.0))
-                    pos = overlay_data.get('Position', (0,0))
-                    
+            main_w = safe_w
+            main_h = safe_h
+
+        pad_data = transforms.get('Padding', {})
+        if pad_data.get('enabled', False):
+            p_top = max(0, int(pad_data.get('Top', 0)))
+            p_bottom = max(0, int(pad_data.get('Bottom', 0)))
+            p_left = max(0, int(pad_data.get('Left', 0)))
+            p_right = max(0, int(pad_data.get('Right', 0)))
+            p_color = pad_data.get('Color', 'black')
+
+            if p_top > 0 or p_bottom > 0 or p_left > 0 or p_right > 0:
+                stages.append((
+                    {'op': 'Padding', 'top': p_top, 'bottom': p_bottom, 'left': p_left, 'right': p_right, 'color': p_color},
+                    lambda t, pt=p_top, pb=p_bottom, pl=p_left, pr=p_right, pc=p_color: PaddingTransform(
+                        top=pt, 
+                        bottom=pb, 
+                        left=pl, 
+                        right=pr, 
+                        color=pc
+                    ).applyTransformation(t)
+                ))
+                main_w = main_w + p_left + p_right
+                main_h = main_h + p_top + p_bottom
+
+        rot_data = transforms.get('Rotate', {})
+        if rot_data.get('enabled', False):
+            angle = float(rot_data.get('Angle', 0.0))
+            stages.append((
+                {'op': 'Rotate', 'angle': angle},
+                lambda t, a=angle: Rotate(angle=a).applyTransformation(t)
+            ))
+
+        scale_data = transforms.get('Scale', {})
+        if scale_data.get('enabled', False):
+            sx = float(scale_data.get('Scale x', 1.0))
+            sy = float(scale_data.get('Scale y', 1.0))
+            if abs(sx - 1.0) > 0.01 or abs(sy - 1.0) > 0.01:
+                stages.append((
+                    {'op': 'Scale', 'scale_x': sx, 'scale_y': sy},
+                    lambda t, x=sx, y=sy: ScaleTransform(scale_x=x, scale_y=y).applyTransformation(t)
+                ))
+                main_w = int(main_w * sx)
+                main_h = int(main_h * sy)
+
+        trans_data = transforms.get('Transpose', {})
+        if trans_data.get('enabled', False):
+            mode = trans_data.get('Mode', 'clock')
+            stages.append((
+                {'op': 'Transpose', 'mode': mode},
+                lambda t, m=mode: Transpose(mode=m).applyTransformation(t)
+            ))
+            if 'clock' in mode and 'flip' not in mode:
+                 main_w, main_h = main_h, main_w
+
+        timing_video = filter_stack.get('Timing', {}).get('Video', {})
+        fade_data = timing_video.get('Fade in', {})
+        if fade_data.get('enabled', False):
+            duration = int(fade_data.get('Duration', 1))
+            fade_type = fade_data.get('Type', 'both')
+            stages.append((
+                {'op': 'Fade', 'duration': duration, 'type': fade_type},
+                lambda t, d=duration, ft=fade_type: FadeInOut(duration=d, type=ft).applyOperation(t)
+            ))
+
+        text_ops = filter_stack.get('Text operation', {}).get('Video', {})
+        text_data = text_ops.get('Text', {})
+        if text_data.get('enabled', False):
+            text_params = {
+                'text': text_data.get('Text', ""),
+                'position': tuple(text_data.get('Position', (10, 10))),
+                'font': text_data.get('Font', "Arial"),
+                'size': text_data.get('Size', 24),
+                'color': text_data.get('Color', "white"),
+                'opacity': float(text_data.get('Opacity', 1.0))
+            }
+            stages.append((
+                dict(op='Text', **text_params),
+                lambda t, p=text_params: DrawText(**p).applyText(t)
+            ))
+
+        filters_video = filter_stack.get('Filters', {}).get('Video', {})
+        tempo_data = filters_video.get('Tempo', {})
+        if tempo_data.get('enabled', False):
+            factor = float(tempo_data.get('Factor', 1.0))
+            stages.append((
+                {'op': 'Tempo', 'factor': factor},
+                lambda t, f=factor: Tempo(factor=f).applyFilter(t)
+            ))
+        
+        kernel_data = filters_video.get('Kernel Filtering', {})
+        if kernel_data.get('enabled', False):
+            kernel_matrix = kernel_data.get('Kernel', [])
+            normalize = kernel_data.get('Normalize', True)
+            if kernel_matrix and len(kernel_matrix) > 0:
+                stages.append((
+                    {'op': 'Kernel Filtering', 'kernel': kernel_matrix, 'normalize': bool(normalize)},
+                    lambda t, k=kernel_matrix, n=normalize: KernelFiltering(kernel=k, normalize=n).applyFilter(t)
+                ))
+        
+        edge_data = filters_video.get('Edge Detect', {})
+        if edge_data.get('enabled', False):
+            method = edge_data.get('Method', 'sobel')
+            thresh = float(edge_data.get('Threshold', 0.1))
+            stages.append((
+                {'op': 'Edge Detect', 'method': method.lower(), 'threshold': thresh},
+                lambda t, m=method, th=thresh: EdgeDetect(method=m, threshold=th).applyFilter(t)
+            ))
+
+        blur_data = filters_video.get('Blur', {})
+        if blur_data.get('enabled', False):
+            radius = int(blur_data.get('Radius', 10))
+            stages.append((
+                {'op': 'Blur', 'radius': radius},
+                lambda t, r=radius: BlurFilter(radius=r).applyFilter(t)
+            ))
+        
+        vol_data = filters_video.get('Volume', {})
+        if vol_data.get('enabled', False):
+            gain = float(vol_data.get('Gain', 0.0))
+            stages.append((
+                {'op': 'Volume', 'gain': gain},
+                lambda t, g=gain: Volume(gain_db=g).applyFilter(t)
+            ))
+
+        noise_data = filters_video.get('Noise Reduction', {})
+        if noise_data.get('enabled', False):
+            strength = float(noise_data.get('Strength', 1.0))
+            method = noise_data.get('Method', 'hqdn3d')
+            stages.append((
+                {'op': 'Noise Reduction', 'strength': strength, 'method': method.lower()},
+                lambda t, s=strength, m=method: NoiseReduction(strength=s, method=m).applyFilter(t)
+            ))
+
+        comp_data = filter_stack.get('Composition', {}).get('Video', {})
+        overlay_data = comp_data.get('Overlay', {})
+        
+        if overlay_data.get('enabled', False):
+            ov_path = overlay_data.get('overlay_path')
+            if ov_path and os.path.exists(ov_path):
+                alpha = float(overlay_data.get('Alpha', 1.0))
+                pos = tuple(overlay_data.get('Position', (0,0)))
+
+                def apply_overlay(t, path=ov_path, a=alpha, p=pos):
                     dummy_other_clip = QTimeLine()
-                    dummy_other_clip.setProperty("input_file", ov_path)
-                    
-                    qt_timeline = Overlay(otherClip=dummy_other_clip, alpha=alpha, position=pos).applyComposition(qt_timeline)
-
-            blend_data = comp_data.get('Blend videos', {})
-            if blend_data.get('enabled', False):
-                bl_path = blend_data.get('blend_path')
-                if bl_path and os.path.exists(bl_path):
-                    alpha = float(blend_data.get('Alpha', 0.5))
-                    mode = blend_data.get('Mode', 'overlay')
-                    
-                    prepared_path = self._prepare_secondary_clip(bl_path, main_w, main_h)
+                    dummy_other_clip.setProperty("input_file", path)
+                    return Overlay(otherClip=dummy_other_clip, alpha=a, position=p).applyComposition(t)
+
+                stages.append((
+                    {'op': 'Overlay', 'source': self.render_cache.source_key(ov_path), 'alpha': alpha, 'position': pos},
+                    apply_overlay
+                ))
+
+        blend_data = comp_data.get('Blend videos', {})
+        if blend_data.get('enabled', False):
+            bl_path = blend_data.get('blend_path')
+            if bl_path and os.path.exists(bl_path):
+                alpha = float(blend_data.get('Alpha', 0.5))
+                mode = blend_data.get('Mode', 'overlay')
+
+                def apply_blend(t, path=bl_path, a=alpha, m=mode, w=main_w, h=main_h):
+                    graph = t.property("filter_graph")
+                    if graph is not None:
+                        sec_w, sec_h = self.get_video_dimensions(path)
+                        if sec_w != w or sec_h != h:
+                            graph.set_input_filter(path, f"scale={w}:{h},format=yuv420p")
+                        prepared_path = path
+                    else:
+                        prepared_path = self._prepare_secondary_clip(path, w, h, t.property("cancel_token"))
                     
                     dummy_blend_clip = QTimeLine()
                     dummy_blend_clip.setProperty("input_file", prepared_path)
                     
-                    qt_timeline = BlendVideos(otherClip=dummy_blend_clip, alpha=alpha, mode=mode).applyComposition(qt_timeline)
+                    return BlendVideos(otherClip=dummy_blend_clip, alpha=a, mode=m).applyComposition(t)
 
-            comp_audio = filter_stack.get('Composition', {}).get('Audio', {})
-            
-            echo_data = comp_audio.get('Echo', {})
-            if echo_data.get('enabled', False):
-                delay = int(echo_data.get('Delay', 500))
-                decay = float(echo_data.get('Decay', 0.6))
-                mix = float(echo_data.get('Mix', 0.5))
-                qt_timeline = Echo(delay_ms=delay, decay=decay, mix=mix).applyComposition(qt_timeline)
-
-            delay_data = comp_audio.get('Delay', {})
-            if delay_data.get('enabled', False):
-                d_ms = int(delay_data.get('Delay', 500))
-                d_mix = float(delay_data.get('Mix', 0.5))
-                qt_timeline = Delay(delay_ms=d_ms, mix=d_mix).applyComposition(qt_timeline)
-
-            chorus_data = comp_audio.get('Chorus', {})
-            if chorus_data.get('enabled', False):
-                c_delay = int(chorus_data.get('Delay', 40))
-                c_depth = float(chorus_data.get('Depth', 0.3))
-                c_mix = float(chorus_data.get('Mix', 0.5))
-                qt_timeline = Chorus(delay_ms=c_delay, depth=c_depth, mix=c_mix).applyComposition(qt_timeline)
+                stages.append((
+                    {'op': 'Blend videos', 'source': self.render_cache.source_key(bl_path), 'alpha': alpha,
+                     'mode': mode.lower(), 'size': (main_w, main_h)},
+                    apply_blend
+                ))
+
+        comp_audio = filter_stack.get('Composition', {}).get('Audio', {})
+        
+        echo_data = comp_audio.get('Echo', {})
+        if echo_data.get('enabled', False):
+            delay = int(echo_data.get('Delay', 500))
+            decay = float(echo_data.get('Decay', 0.6))
+            mix = float(echo_data.get('Mix', 0.5))
+            stages.append((
+                {'op': 'Echo', 'delay': delay, 'decay': decay, 'mix': mix},
+                lambda t, d=delay, dc=decay, m=mix: Echo(delay_ms=d, decay=dc, mix=m).applyComposition(t)
+            ))
+
+        delay_data = comp_audio.get('Delay', {})
+        if delay_data.get('enabled', False):
+            d_ms = int(delay_data.get('Delay', 500))
+            d_mix = float(delay_data.get('Mix', 0.5))
+            stages.append((
+                {'op': 'Delay', 'delay': d_ms, 'mix': d_mix},
+                lambda t, d=d_ms, m=d_mix: Delay(delay_ms=d, mix=m).applyComposition(t)
+            ))
+
+        chorus_data = comp_audio.get('Chorus', {})
+        if chorus_data.get('enabled', False):
+            c_delay = int(chorus_data.get('Delay', 40))
+            c_depth = float(chorus_data.get('Depth', 0.3))
+            c_mix = float(chorus_data.get('Mix', 0.5))
+            stages.append((
+                {'op': 'Chorus', 'delay': c_delay, 'depth': c_depth, 'mix': c_mix},
+                lambda t, d=c_delay, dp=c_depth, m=c_mix: Chorus(delay_ms=d, depth=dp, mix=m).applyComposition(t)
+            ))
+
+        return stages
+
+    def _emit_stage_progress(self, progress, stage_idx, stage_count):
+        # fara filter graph fiecare etapa e o trecere ffmpeg separata peste tot clipul
+        overall = dict(progress)
+        overall['fraction'] = (stage_idx + progress['fraction']) / stage_count
+        overall['stage'] = stage_idx + 1
+        overall['stages'] = stage_count
+        if progress['eta_sec'] is not None and progress['speed'] > 0:
+            remaining_stages = stage_count - stage_idx - 1
+            overall['eta_sec'] = progress['eta_sec'] + remaining_stages * progress['total_sec'] / progress['speed']
+        self.processing_progress.emit(overall)
+
+    def process_clip(self, original_path, filter_stack, token=None):
+        if token is None:
+            token = self.begin_job(original_path)
+        if token.cancelled:
+            self._end_job(original_path, token)
+            self.processing_cancelled.emit(original_path, token)
+            return
+
+        if not os.path.exists(original_path):
+            self._end_job(original_path, token)
+            self.processing_error.emit("Fisierul sursa nu exista.", token)
+            return
+
+        input_path = original_path
+        qt_timeline = None
+        try:
+            main_w, main_h = self.get_video_dimensions(original_path)
+            stages = self._build_stages(filter_stack, main_w, main_h)
+
+            if not stages:
+                self.processing_finished.emit(original_path, filter_stack, token)
+                return
+
+            source_key = self.render_cache.source_key(original_path)
+            keys = self.render_cache.stack_keys(source_key, [params for params, _ in stages])
+            done, cached_path = self.render_cache.lookup_longest(keys)
+
+            if done == len(stages):
+                self.processing_finished.emit(cached_path, filter_stack, token)
+                return
+
+            input_path = cached_path if cached_path else original_path
+
+            qt_timeline = QTimeLine()
+            qt_timeline.setProperty("input_file", input_path)
+            qt_timeline.setProperty("original_file", input_path) 
+            qt_timeline.setProperty("cancel_token", token)
+
+            graph = FilterGraph(input_path) if self.use_filter_graph else None
+            qt_timeline.setProperty("filter_graph", graph)
+
+            pending_stages = stages[done:]
+            for n, (_, apply_stage) in enumerate(pending_stages):
+                token.raise_if_cancelled()
+                if graph is None:
+                    qt_timeline.setProperty("progress_callback",
+                                            lambda p, k=n, total=len(pending_stages): self._emit_stage_progress(p, k, total))
+                qt_timeline = apply_stage(qt_timeline)
+
+            token.raise_if_cancelled()
+            if graph is not None and not graph.is_empty():
+                qt_timeline.setProperty("input_file", graph.render(on_progress=self.processing_progress.emit,
+                                                                   cancel_token=token))
+            token.raise_if_cancelled()
 
-            
             final_temp_path = qt_timeline.property("input_file")
             
-            if final_temp_path and final_temp_path != original_path and os.path.exists(final_temp_path):
-                stack_hash = hashlib.md5(str(filter_stack).encode()).hexdigest()[:8]
+            if final_temp_path and final_temp_path != input_path and os.path.exists(final_temp_path):
                 base_name = os.path.basename(original_path)
                 name, ext = os.path.splitext(base_name)
                 
-                final_path = os.path.join(self.cache_dir, f"{name}_FX_{stack_hash}{ext}")
+                final_path = os.path.join(self.cache_dir, f"{name}_FX_{keys[-1][:12]}{ext}")
+                # se salveaza doar stiva completa (in modul graf nu exista randari intermediare),
+                # deci un prefix se reia doar cand o stiva completa anterioara e prefix al celei noi
                 
-                shutil.move(final_temp_path, final_path)
-                self.processing_finished.emit(final_path, filter_stack)
+                self.render_cache.store(keys[-1], final_temp_path, final_path)
+                self.processing_finished.emit(final_path, filter_stack, token)
             else:
-                self.processing_finished.emit(original_path, filter_stack)
+                self.processing_finished.emit(input_path, filter_stack, token)
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.processing_error.emit(str(e))
\ No newline at end of file
+            # ffmpeg omorat de cancel iese cu eroare; fisierul intermediar ramas trebuie sters
+            if qt_timeline is not None:
+                self._discard_intermediate(qt_timeline.property("input_file"), input_path)
+            if token.cancelled:
+                print(f"Filter processing cancelled for {original_path}")
+                self.processing_cancelled.emit(original_path, token)
+            else:
+                import traceback
+                traceback.print_exc()
+                self.processing_error.emit(str(e), token)
+        finally:
+            self._end_job(original_path, token)
+
+    def _discard_intermediate(self, path, input_path):
+        if not path or path == input_path:
+            return
+        try:
+            if os.path.exists(path):
+                os.unlink(path)
+        except OSError as e:
+            print(f"Could not remove temp file {path}: {e}")
@@ -0,0 +1,166 @@
+import os
+import heapq
+import itertools
+import threading
+from PySide6.QtCore import QObject, Signal, QCoreApplication
+from base.ffmpeg_progress import CancelToken
+
+class Job(CancelToken):
+    def __init__(self, scheduler, job_id, priority, fn, args, on_done, on_error, on_progress):
+        super().__init__()
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+
+    def report_progress(self, fraction):
+        if not self.cancelled:
+            self.scheduler.job_progress.emit(self.job_id, float(fraction))
+
+
+class JobScheduler(QObject):
+    job_started = Signal(int)
+    job_progress = Signal(int, float)
+    job_finished = Signal(int, object)
+    job_failed = Signal(int, str)
+    job_cancelled = Signal(int)
+
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_BACKGROUND = 2
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers=None):
+        super().__init__()
+        if max_workers is None:
+            max_workers = max(2, min(6, os.cpu_count() or 2))
+        self.max_workers = max(2, max_workers)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._counter = itertools.count(1)
+        self._jobs = {}
+        self._threads = []
+        self._running_background = 0
+        self._closed = False
+
+        self.job_progress.connect(self._dispatch_progress)
+        self.job_finished.connect(self._dispatch_finished)
+        self.job_failed.connect(self._dispatch_failed)
+        self.job_cancelled.connect(self._take_job)
+
+    @classmethod
+    def shared(cls):
+        # shared() se cheama si din workeri; fara lock doua thread-uri ar porni doua pool-uri
+        with cls._shared_lock:
+            if cls._shared is None:
+                scheduler = cls()
+                # callback-urile se livreaza prin bucla thread-ului principal, oricine ar crea instanta
+                app = QCoreApplication.instance()
+                if app is not None:
+                    scheduler.moveToThread(app.thread())
+                cls._shared = scheduler
+            return cls._shared
+
+    def submit(self, fn, *args, priority=PRIORITY_NORMAL, on_done=None, on_error=None, on_progress=None):
+        # fn primeste job-ul ca prim argument, pentru anulare si progres
+        with self._cond:
+            job = Job(self, next(self._counter), priority, fn, args, on_done, on_error, on_progress)
+            if self._closed:
+                job.cancel()
+                return job
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._queue, (priority, job.job_id, job))
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker_loop, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return job
+
+    def cancel(self, job):
+        job.cancel()
+        with self._cond:
+            self._cond.notify_all()
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._jobs)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            jobs = list(self._jobs.values())
+            self._queue.clear()
+            self._cond.notify_all()
+        for job in jobs:
+            job.cancel()
+
+    def _next_job(self):
+        # un worker ramane rezervat pentru joburile interactive/normale
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                while self._queue and self._queue[0][2].cancelled:
+                    _, _, job = heapq.heappop(self._queue)
+                    self._jobs.pop(job.job_id, None)
+                    self.job_cancelled.emit(job.job_id)
+                if self._queue:
+                    priority, _, job = self._queue[0]
+                    is_background = priority >= self.PRIORITY_BACKGROUND
+                    if not is_background or self._running_background < self.max_workers - 1:
+                        heapq.heappop(self._queue)
+                        if is_background:
+                            self._running_background += 1
+                        return job
+                self._cond.wait()
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                self.job_started.emit(job.job_id)
+                result = job.fn(job, *job.args)
+                if job.cancelled:
+                    self.job_cancelled.emit(job.job_id)
+                else:
+                    self.job_finished.emit(job.job_id, result)
+            except Exception as e:
+                if job.cancelled:
+                    self.job_cancelled.emit(job.job_id)
+                else:
+                    self.job_failed.emit(job.job_id, str(e))
+            finally:
+                with self._cond:
+                    if job.priority >= self.PRIORITY_BACKGROUND:
+                        self._running_background -= 1
+                    if job.on_done is None and job.on_error is None and job.on_progress is None:
+                        self._jobs.pop(job.job_id, None)
+                    self._cond.notify_all()
+
+    def _take_job(self, job_id):
+        with self._cond:
+            return self._jobs.pop(job_id, None)
+
+    def _dispatch_progress(self, job_id, fraction):
+        with self._cond:
+            job = self._jobs.get(job_id)
+        if job is not None and job.on_progress is not None:
+            job.on_progress(fraction)
+
+    def _dispatch_finished(self, job_id, result):
+        job = self._take_job(job_id)
+        if job is not None and job.on_done is not None:
+            job.on_done(result)
+
+    def _dispatch_failed(self, job_id, message):
+        job = self._take_job(job_id)
+        if job is not None and job.on_error is not None:
+            job.on_error(message)
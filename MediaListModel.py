@@ -0,0 +1,95 @@
+import os
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QIcon
+
+class MediaListModel(QAbstractListModel):
+    KindRole = Qt.UserRole + 1
+
+    def __init__(self, kind_for_ext, parent=None):
+        super().__init__(parent)
+        self.kind_for_ext = kind_for_ext
+        # stocate in ordinea adaugarii; randul 0 e ultimul fisier adaugat
+        self._paths = []
+        self._kinds = []
+        self._names = []
+        self._positions = {}
+        self._icons = {}
+        self._default_icons = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._paths)
+
+    def _storage_index(self, row):
+        return len(self._paths) - 1 - row
+
+    def row_for_path(self, path):
+        pos = self._positions.get(path)
+        if pos is None:
+            return -1
+        return len(self._paths) - 1 - pos
+
+    def path_at(self, row):
+        if 0 <= row < len(self._paths):
+            return self._paths[self._storage_index(row)]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._paths)):
+            return None
+        pos = self._storage_index(index.row())
+        path = self._paths[pos]
+
+        if role == Qt.DisplayRole:
+            return self._names[pos]
+        if role == Qt.DecorationRole:
+            icon = self._icons.get(path)
+            return icon if icon is not None else self._default_icons.get(self._kinds[pos], QIcon())
+        if role == Qt.ToolTipRole or role == Qt.UserRole:
+            return path
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == self.KindRole:
+            return self._kinds[pos]
+        return None
+
+    def set_default_icon(self, kind, icon):
+        self._default_icons[kind] = icon
+
+    def set_icon(self, path, icon):
+        self._icons[path] = icon
+        row = self.row_for_path(path)
+        if row != -1:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def has_icon(self, path):
+        return path in self._icons
+
+    def add_paths(self, paths):
+        new_paths = [p for p in paths if p not in self._positions]
+        if not new_paths:
+            return []
+
+        self.beginInsertRows(QModelIndex(), 0, len(new_paths) - 1)
+        for path in new_paths:
+            base_name = os.path.basename(path)
+            self._positions[path] = len(self._paths)
+            self._paths.append(path)
+            self._kinds.append(self.kind_for_ext(os.path.splitext(path)[1].lower()))
+            self._names.append(base_name if len(base_name) <= 20 else (base_name[:15] + "..."))
+        self.endInsertRows()
+        return new_paths
+
+
+class MediaKindFilterProxy(QSortFilterProxyModel):
+    def __init__(self, kind=None, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.kind is None:
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        return index.data(MediaListModel.KindRole) == self.kind
@@ -1,14 +1,17 @@
 import os
-from PySide6.QtWidgets import QWidget, QTabWidget, QListWidget, QVBoxLayout, QListWidgetItem, QSizePolicy
-from PySide6.QtCore import Qt, QSize, Signal
+from PySide6.QtWidgets import QWidget, QTabWidget, QListView, QVBoxLayout, QSizePolicy
+from PySide6.QtCore import Qt, QSize, Signal, QTimer
 from PySide6.QtGui import QIcon, QPixmap
-from ClickableListWidget import ClickableListWidget
+from ClickableListWidget import ClickableListView
+from ThumbnailWorker import ThumbnailWorker
+from MediaListModel import MediaListModel, MediaKindFilterProxy
+from base.media_types import AUDIO_EXT
 
 class MediaTabs(QWidget):
     file_double_clicked = Signal(str)
     SUPPORTED_IMAGE_EXT = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
     SUPPORTED_VIDEO_EXT = {'.mp4', '.mov', '.avi', '.mkv'}
-    SUPPORTED_AUDIO_EXT = {'.mp3', '.wav', '.flac'}
+    SUPPORTED_AUDIO_EXT = AUDIO_EXT
 
     def __init__(self, SPACING, parent=None):
         super().__init__(parent)
@@ -17,7 +20,17 @@ class MediaTabs(QWidget):
         os.makedirs(self.thumb_dir, exist_ok=True)
 
         self._existing = set()
-        self._all_files = [] 
+
+        self._placeholders = {}
+        self._ready_thumbs = {}
+        self._failed_thumbs = set()
+        self.thumbnail_worker = ThumbnailWorker(self.thumb_dir, self.SUPPORTED_IMAGE_EXT, self.SUPPORTED_VIDEO_EXT)
+        self.thumbnail_worker.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.thumbnail_worker.thumbnail_failed.connect(self._failed_thumbs.add)
+        self._thumb_flush_timer = QTimer(self)
+        self._thumb_flush_timer.setSingleShot(True)
+        self._thumb_flush_timer.setInterval(100)
+        self._thumb_flush_timer.timeout.connect(self._apply_ready_thumbnails)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -26,40 +39,67 @@ class MediaTabs(QWidget):
         self.media_tabs.setContentsMargins(0, 0, 0, 0)
         self.media_tabs.setFocusPolicy(Qt.NoFocus)
 
-        self.show_all_tab_list = ClickableListWidget()
-        self._setup_media_grid(self.show_all_tab_list, SPACING)
-
-        self.video_list = ClickableListWidget()
-        self._setup_media_grid(self.video_list, SPACING)
-
-        self.audio_list = ClickableListWidget()
-        self._setup_media_grid(self.audio_list, SPACING)
-
-        self.image_list = ClickableListWidget()
-        self._setup_media_grid(self.image_list, SPACING)
+        self.media_model = MediaListModel(self._kind_for_ext, self)
+        self.media_model.set_default_icon("audio", self._placeholder_icon("icons/audio_file.png"))
+        self.media_model.set_default_icon("video", self._placeholder_icon("icons/video_file.png"))
+        self.media_model.set_default_icon("image", self._placeholder_icon("icons/generic_file.png"))
+        self.media_model.set_default_icon("other", self._placeholder_icon("icons/generic_file.png"))
+        self.video_proxy = MediaKindFilterProxy("video", self)
+        self.video_proxy.setSourceModel(self.media_model)
+        self.audio_proxy = MediaKindFilterProxy("audio", self)
+        self.audio_proxy.setSourceModel(self.media_model)
+        self.image_proxy = MediaKindFilterProxy("image", self)
+        self.image_proxy.setSourceModel(self.media_model)
+
+        self.show_all_tab_list = ClickableListView()
+        self._setup_media_grid(self.show_all_tab_list, SPACING, self.media_model)
+
+        self.video_list = ClickableListView()
+        self._setup_media_grid(self.video_list, SPACING, self.video_proxy)
+
+        self.audio_list = ClickableListView()
+        self._setup_media_grid(self.audio_list, SPACING, self.audio_proxy)
+
+        self.image_list = ClickableListView()
+        self._setup_media_grid(self.image_list, SPACING, self.image_proxy)
         self.media_tabs.addTab(self.show_all_tab_list, "Show All")
         self.media_tabs.addTab(self.video_list, "Video")
         self.media_tabs.addTab(self.audio_list, "Audio")
         self.media_tabs.addTab(self.image_list, "Image")
 
         layout.addWidget(self.media_tabs)
-        self.show_all_tab_list.itemDoubleClicked.connect(self._handle_double_click)
-        self.video_list.itemDoubleClicked.connect(self._handle_double_click)
-        self.audio_list.itemDoubleClicked.connect(self._handle_double_click)
-        self.image_list.itemDoubleClicked.connect(self._handle_double_click)
+        self.show_all_tab_list.doubleClicked.connect(self._handle_double_click)
+        self.video_list.doubleClicked.connect(self._handle_double_click)
+        self.audio_list.doubleClicked.connect(self._handle_double_click)
+        self.image_list.doubleClicked.connect(self._handle_double_click)
 
 
-    def _handle_double_click(self, item):
-        path = item.data(Qt.UserRole)
+    def _handle_double_click(self, index):
+        path = index.data(Qt.UserRole)
         if path:
             self.file_double_clicked.emit(path)
 
-    def _setup_media_grid(self, file_list, SPACING):
-        file_list.setViewMode(QListWidget.IconMode) 
-        file_list.setResizeMode(QListWidget.Adjust)
+    def selected_path(self):
+        view = self.media_tabs.currentWidget()
+        if not isinstance(view, QListView): return None
+        indexes = view.selectionModel().selectedIndexes()
+        if not indexes: return None
+        return indexes[0].data(Qt.UserRole)
+
+    def _kind_for_ext(self, ext):
+        if ext in self.SUPPORTED_VIDEO_EXT: return "video"
+        if ext in self.SUPPORTED_AUDIO_EXT: return "audio"
+        if ext in self.SUPPORTED_IMAGE_EXT: return "image"
+        return "other"
+
+    def _setup_media_grid(self, file_list, SPACING, model):
+        file_list.setModel(model)
+        file_list.setViewMode(QListView.IconMode) 
+        file_list.setResizeMode(QListView.Adjust)
         file_list.setIconSize(QSize(160, 90)) 
         file_list.setGridSize(QSize(180, 130))
-        file_list.setMovement(QListWidget.Static)
+        file_list.setUniformItemSizes(True)
+        file_list.setMovement(QListView.Static)
         file_list.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         file_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         file_list.setSpacing(SPACING)
@@ -68,16 +108,16 @@ class MediaTabs(QWidget):
         
         file_list.setFocusPolicy(Qt.NoFocus)
         file_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 outline: none;
                 border: none;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #3a6ea5;
                 outline: none;
                 border: none;
             }
-            QListWidget::item:focus {
+            QListView::item:focus {
                 outline: none;
                 border: none;
             }
@@ -87,10 +127,10 @@ class MediaTabs(QWidget):
 
     def _on_resize_proxy(self, widget, event):
         self._update_grid_size(widget)
-        ClickableListWidget.resizeEvent(widget, event)
+        ClickableListView.resizeEvent(widget, event)
 
     def _update_grid_size(self, widget):
-        count = widget.count()
+        count = widget.model().rowCount()
         if count == 0:
             return
         list_width = widget.viewport().width()
@@ -108,90 +148,62 @@ class MediaTabs(QWidget):
             QSize(icon_width + dynamic_spacing, widget.gridSize().height())
         )
 
-    def _generate_video_thumbnail(self, path):
-        base = os.path.basename(path)
-        name, _ = os.path.splitext(base)
-        out_thumb = os.path.join(self.thumb_dir, f"{name}_thumb.jpg")
-        if os.path.exists(out_thumb): return out_thumb
-        cmd = (f'ffmpeg -y -i "{path}" -vf "thumbnail,scale=160:90:force_original_aspect_ratio=decrease" -frames:v 1 -update 1 "{out_thumb}"')
-        os.system(cmd)
-        if os.path.exists(out_thumb): return out_thumb
-        return None
-
-    def _make_icon_for_file(self, path, ext):
-        try:
-            if ext in self.SUPPORTED_IMAGE_EXT:
-                pix = QPixmap(path)
-                if not pix.isNull():
-                    thumb = pix.scaled(160, 90, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                    return QIcon(thumb)
-            if ext in self.SUPPORTED_AUDIO_EXT:
-                return QIcon("icons/audio_file.png") if os.path.exists("icons/audio_file.png") else QIcon()
-            if ext in self.SUPPORTED_VIDEO_EXT:
-                thumb = self._generate_video_thumbnail(path)
-                if thumb and os.path.exists(thumb):
+    def _placeholder_icon(self, icon_path):
+        if icon_path not in self._placeholders:
+            self._placeholders[icon_path] = QIcon(icon_path) if os.path.exists(icon_path) else QIcon()
+        return self._placeholders[icon_path]
+
+    def _request_thumbnails(self, paths):
+        to_request = []
+        for path in paths:
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in self.SUPPORTED_IMAGE_EXT and ext not in self.SUPPORTED_VIDEO_EXT:
+                continue
+            try:
+                thumb = self.thumbnail_worker.cached_thumbnail(path)
+                if thumb:
                     pix = QPixmap(thumb)
-                    if not pix.isNull(): return QIcon(pix)
-                return QIcon("icons/video_file.png") if os.path.exists("icons/video_file.png") else QIcon()
-        except Exception:
-            pass
-        return QIcon("icons/generic_file.png") if os.path.exists("icons/generic_file.png") else QIcon()
-
-    def _refresh_list(self):
-        self.show_all_tab_list.clear()
-        self.video_list.clear()
-        self.audio_list.clear()
-        self.image_list.clear()
-
-        for filePath in self._all_files:
-            ext = os.path.splitext(filePath)[1].lower()
-            icon = self._make_icon_for_file(filePath, ext)
-            base_name = os.path.basename(filePath)
-            display_name = base_name if len(base_name) <= 20 else (base_name[:15] + "...")
-
-            item_all = QListWidgetItem(icon, display_name)
-            item_all.setToolTip(filePath)
-            item_all.setData(Qt.UserRole, filePath)
-            item_all.setTextAlignment(Qt.AlignCenter)
-            self.show_all_tab_list.addItem(item_all)
-
-            if ext in self.SUPPORTED_AUDIO_EXT:
-                item_audio = QListWidgetItem(icon, display_name)
-                item_audio.setToolTip(filePath)
-                item_audio.setData(Qt.UserRole, filePath)
-                item_audio.setTextAlignment(Qt.AlignCenter)
-                self.audio_list.addItem(item_audio)
-                
-            elif ext in self.SUPPORTED_VIDEO_EXT:
-                item_video = QListWidgetItem(icon, display_name)
-                item_video.setToolTip(filePath)
-                item_video.setData(Qt.UserRole, filePath)
-                item_video.setTextAlignment(Qt.AlignCenter)
-                self.video_list.addItem(item_video)
-
-            elif ext in self.SUPPORTED_IMAGE_EXT:
-                item_image = QListWidgetItem(icon, display_name)
-                item_image.setToolTip(filePath)
-                item_image.setData(Qt.UserRole, filePath)
-                item_image.setTextAlignment(Qt.AlignCenter)
-                self.image_list.addItem(item_image)
+                    if not pix.isNull():
+                        self.media_model.set_icon(path, QIcon(pix))
+                        continue
+            except Exception:
+                pass
+            if path not in self._failed_thumbs:
+                to_request.append(path)
+        self.thumbnail_worker.request(to_request)
+
+    def _on_thumbnail_ready(self, path, thumb):
+        self._ready_thumbs[path] = thumb
+        if not self._thumb_flush_timer.isActive():
+            self._thumb_flush_timer.start()
+
+    def _apply_ready_thumbnails(self):
+        ready, self._ready_thumbs = self._ready_thumbs, {}
+        for path, thumb in ready.items():
+            pix = QPixmap(thumb)
+            if pix.isNull():
+                continue
+            self.media_model.set_icon(path, QIcon(pix))
+
+    def _refresh_grid_sizes(self):
         self._update_grid_size(self.show_all_tab_list)
         self._update_grid_size(self.video_list)
         self._update_grid_size(self.audio_list)
         self._update_grid_size(self.image_list)
 
-
     def add_files(self, paths: list):
-        added = 0
+        new_paths = []
         for p in paths:
             p = os.path.abspath(p)
             if p in self._existing or not os.path.isfile(p):
                 continue
             self._existing.add(p)
-            self._all_files.insert(0, p)
-            added += 1
-        self._refresh_list()
-        return added
+            new_paths.append(p)
+        if new_paths:
+            self.media_model.add_paths(new_paths)
+            self._refresh_grid_sizes()
+            self._request_thumbnails(new_paths)
+        return len(new_paths)
 
     def add_folder(self, folder_path: str):
         if not os.path.isdir(folder_path): return 0
@@ -0,0 +1,121 @@
+import os
+import hashlib
+import threading
+from PySide6.QtCore import QObject, Signal
+from JobScheduler import JobScheduler
+from base.media_probe import MediaProbe
+from base.ffmpeg_progress import run_ffmpeg
+
+class ProxyWorker(QObject):
+    proxy_ready = Signal(str, str)
+
+    VIDEO_EXT = {'.mp4', '.mov', '.avi', '.mkv'}
+    PROXY_HEIGHT = 540
+    MAX_DIRECT_HEIGHT = 1080
+    HIGH_BIT_DEPTH = ("p10", "p12", "p16", "10le", "10be", "12le", "12be")
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir, scheduler=None, enabled=True):
+        super().__init__()
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.enabled = enabled
+        self._scheduler = scheduler or JobScheduler.shared()
+        self._lock = threading.Lock()
+        self._ready = {}
+        self._pending = {}
+        self._skipped = set()
+        self._closed = False
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                base_dir = os.path.dirname(os.path.abspath(__file__))
+                cls._shared = cls(os.path.join(base_dir, "filesFromTracks", "proxies"))
+            return cls._shared
+
+    def proxy_path(self, path):
+        st = os.stat(path)
+        key = hashlib.md5(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{key}.proxy.mp4")
+
+    def needs_proxy(self, path):
+        info = MediaProbe.shared().probe(path)
+        if not info["has_video"]:
+            return False
+        pix_fmt = info["pix_fmt"] or ""
+        return info["height"] > self.MAX_DIRECT_HEIGHT or any(tag in pix_fmt for tag in self.HIGH_BIT_DEPTH)
+
+    def proxy_for(self, path):
+        # intoarce proxy-ul daca e gata; altfel il programeaza in fundal si intoarce None
+        if not self.enabled or not path or os.path.splitext(path)[1].lower() not in self.VIDEO_EXT:
+            return None
+        with self._lock:
+            proxy = self._ready.get(path)
+            if proxy is not None or path in self._skipped or path in self._pending or self._closed:
+                return proxy
+
+        try:
+            proxy_file = self.proxy_path(path)
+        except OSError:
+            return None
+        if os.path.exists(proxy_file):
+            with self._lock:
+                self._ready[path] = proxy_file
+            return proxy_file
+
+        with self._lock:
+            if path not in self._pending:
+                self._pending[path] = self._scheduler.submit(
+                    self._generate, path, proxy_file, priority=JobScheduler.PRIORITY_BACKGROUND)
+        return None
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._pending.values())
+        for job in jobs:
+            job.cancel()
+
+    def _generate(self, job, path, proxy_file):
+        tmp_file = proxy_file[:-4] + ".part.mp4"
+        try:
+            if not self.needs_proxy(path):
+                with self._lock:
+                    self._skipped.add(path)
+                return
+
+            # all-intra: orice pozitie de scrub se decodeaza dintr-un singur cadru
+            cmd = [
+                'ffmpeg', '-y', '-v', 'error', '-i', path,
+                '-map', '0:v:0', '-map', '0:a?',
+                '-vf', f"scale=-2:{self.PROXY_HEIGHT},format=yuv420p",
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'fastdecode',
+                '-g', '1', '-bf', '0', '-crf', '23',
+                '-c:a', 'aac', '-b:a', '128k',
+                '-movflags', '+faststart', tmp_file
+            ]
+            total_sec = MediaProbe.shared().probe(path)["duration"]
+            result = run_ffmpeg(cmd, total_sec, lambda p: job.report_progress(p['fraction']), cancel_token=job)
+            if job.cancelled:
+                return
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip()[-300:])
+            os.replace(tmp_file, proxy_file)
+
+            with self._lock:
+                self._ready[path] = proxy_file
+            self.proxy_ready.emit(path, proxy_file)
+        except Exception as e:
+            if not job.cancelled:
+                print(f"Proxy failed for {path}: {e}")
+                with self._lock:
+                    self._skipped.add(path)
+        finally:
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
+            with self._lock:
+                self._pending.pop(path, None)
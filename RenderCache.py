@@ -0,0 +1,155 @@
+import os
+import json
+import atexit
+import time
+import shutil
+import hashlib
+import threading
+
+
+class RenderCache:
+    INDEX_NAME = "render_cache.json"
+    SAMPLE_BYTES = 1024 * 1024
+    SAVE_DELAY_SEC = 2.0
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir, max_bytes=10 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, self.INDEX_NAME)
+        # callable care intoarce setul de cai absolute folosite pe timeline; acestea nu se sterg
+        self.paths_in_use = None
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.stats = {'hits': 0, 'prefix_hits': 0, 'misses': 0, 'evictions': 0}
+        self._save_timer = None
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+        atexit.register(self.flush)
+
+    @classmethod
+    def shared(cls, cache_dir):
+        # o singura instanta pe director: altfel fiecare ar rescrie indexul si ar numara separat limita
+        key = os.path.abspath(cache_dir)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(key)
+            return cls._shared[key]
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = data.get('entries', {})
+            self.stats.update(data.get('stats', {}))
+        except Exception as e:
+            print(f"Render cache index unreadable, starting empty: {e}")
+            self.entries = {}
+
+    def _schedule_save(self):
+        # apelat cu _lock luat; last_used si contoarele din lookup-uri se scriu o data, dupa o pauza
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY_SEC, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save()
+
+    def _save(self):
+        # apelat cu _lock luat
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                json.dump({'entries': self.entries, 'stats': self.stats}, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"Render cache index not saved: {e}")
+
+    def source_key(self, path):
+        st = os.stat(path)
+        h = hashlib.md5(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode())
+        with open(path, "rb") as f:
+            h.update(f.read(self.SAMPLE_BYTES))
+            if st.st_size > 2 * self.SAMPLE_BYTES:
+                f.seek(-self.SAMPLE_BYTES, os.SEEK_END)
+                h.update(f.read(self.SAMPLE_BYTES))
+        return h.hexdigest()
+
+    def stack_keys(self, source_key, stages):
+        keys = []
+        h = hashlib.md5(source_key.encode())
+        for stage in stages:
+            h.update(json.dumps(stage, sort_keys=True, default=str).encode())
+            keys.append(h.copy().hexdigest())
+        return keys
+
+    def lookup_longest(self, keys):
+        with self._lock:
+            found_idx, found_path = 0, None
+            for i in range(len(keys), 0, -1):
+                entry = self.entries.get(keys[i - 1])
+                if not entry:
+                    continue
+                if not os.path.exists(entry['path']):
+                    del self.entries[keys[i - 1]]
+                    continue
+                entry['last_used'] = time.time()
+                found_idx, found_path = i, entry['path']
+                break
+
+            if found_idx == len(keys) and keys:
+                self.stats['hits'] += 1
+            elif found_idx > 0:
+                self.stats['prefix_hits'] += 1
+            else:
+                self.stats['misses'] += 1
+            self._schedule_save()
+            return found_idx, found_path
+
+    def store(self, key, temp_path, final_path):
+        shutil.move(temp_path, final_path)
+        with self._lock:
+            self.entries[key] = {
+                'path': final_path,
+                'size': os.path.getsize(final_path),
+                'last_used': time.time()
+            }
+            self._evict(keep=key)
+            self._save()
+        return final_path
+
+    def total_size(self):
+        return sum(e['size'] for e in self.entries.values())
+
+    def _evict(self, keep=None):
+        total = self.total_size()
+        if total <= self.max_bytes:
+            return
+
+        in_use = self.paths_in_use() if self.paths_in_use else set()
+        for key, entry in sorted(self.entries.items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            if os.path.abspath(entry['path']) in in_use:
+                continue
+            try:
+                if os.path.exists(entry['path']):
+                    os.unlink(entry['path'])
+            except OSError as e:
+                print(f"Render cache eviction failed for {entry['path']}: {e}")
+                continue
+            total -= entry['size']
+            del self.entries[key]
+            self.stats['evictions'] += 1
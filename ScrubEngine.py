@@ -0,0 +1,145 @@
+import subprocess
+import threading
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+from JobScheduler import JobScheduler
+
+class ScrubEngine(QObject):
+    chunk_ready = Signal(str)
+
+    FPS = 12
+    FRAMES_PER_CHUNK = 24
+    PREFETCH_CHUNKS = 2
+    FRAME_WIDTH = 480
+    FRAME_HEIGHT = 270
+    MAX_FRAMES = 120
+
+    def __init__(self, scheduler=None):
+        super().__init__()
+        self._scheduler = scheduler or JobScheduler.shared()
+        self._lock = threading.Lock()
+        self._frames = {}
+        self._pending = {}
+        self._failed_paths = set()
+        self._empty_chunks = set()
+        self._focus = None
+        self._closed = False
+
+    def frame_index(self, local_ms):
+        return max(0, int(local_ms * self.FPS / 1000))
+
+    def request(self, path, local_ms, direction=1):
+        # cadrul de sub playhead are prioritate; urmatoarele bucati se decodeaza in directia de scrub
+        idx = self.frame_index(local_ms)
+        chunk = idx // self.FRAMES_PER_CHUNK
+        step = 1 if direction >= 0 else -1
+        wanted = [chunk] + [chunk + step * n for n in range(1, self.PREFETCH_CHUNKS + 1)]
+        wanted = [c for c in wanted if c >= 0]
+
+        with self._lock:
+            self._focus = (path, idx)
+            stale = [key for key in self._pending if key[0] != path or key[1] not in wanted]
+            stale_jobs = [self._pending.pop(key) for key in stale]
+        for job in stale_jobs:
+            job.cancel()
+
+        for n, c in enumerate(wanted):
+            priority = JobScheduler.PRIORITY_INTERACTIVE if n == 0 else JobScheduler.PRIORITY_NORMAL
+            self._schedule(path, c, priority)
+        return self.frame_at(path, local_ms)
+
+    def frame_at(self, path, local_ms):
+        idx = self.frame_index(local_ms)
+        with self._lock:
+            image = self._frames.get((path, idx))
+            if image is None:
+                # pana vine cadrul exact, cel mai apropiat din aceeasi bucata e mai bun decat nimic
+                chunk_start = idx - idx % self.FRAMES_PER_CHUNK
+                nearest = [i for i in range(chunk_start, chunk_start + self.FRAMES_PER_CHUNK) if (path, i) in self._frames]
+                if nearest:
+                    image = self._frames[(path, min(nearest, key=lambda i: abs(i - idx)))]
+            return image
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            jobs = list(self._pending.values())
+            self._pending.clear()
+        for job in jobs:
+            job.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+        self.clear()
+
+    def _schedule(self, path, chunk, priority):
+        key = (path, chunk)
+        with self._lock:
+            if self._closed or path in self._failed_paths or key in self._pending or key in self._empty_chunks:
+                return
+            first = chunk * self.FRAMES_PER_CHUNK
+            if all((path, i) in self._frames for i in range(first, first + self.FRAMES_PER_CHUNK)):
+                return
+            self._pending[key] = self._scheduler.submit(self._decode, key, priority=priority)
+
+    def _store(self, path, first, images):
+        with self._lock:
+            for n, image in enumerate(images):
+                self._frames[(path, first + n)] = image
+            if len(self._frames) <= self.MAX_FRAMES:
+                return
+            # se pastreaza cadrele cele mai apropiate de playhead, din sursa curenta
+            focus_path, focus_idx = self._focus or (path, first)
+            by_distance = sorted(self._frames, key=lambda k: (k[0] != focus_path, abs(k[1] - focus_idx)))
+            for key in by_distance[self.MAX_FRAMES:]:
+                del self._frames[key]
+
+    def _decode(self, job, key):
+        path, chunk = key
+        first = chunk * self.FRAMES_PER_CHUNK
+        w, h = self.FRAME_WIDTH, self.FRAME_HEIGHT
+        cmd = [
+            'ffmpeg', '-v', 'error', '-ss', str(first / self.FPS), '-i', path,
+            '-t', str(self.FRAMES_PER_CHUNK / self.FPS), '-an',
+            '-vf', f"fps={self.FPS},scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                   f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
+            '-frames:v', str(self.FRAMES_PER_CHUNK),
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'
+        ]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            job.attach_process(proc)
+            try:
+                data = proc.stdout.read()
+            finally:
+                proc.stdout.close()
+                proc.wait()
+                job.detach_process(proc)
+            if job.cancelled:
+                return
+
+            if proc.returncode != 0:
+                with self._lock:
+                    self._failed_paths.add(path)
+                raise RuntimeError("ffmpeg could not decode video")
+
+            frame_bytes = w * h * 3
+            images = []
+            for i in range(len(data) // frame_bytes):
+                image = QImage(data[i * frame_bytes:(i + 1) * frame_bytes], w, h, w * 3, QImage.Format_RGB888)
+                images.append(image.copy())
+            if not images:
+                # bucata e dupa finalul fisierului
+                with self._lock:
+                    self._empty_chunks.add(key)
+                return
+            self._store(path, first, images)
+            self.chunk_ready.emit(path)
+        except Exception as e:
+            if not job.cancelled:
+                print(f"Scrub frames failed for {path}: {e}")
+        finally:
+            with self._lock:
+                if self._pending.get(key) is job:
+                    del self._pending[key]
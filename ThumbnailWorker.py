@@ -0,0 +1,106 @@
+import os
+import hashlib
+import subprocess
+import threading
+from PySide6.QtCore import QObject, Signal, Qt
+from PySide6.QtGui import QImage
+from JobScheduler import JobScheduler
+
+class ThumbnailWorker(QObject):
+    thumbnail_ready = Signal(str, str)
+    thumbnail_failed = Signal(str)
+
+    THUMB_WIDTH = 160
+    THUMB_HEIGHT = 90
+
+    def __init__(self, thumb_dir, image_exts, video_exts, scheduler=None):
+        super().__init__()
+        self.thumb_dir = thumb_dir
+        self.image_exts = image_exts
+        self.video_exts = video_exts
+        os.makedirs(thumb_dir, exist_ok=True)
+
+        self._scheduler = scheduler or JobScheduler.shared()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def cache_path(self, path):
+        st = os.stat(path)
+        key = hashlib.md5(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.thumb_dir, f"{name}_{key}.jpg")
+
+    def cached_thumbnail(self, path):
+        try:
+            thumb = self.cache_path(path)
+        except OSError:
+            return None
+        return thumb if os.path.exists(thumb) else None
+
+    def request(self, paths):
+        with self._lock:
+            if self._closed:
+                return
+            for path in paths:
+                if path in self._pending:
+                    continue
+                self._pending[path] = self._scheduler.submit(
+                    self._generate, path, priority=JobScheduler.PRIORITY_BACKGROUND)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._pending.values())
+        for job in jobs:
+            job.cancel()
+
+    def _generate(self, job, path):
+        try:
+            if self._closed:
+                return
+            thumb = self.cache_path(path)
+            if not os.path.exists(thumb):
+                ext = os.path.splitext(path)[1].lower()
+                tmp_thumb = thumb[:-4] + ".part.jpg"
+                if ext in self.image_exts:
+                    self._generate_image_thumbnail(path, tmp_thumb)
+                elif ext in self.video_exts:
+                    self._generate_video_thumbnail(job, path, tmp_thumb)
+                else:
+                    return
+                os.replace(tmp_thumb, thumb)
+            self.thumbnail_ready.emit(path, thumb)
+        except Exception as e:
+            if job.cancelled:
+                return
+            print(f"Thumbnail failed for {path}: {e}")
+            self.thumbnail_failed.emit(path)
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+
+    def _generate_image_thumbnail(self, path, out_thumb):
+        image = QImage(path)
+        if image.isNull():
+            raise RuntimeError("unreadable image")
+        thumb = image.scaled(self.THUMB_WIDTH, self.THUMB_HEIGHT, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        if not thumb.save(out_thumb, "JPG"):
+            raise RuntimeError("could not write thumbnail")
+
+    def _generate_video_thumbnail(self, job, path, out_thumb):
+        cmd = [
+            'ffmpeg', '-y', '-v', 'error', '-i', path,
+            '-vf', f"thumbnail,scale={self.THUMB_WIDTH}:{self.THUMB_HEIGHT}:force_original_aspect_ratio=decrease",
+            '-frames:v', '1', '-update', '1', out_thumb
+        ]
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        job.attach_process(proc)
+        try:
+            returncode = proc.wait()
+        finally:
+            job.detach_process(proc)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+        if not os.path.exists(out_thumb):
+            raise RuntimeError("ffmpeg produced no frame")
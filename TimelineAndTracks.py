@@ -1,6 +1,5 @@
 import sys
 import os
-import subprocess
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QPushButton, QVBoxLayout, QSlider, QScrollArea, 
     QProgressDialog, QApplication
@@ -10,7 +9,11 @@ from PySide6.QtGui import QIcon, QKeySequence, QCursor, QShortcut
 
 from TimelineTrackWidget import TimelineTrackWidget
 from FileImporterWorker import FileImporterWorker
+from ProxyWorker import ProxyWorker
 from FilterBridge import FilterBridge
+from base.media_probe import MediaProbe
+from base.media_types import AUDIO_EXT
+from JobScheduler import JobScheduler
 
 class TimelineAndTracks(QWidget):
     seek_request = Signal(int)
@@ -20,7 +23,7 @@ class TimelineAndTracks(QWidget):
     
     IMG_EXT = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
     VID_EXT = {'.mp4', '.mov', '.avi', '.mkv'}
-    AUD_EXT = {'.mp3', '.wav', '.flac'}
+    AUD_EXT = AUDIO_EXT
 
     def __init__(self, SPACING, parent=None):
         super().__init__(parent)
@@ -99,11 +102,9 @@ class TimelineAndTracks(QWidget):
         self.align_tracks_button.clicked.connect(self._on_align_tracks_clicked)
 
         self.filter_bridge = FilterBridge(self.tracks_cache_dir)
-        self.filter_bridge.processing_finished.connect(self._on_filter_processing_done)
-        self.filter_bridge.processing_error.connect(self._on_filter_error)
-        
-        self.processing_dialog = None
-        self.active_clip_indices = (None, None) 
+        self.filter_bridge.render_cache.paths_in_use = self.paths_in_use
+
+        ProxyWorker.shared().proxy_ready.connect(self._on_proxy_ready)
 
     def eventFilter(self, source, event):
         if source == self.scroll_area.viewport() and event.type() == QEvent.Wheel:
@@ -172,83 +173,56 @@ class TimelineAndTracks(QWidget):
         if idx != -1 and idx < len(track.clips):
             clip = track.clips[idx]
             if not clip.get('is_auto_gap', False):
-                path_to_probe = clip.get('original_path', clip['path'])
-                w, h = self.filter_bridge.get_video_dimensions(clip['path'])
-                media_type = 'video'
-                
-                if clip.get('is_audio_proxy', False):
-                    media_type = 'audio'
-                else:
-                    _, ext = os.path.splitext(path_to_probe)
-                    ext = ext.lower()
-                    if ext in self.AUD_EXT:
-                        media_type = 'audio'
-                    elif ext in self.IMG_EXT:
-                        media_type = 'image'
-
-                clip_data_with_meta = clip.copy()
-                clip_data_with_meta['resolution'] = (w, h)
-                clip_data_with_meta['media_type'] = media_type
-                
-                available_overlays = []
-                for t in self.track_widgets:
-                    for c in t.clips:
-
-                        if c != clip and not c.get('is_auto_gap', False):
-                            c_path = c.get('original_path', c['path'])
-                            _, c_ext = os.path.splitext(c_path)
-                            if c_ext.lower() in self.VID_EXT or c_ext.lower() in self.IMG_EXT:
-                                available_overlays.append({
-                                    'name': c['name'],
-                                    'path': c_path
-                                })
-                
-                clip_data_with_meta['available_overlays'] = available_overlays
-                
-                self.clip_selected_for_filters.emit(clip_data_with_meta)
+                JobScheduler.shared().submit(
+                    lambda job, path=clip['path']: self.filter_bridge.get_video_dimensions(path),
+                    priority=JobScheduler.PRIORITY_INTERACTIVE,
+                    on_done=lambda dims, t=track, c=clip: self._emit_clip_selected(t, c, dims))
             else:
                 self.clip_selected_for_filters.emit({})
         else:
             self.clip_selected_for_filters.emit({})
 
-    def handle_apply_filters(self, filter_stack):
-        track = self.get_active_track()
-        if not track: return
-        
+    def _emit_clip_selected(self, track, clip, dims):
+        # selectia se poate schimba cat timp ruleaza probe-ul
+        if self.get_active_track() is not track:
+            return
         idx = track.selected_index
-        if idx == -1 or idx >= len(track.clips): return 
-        
-        clip = track.clips[idx]
-        if clip.get('is_auto_gap', False): return
+        if idx == -1 or idx >= len(track.clips) or track.clips[idx] is not clip:
+            return
 
-        if 'original_path' not in clip:
-            clip['original_path'] = clip['path']
+        w, h = dims
+        path_to_probe = clip.get('original_path', clip['path'])
+        media_type = 'video'
         
-        original_path = clip['original_path']
-        self.active_clip_indices = (track, idx)
-
-        self.processing_dialog = QProgressDialog("Applying filters (please wait)...", None, 0, 0, self)
-        self.processing_dialog.setWindowModality(Qt.WindowModal)
-        self.processing_dialog.setCancelButton(None)
-        self.processing_dialog.show()
-
-        QTimer.singleShot(100, lambda: self.filter_bridge.process_clip(original_path, filter_stack))
-
-    def _on_filter_processing_done(self, new_path, filter_data):
-        if self.processing_dialog:
-            self.processing_dialog.close()
+        if clip.get('is_audio_proxy', False):
+            media_type = 'audio'
+        else:
+            _, ext = os.path.splitext(path_to_probe)
+            ext = ext.lower()
+            if ext in self.AUD_EXT:
+                media_type = 'audio'
+            elif ext in self.IMG_EXT:
+                media_type = 'image'
+
+        clip_data_with_meta = clip.copy()
+        clip_data_with_meta['resolution'] = (w, h)
+        clip_data_with_meta['media_type'] = media_type
         
-        track, idx = self.active_clip_indices
-        if track and idx is not None:
-            if idx < len(track.clips):
-                new_duration_ms = self._get_file_duration(new_path)
-                track.update_clip_path_and_filters(idx, new_path, new_duration_ms, filter_data)
-                self.timeline_structure_changed.emit()
-
-    def _on_filter_error(self, msg):
-        if self.processing_dialog:
-            self.processing_dialog.close()
-        print(f"Filter Error: {msg}")
+        available_overlays = []
+        for t in self.track_widgets:
+            for c in t.clips:
+
+                if c != clip and not c.get('is_auto_gap', False):
+                    c_path = c.get('original_path', c['path'])
+                    _, c_ext = os.path.splitext(c_path)
+                    if c_ext.lower() in self.VID_EXT or c_ext.lower() in self.IMG_EXT:
+                        available_overlays.append({
+                            'name': c['name'],
+                            'path': c_path
+                        })
+        
+        clip_data_with_meta['available_overlays'] = available_overlays
+        self.clip_selected_for_filters.emit(clip_data_with_meta)
 
     def _perform_zoom(self, direction):
         if not self.track_widgets: return
@@ -364,7 +338,8 @@ class TimelineAndTracks(QWidget):
         
         if idx != -1:
             new_track = self.add_new_track(insert_index=idx)
-            new_track.add_clip_at_pos(clip_data['path'], start_ms, clip_data['duration'], clip_data['color'])
+            # copie completa: source_in/out, filtrele si proxy-ul merg cu clipul pe track-ul nou
+            new_track.insert_clip_physically(dict(clip_data, start=start_ms))
             self.timeline_structure_changed.emit()
 
     def _sync_all_tracks_duration(self):
@@ -391,10 +366,13 @@ class TimelineAndTracks(QWidget):
             v_bar.setValue(v_bar.value() + v_step)
 
     def set_active_track(self, track_widget):
+        # Ctrl+click pastreaza selectia de pe celelalte track-uri pentru aplicarea in lot
+        keep_selection = bool(QApplication.keyboardModifiers() & Qt.ControlModifier)
         for t in self.track_widgets:
             if t != track_widget:
                 t.is_active_track = False
-                t.clear_selection()
+                if not keep_selection:
+                    t.clear_selection()
                 t.update()
             else:
                 t.is_active_track = True
@@ -404,7 +382,26 @@ class TimelineAndTracks(QWidget):
 
     def get_active_track(self):
         return self.active_track
+
+    def attach_proxy(self, clip):
+        # preview-ul citeste proxy_path, exportul ramane pe path
+        clip.pop('proxy_path', None)
+        proxy = ProxyWorker.shared().proxy_for(clip['path'])
+        if proxy:
+            clip['proxy_path'] = proxy
+
+    def _on_proxy_ready(self, path, proxy):
+        for t in self.track_widgets:
+            for c in t.clips:
+                if c.get('path') == path:
+                    c['proxy_path'] = proxy
+
+    def get_selected_clips(self):
+        return [(t, c) for t in self.track_widgets for c in t.selected_clips()]
     
+    def paths_in_use(self):
+        return {os.path.abspath(c['path']) for t in self.track_widgets for c in t.clips}
+
     def get_content_end_all_tracks(self):
         max_end = 0
         for t in self.track_widgets:
@@ -414,8 +411,7 @@ class TimelineAndTracks(QWidget):
 
     def set_global_playhead(self, ms):
         for t in self.track_widgets:
-            t.playhead_pos_ms = ms
-            t.update()
+            t.move_playhead(ms)
 
     def set_global_duration(self, ms):
         for t in self.track_widgets:
@@ -463,7 +459,15 @@ class TimelineAndTracks(QWidget):
         active_track = self.get_active_track()
         if not active_track: return
 
-        insert_duration_ms = self._get_file_duration(cached_path)
+        JobScheduler.shared().submit(
+            lambda job: self._get_file_duration(cached_path),
+            priority=JobScheduler.PRIORITY_INTERACTIVE,
+            on_done=lambda duration_ms: self._insert_processed_media(cached_path, duration_ms))
+
+    def _insert_processed_media(self, cached_path, insert_duration_ms):
+        active_track = self.get_active_track()
+        if not active_track: return
+
         playhead_pos = active_track.playhead_pos_ms
         
         if active_track.is_overlapping(playhead_pos, insert_duration_ms):
@@ -480,9 +484,7 @@ class TimelineAndTracks(QWidget):
         if path.endswith(tuple(self.IMG_EXT)):
             return 5000
         try:
-            cmd = f'ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "{path}"'
-            res = subprocess.check_output(cmd, shell=True)
-            return float(res) * 1000
+            return MediaProbe.shared().probe(path)['duration'] * 1000
         except: 
             return 5000
 
@@ -516,4 +518,5 @@ class TimelineAndTracks(QWidget):
             'is_audio_proxy': is_audio_proxy,
             'filters': {}
         }
+        self.attach_proxy(clip_data)
         track_widget.insert_clip_physically(clip_data)
\ No newline at end of file
@@ -1,12 +1,15 @@
+import bisect
 import copy
 import json
 import time
 import os
-import subprocess
-import uuid
+from collections import OrderedDict
 from PySide6.QtWidgets import QWidget, QApplication, QScrollArea
-from PySide6.QtCore import Qt, Signal, QRect, QPoint, QSize, QMimeData, QTimer
+from PySide6.QtCore import Qt, Signal, QRect, QPoint, QSize, QMimeData, QTimer, QLine
 from PySide6.QtGui import QPainter, QPen, QColor, QBrush, QFont, QDrag, QPixmap, QCursor
+from WaveformWorker import WaveformWorker
+from FilmstripWorker import FilmstripWorker
+from base.media_types import AUDIO_EXT
 
 class TimelineTrackWidget(QWidget):
     seek_request = Signal(int)
@@ -15,6 +18,11 @@ class TimelineTrackWidget(QWidget):
     track_changed = Signal() 
     request_overlap_insertion = Signal(dict, int) 
     zoom_request_signal = Signal(int, int) 
+    AUDIO_EXT = tuple(AUDIO_EXT)
+    IMAGE_EXT = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+    STATIC_CHUNK_WIDTH = 512
+    MAX_STATIC_CHUNKS = 48
+    PLAYHEAD_STRIP = 10
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -25,8 +33,13 @@ class TimelineTrackWidget(QWidget):
         self.playhead_pos_ms = 0
         self.pixels_per_second = 50 
         self.clips = []
+        self._index_source = None
+        self._static_chunks = OrderedDict()
+        self._static_chunks_state = None
         
         self.selected_index = -1
+        # clipuri adaugate cu Ctrl+click; tinute ca referinte, indicii se schimba la rebuild
+        self.multi_selection = []
         self._dragging_playhead = False
         self.is_active_track = False
         
@@ -37,8 +50,6 @@ class TimelineTrackWidget(QWidget):
 
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.black_path = os.path.join(base_dir, "icons", "blackCat.jpg")
-        self.files_cache_dir = os.path.join(base_dir, "filesFromTracks")
-        os.makedirs(self.files_cache_dir, exist_ok=True)
 
         self._drag_start_pos = QPoint()
         self.ghost_clip = None 
@@ -53,8 +64,69 @@ class TimelineTrackWidget(QWidget):
         self._scroll_direction_y = 0 
         self.last_expand_time = 0.0
 
+        WaveformWorker.shared().peaks_ready.connect(self._on_clip_media_ready)
+        FilmstripWorker.shared().tile_ready.connect(self._on_clip_media_ready)
+
         self._update_dimensions()
 
+    def _on_clip_media_ready(self, path):
+        for clip in self.clips:
+            if clip['path'] == path:
+                self.invalidate_static()
+                return
+
+    def _is_audio_clip(self, clip):
+        return clip.get('is_audio_proxy', False) or clip['path'].lower().endswith(self.AUDIO_EXT)
+
+    def _is_video_clip(self, clip):
+        if clip.get('is_auto_gap', False) or self._is_audio_clip(clip):
+            return False
+        return not clip['path'].lower().endswith(self.IMAGE_EXT)
+
+    def _draw_filmstrip(self, painter, clip, clip_rect, visible_rect):
+        worker = FilmstripWorker.shared()
+        frame_w = worker.FRAME_WIDTH
+        level = worker.level_for(self.pixels_per_second)
+        interval = 2.0 ** level
+        source_in_sec = clip.get('source_in', 0) / 1000.0
+
+        first_slot = max(0, (visible_rect.left() - clip_rect.left()) // frame_w)
+        last_slot = (min(clip_rect.right(), visible_rect.right()) - clip_rect.left()) // frame_w
+
+        painter.save()
+        painter.setClipRect(clip_rect)
+        for slot in range(first_slot, last_slot + 1):
+            frame_idx = int((source_in_sec + slot * frame_w / self.pixels_per_second) / interval)
+            tile, source = worker.frame_at(clip['path'], level, frame_idx)
+            if tile is None:
+                continue
+            target = QRect(clip_rect.left() + slot * frame_w, clip_rect.top(), frame_w, clip_rect.height())
+            painter.drawImage(target, tile, source)
+        painter.restore()
+
+    def _draw_waveform(self, painter, clip, clip_rect, visible_rect):
+        peaks = WaveformWorker.shared().peaks_for(clip['path'])
+        if peaks is None:
+            return
+        x0 = max(clip_rect.left(), visible_rect.left())
+        x1 = min(clip_rect.right(), visible_rect.right())
+        count = x1 - x0 + 1
+        if count <= 0:
+            return
+
+        start_sec = clip.get('source_in', 0) / 1000.0 + (x0 - clip_rect.left()) / self.pixels_per_second
+        columns = peaks.columns(start_sec, self.pixels_per_second, count)
+        if columns is None:
+            return
+        mins, maxs = columns
+        mid = clip_rect.center().y()
+        half = clip_rect.height() / 2 - 2
+        tops = (mid - maxs * half).astype(int).tolist()
+        bottoms = (mid - mins * half).astype(int).tolist()
+
+        painter.setPen(QPen(QColor(255, 255, 255, 170), 1))
+        painter.drawLines([QLine(x0 + i, top, x0 + i, bottom) for i, (top, bottom) in enumerate(zip(tops, bottoms))])
+
     def update_clip_path_and_filters(self, idx, new_path, new_duration, filter_data):
         if 0 <= idx < len(self.clips):
             clip = self.clips[idx]
@@ -67,10 +139,14 @@ class TimelineTrackWidget(QWidget):
             
             clip['path'] = new_path
             clip['filters'] = filter_data
+            clip.pop('proxy_path', None)
             
             if new_duration > 0:
                 if was_image:
                     clip['duration'] = min(clip['duration'], new_duration)
+                elif 'source_in' in clip:
+                    clip['source_out'] = min(clip['source_out'], new_duration)
+                    clip['duration'] = max(0, clip['source_out'] - clip['source_in'])
                 else:
                     clip['duration'] = new_duration
             
@@ -109,14 +185,25 @@ class TimelineTrackWidget(QWidget):
         self.setMinimumHeight(120)
 
     def set_playhead(self, ms):
-        self.playhead_pos_ms = max(0, ms)
+        self.move_playhead(max(0, ms))
         if self.playhead_pos_ms > self.duration_ms:
              self.set_duration(self.playhead_pos_ms + 5000)
-        self.update()
+
+    def move_playhead(self, ms):
+        old_x = self.ms_to_px(self.playhead_pos_ms)
+        self.playhead_pos_ms = ms
+        new_x = self.ms_to_px(ms)
+        if new_x == old_x:
+            return
+        strip = self.PLAYHEAD_STRIP
+        self.update(QRect(old_x - strip, 0, 2 * strip, self.height()))
+        self.update(QRect(new_x - strip, 0, 2 * strip, self.height()))
 
     def clear_tracks(self):
         self.clips = []
+        self._invalidate_index()
         self.selected_index = -1
+        self.multi_selection = []
         self.playhead_pos_ms = 0
         self.update()
         self.track_changed.emit()
@@ -165,9 +252,57 @@ class TimelineTrackWidget(QWidget):
                 new_clip_list.append(final_gap)
         
         self.clips = new_clip_list
+        self._invalidate_index()
         self.duration_ms = final_duration
         self._update_dimensions()
 
+    def _reindex(self):
+        clips = self.clips
+        self._static_chunks.clear()
+        order = sorted(range(len(clips)), key=lambda i: clips[i]['start'])
+        self._index_source = clips
+
+        self._all_order = order
+        self._all_starts = []
+        self._all_max_ends = []
+        self._user_order = []
+        self._user_starts = []
+        self._user_ends = []
+        self._user_max_ends = []
+        snap_points = []
+
+        max_end = max_user_end = float('-inf')
+        for i in order:
+            clip = clips[i]
+            start = clip['start']
+            end = start + clip['duration']
+            max_end = max(max_end, end)
+            self._all_starts.append(start)
+            self._all_max_ends.append(max_end)
+            if clip.get('is_auto_gap', False):
+                continue
+            max_user_end = max(max_user_end, end)
+            self._user_order.append(i)
+            self._user_starts.append(start)
+            self._user_ends.append(end)
+            self._user_max_ends.append(max_user_end)
+            snap_points.append((start, i))
+            snap_points.append((end, i))
+
+        snap_points.sort()
+        self._snap_values = [v for v, _ in snap_points]
+        self._snap_owners = [i for _, i in snap_points]
+        self._content_end = max(0, max_user_end)
+
+    def _invalidate_index(self):
+        # orice mutator care schimba lista sau start/duration apeleaza asta; indexul se reface la urmatoarea cerere
+        self._index_source = None
+        self._static_chunks.clear()
+
+    def _ensure_index(self):
+        if self._index_source is not self.clips:
+            self._reindex()
+
     def set_duration_and_fill_gaps(self, max_ms):
         self._rebuild_track_with_gaps(force_duration_to=max_ms)
         self.update()
@@ -183,6 +318,7 @@ class TimelineTrackWidget(QWidget):
             if not clip.get('is_auto_gap', False):
                 if clip['path'] == path and abs(clip['start'] - start_ms) < 50:
                     del self.clips[i]
+                    self._invalidate_index()
                     self.track_changed.emit()
                     return True
         return False
@@ -201,27 +337,13 @@ class TimelineTrackWidget(QWidget):
         self.update()
         self.track_changed.emit()
 
-    def add_clip_at_pos(self, file_path, start_pos, duration_ms, color):
-        name = os.path.basename(file_path)
-        new_clip = {
-            'path': file_path,
-            'start': start_pos,
-            'duration': duration_ms,
-            'name': name,
-            'color': color,
-            'is_auto_gap': False
-        }
-        self.clips.append(new_clip)
-        self._rebuild_track_with_gaps()
-        self.update()
-        self.track_changed.emit()
-
     def delete_selected_clip(self):
         if self.selected_index != -1 and 0 <= self.selected_index < len(self.clips):
             if self.clips[self.selected_index].get('is_auto_gap', False):
                 return False
             del self.clips[self.selected_index]
             self.selected_index = -1 
+            self.multi_selection = []
             self._rebuild_track_with_gaps()
             self.update()
             self.track_changed.emit()
@@ -229,20 +351,39 @@ class TimelineTrackWidget(QWidget):
         return False
 
     def get_clip_at_ms(self, ms):
-        for clip in self.clips:
-            start = clip['start']
-            end = start + clip['duration']
-            if start <= ms < end:
-                return clip
+        self._ensure_index()
+        hi = bisect.bisect_right(self._all_starts, ms)
+        pos = bisect.bisect_right(self._all_max_ends, ms, 0, hi)
+        if pos < hi:
+            return self.clips[self._all_order[pos]]
+        return None
+
+    def next_boundary_after(self, ms):
+        # primul inceput sau sfarsit de clip de dupa ms
+        self._ensure_index()
+        pos = bisect.bisect_right(self._snap_values, ms)
+        if pos < len(self._snap_values):
+            return self._snap_values[pos]
         return None
 
+    def clips_in_px_range(self, left, right):
+        # indicii clipurilor vizibile intre left si right (pixeli), in ordinea startului;
+        # indexul da candidatii, testul in pixeli e cel folosit la desenare
+        self._ensure_index()
+        hi = bisect.bisect_right(self._all_starts, self.px_to_ms(right + 2))
+        pos = bisect.bisect_left(self._all_max_ends, self.px_to_ms(left - 1), 0, hi)
+        visible = []
+        for k in range(pos, hi):
+            clip = self.clips[self._all_order[k]]
+            x_start = self.ms_to_px(clip['start'])
+            if x_start + self.ms_to_px(clip['duration']) < left or x_start > right:
+                continue
+            visible.append(self._all_order[k])
+        return visible
+
     def get_content_end_ms(self):
-        max_end = 0
-        for clip in self.clips:
-            if not clip.get('is_auto_gap', False):
-                end = clip['start'] + clip['duration']
-                if end > max_end: max_end = end
-        return max_end
+        self._ensure_index()
+        return self._content_end
 
     def ms_to_px(self, ms):
         return int((ms / 1000) * self.pixels_per_second)
@@ -266,47 +407,58 @@ class TimelineTrackWidget(QWidget):
         return None
 
     def is_overlapping(self, start_ms, duration_ms, excluded_index=-1):
+        self._ensure_index()
         end_ms = start_ms + duration_ms
-        
-        for i, clip in enumerate(self.clips):
-            if i == excluded_index:
-                continue
-                
-            if clip.get('is_auto_gap', False):
+        hi = bisect.bisect_left(self._user_starts, end_ms)
+        pos = bisect.bisect_right(self._user_max_ends, start_ms, 0, hi)
+
+        for k in range(pos, hi):
+            if self._user_order[k] == excluded_index:
                 continue
-            
-            c_start = clip['start']
-            c_end = c_start + clip['duration']
-            
-            if start_ms < c_end and end_ms > c_start:
+            if self._user_ends[k] > start_ms:
                 return True
         return False
+
+    def _nearest_snap_point(self, value_ms, exclude_index):
+        best = None
+        pos = bisect.bisect_left(self._snap_values, value_ms)
+        left = pos - 1
+        while left >= 0 and self._snap_owners[left] == exclude_index:
+            left -= 1
+        right = pos
+        while right < len(self._snap_values) and self._snap_owners[right] == exclude_index:
+            right += 1
+
+        candidates = [0]
+        if left >= 0:
+            candidates.append(self._snap_values[left])
+        if right < len(self._snap_values):
+            candidates.append(self._snap_values[right])
+        for cand in candidates:
+            if best is None or abs(value_ms - cand) < abs(value_ms - best):
+                best = cand
+        return best
     
     def _calculate_snap_position(self, proposed_start_ms, clip_duration_ms, exclude_index=-1):
         SNAP_THRESHOLD_PX = 15
         snap_threshold_ms = self.px_to_ms(SNAP_THRESHOLD_PX)
-        candidates = [0]
-        for i, clip in enumerate(self.clips):
-            if i == exclude_index: continue
-            if clip.get('is_auto_gap', False): continue
-            candidates.append(clip['start'])
-            candidates.append(clip['start'] + clip['duration'])
+        self._ensure_index()
         best_start = proposed_start_ms
         min_diff = float('inf')
         snap_indicator_x = None
-        for cand in candidates:
-            diff = abs(proposed_start_ms - cand)
-            if diff < snap_threshold_ms and diff < min_diff:
-                min_diff = diff
-                best_start = cand
-                snap_indicator_x = self.ms_to_px(cand)
+        cand = self._nearest_snap_point(proposed_start_ms, exclude_index)
+        diff = abs(proposed_start_ms - cand)
+        if diff < snap_threshold_ms and diff < min_diff:
+            min_diff = diff
+            best_start = cand
+            snap_indicator_x = self.ms_to_px(cand)
         proposed_end_ms = proposed_start_ms + clip_duration_ms
-        for cand in candidates:
-            diff = abs(proposed_end_ms - cand)
-            if diff < snap_threshold_ms and diff < min_diff:
-                min_diff = diff
-                best_start = cand - clip_duration_ms
-                snap_indicator_x = self.ms_to_px(cand)
+        cand = self._nearest_snap_point(proposed_end_ms, exclude_index)
+        diff = abs(proposed_end_ms - cand)
+        if diff < snap_threshold_ms and diff < min_diff:
+            min_diff = diff
+            best_start = cand - clip_duration_ms
+            snap_indicator_x = self.ms_to_px(cand)
 
         return best_start, snap_indicator_x
 
@@ -337,22 +489,46 @@ class TimelineTrackWidget(QWidget):
                             clicked_clip_idx = i
                             break
 
-            if clicked_clip_idx != -1:
+            if clicked_clip_idx != -1 and event.modifiers() & Qt.ControlModifier:
+                self._toggle_multi_selection(clicked_clip_idx)
+            elif clicked_clip_idx != -1:
                 self.selected_index = clicked_clip_idx
+                self.multi_selection = []
             else:
                 self.selected_index = -1
+                self.multi_selection = []
                 self.set_playhead(ms)
                 self.seek_request.emit(ms)
             
             self.update()
             self.mouse_pressed_signal.emit()
 
+    def _toggle_multi_selection(self, idx):
+        if not self.multi_selection and 0 <= self.selected_index < len(self.clips):
+            primary = self.clips[self.selected_index]
+            if not primary.get('is_auto_gap', False):
+                self.multi_selection.append(primary)
+        clip = self.clips[idx]
+        if any(c is clip for c in self.multi_selection):
+            self.multi_selection = [c for c in self.multi_selection if c is not clip]
+            self.selected_index = -1
+        else:
+            self.multi_selection.append(clip)
+            self.selected_index = idx
+
+    def selected_clips(self):
+        selected = [c for c in self.multi_selection if any(c is x for x in self.clips)]
+        if 0 <= self.selected_index < len(self.clips):
+            primary = self.clips[self.selected_index]
+            if not any(primary is c for c in selected):
+                selected.append(primary)
+        return [c for c in selected if not c.get('is_auto_gap', False)]
+
     def mouseMoveEvent(self, event):
         if event.buttons() & Qt.LeftButton and self._dragging_playhead:
             ms = max(0, self.px_to_ms(event.x()))
-            self.playhead_pos_ms = ms
+            self.move_playhead(ms)
             self.seek_request.emit(ms)
-            self.update()
             return
 
         if event.buttons() & Qt.LeftButton and self.selected_index != -1:
@@ -613,104 +789,71 @@ class TimelineTrackWidget(QWidget):
         
         split_point_global = self.playhead_pos_ms
         split_point_local_ms = split_point_global - target_clip['start']
-        split_point_sec = split_point_local_ms / 1000.0
-        
-        original_path = target_clip['path']
         original_duration = target_clip['duration']
-        
-        is_image = original_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))
-        
-        if is_image:
-            part1 = target_clip.copy()
-            part1['duration'] = split_point_local_ms
-
-            part2 = target_clip.copy()
-            part2['start'] = split_point_global
-            part2['duration'] = original_duration - split_point_local_ms
-            part2['name'] = part2['name'] + "_p2"
-
-            del self.clips[target_clip_index]
-            self.clips.insert(target_clip_index, part1)
-            self.clips.insert(target_clip_index + 1, part2)
-            
-        else:
 
-            unique_id = str(uuid.uuid4())[:8]
-            base_name = os.path.splitext(os.path.basename(original_path))[0]
-            ext = os.path.splitext(original_path)[1]
-            
-            part1_filename = f"{base_name}_part1_{unique_id}{ext}"
-            part2_filename = f"{base_name}_part2_{unique_id}{ext}"
-            
-            part1_path = os.path.join(self.files_cache_dir, part1_filename)
-            part2_path = os.path.join(self.files_cache_dir, part2_filename)
-            ffmpeg_args = []
-            
-            if ext.lower() == '.mp3':
-                ffmpeg_args = ['-c:a', 'libmp3lame', '-q:a', '2']
-            else:
-                ffmpeg_args = ['-c', 'copy']
-            cmd1 = [
-                'ffmpeg', '-y', 
-                '-ss', '0', 
-                '-i', original_path, 
-                '-t', str(split_point_sec), 
-                *ffmpeg_args,            
-                '-avoid_negative_ts', 'make_zero',
-                part1_path
-            ]
-
-            cmd2 = [
-                'ffmpeg', '-y', 
-                '-ss', str(split_point_sec), 
-                '-i', original_path, 
-                *ffmpeg_args,               
-                '-avoid_negative_ts', 'make_zero',
-                part2_path
-            ]
+        # split nedistructiv: ambele parti raman pe acelasi fisier, doar cu alte puncte in/out
+        part1 = target_clip.copy()
+        part1['duration'] = split_point_local_ms
 
-            try:
-                subprocess.run(cmd1, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                subprocess.run(cmd2, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                
-                part1 = target_clip.copy()
-                part1['path'] = part1_path
-                part1['original_path'] = part1_path
-                part1['duration'] = split_point_local_ms 
-                
-                part2 = target_clip.copy()
-                part2['path'] = part2_path
-                part2['original_path'] = part2_path
-                part2['start'] = split_point_global
-                part2['duration'] = original_duration - split_point_local_ms
-                part2['name'] = base_name + "_p2"
-                
-                del self.clips[target_clip_index]
-                self.clips.insert(target_clip_index, part1)
-                self.clips.insert(target_clip_index + 1, part2)
-                
-            except Exception as e:
-                print(f"Error splitting file: {e}")
-                return False
+        part2 = target_clip.copy()
+        part2['start'] = split_point_global
+        part2['duration'] = original_duration - split_point_local_ms
+        part2['name'] = os.path.splitext(target_clip['name'])[0] + "_p2"
+
+        if not target_clip['path'].lower().endswith(self.IMAGE_EXT):
+            source_in = target_clip.get('source_in', 0)
+            part1['source_in'] = source_in
+            part1['source_out'] = source_in + split_point_local_ms
+            part2['source_in'] = source_in + split_point_local_ms
+            part2['source_out'] = target_clip.get('source_out', source_in + original_duration)
+
+        del self.clips[target_clip_index]
+        self.clips.insert(target_clip_index, part1)
+        self.clips.insert(target_clip_index + 1, part2)
 
         self.selected_index = -1 
+        self.multi_selection = []
         self._rebuild_track_with_gaps()
         self.track_changed.emit()
         self.update()
         return True
 
-        self.selected_index = -1 
-        self._rebuild_track_with_gaps()
-        self.track_changed.emit()
+    def _static_state(self):
+        return (self.pixels_per_second, self.selected_index, tuple(id(c) for c in self.multi_selection),
+                self.is_active_track, self.height(), self.devicePixelRatioF())
+
+    def invalidate_static(self):
+        self._static_chunks.clear()
         self.update()
-        return True
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def _static_chunk(self, chunk_idx):
+        state = self._static_state()
+        if state != self._static_chunks_state:
+            self._static_chunks.clear()
+            self._static_chunks_state = state
+
+        pixmap = self._static_chunks.get(chunk_idx)
+        if pixmap is not None:
+            self._static_chunks.move_to_end(chunk_idx)
+            return pixmap
+
+        dpr = self.devicePixelRatioF()
+        chunk_rect = QRect(chunk_idx * self.STATIC_CHUNK_WIDTH, 0, self.STATIC_CHUNK_WIDTH, self.height())
+        pixmap = QPixmap(int(chunk_rect.width() * dpr), int(chunk_rect.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        painter = QPainter(pixmap)
+        painter.translate(-chunk_rect.left(), 0)
+        self._paint_static(painter, chunk_rect)
+        painter.end()
+
+        self._static_chunks[chunk_idx] = pixmap
+        while len(self._static_chunks) > self.MAX_STATIC_CHUNKS:
+            self._static_chunks.popitem(last=False)
+        return pixmap
+
+    def _paint_static(self, painter, visible_rect):
         painter.setRenderHint(QPainter.Antialiasing)
 
-        visible_rect = event.rect()
-        
         bg_color = QColor("#f0f0f0")
         if self.is_active_track:
             bg_color = QColor("#e6f3ff") 
@@ -719,7 +862,7 @@ class TimelineTrackWidget(QWidget):
         if self.is_active_track:
             pen = QPen(QColor("#3a6ea5"), 2)
             painter.setPen(pen)
-            painter.drawRect(visible_rect.adjusted(1,1,-1,-1))
+            painter.drawRect(self.rect().adjusted(1,1,-1,-1))
         ruler_height = 30
         painter.fillRect(QRect(visible_rect.left(), 0, visible_rect.width(), ruler_height), QColor("#e0e0e0"))
         
@@ -744,15 +887,19 @@ class TimelineTrackWidget(QWidget):
         track_height = 60
         painter.fillRect(QRect(visible_rect.left(), track_y, visible_rect.width(), track_height), QColor("#ffffff"))
 
-        for i, clip in enumerate(self.clips):
+        multi_ids = {id(c) for c in self.multi_selection}
+        for i in self.clips_in_px_range(visible_rect.left(), visible_rect.right()):
+            clip = self.clips[i]
             x_start = self.ms_to_px(clip['start'])
             w_clip = self.ms_to_px(clip['duration'])
-            if x_start + w_clip < visible_rect.left() or x_start > visible_rect.right():
-                continue
             clip_rect = QRect(x_start, track_y + 2, w_clip, track_height - 4)
             painter.fillRect(clip_rect, QColor(clip.get('color', '#3a6ea5')))
             is_gap = clip.get('is_auto_gap', False)
-            if i == self.selected_index and not is_gap:
+            if not is_gap and self._is_audio_clip(clip):
+                self._draw_waveform(painter, clip, clip_rect, visible_rect)
+            elif self._is_video_clip(clip):
+                self._draw_filmstrip(painter, clip, clip_rect, visible_rect)
+            if (i == self.selected_index or id(clip) in multi_ids) and not is_gap:
                 painter.setPen(QPen(QColor("yellow"), 3))
                 painter.drawRect(clip_rect)
             elif not is_gap:
@@ -760,6 +907,21 @@ class TimelineTrackWidget(QWidget):
                 painter.drawRect(clip_rect)
                 painter.drawText(clip_rect, Qt.AlignCenter, clip['name'])
 
+    def paintEvent(self, event):
+        self._ensure_index()
+        painter = QPainter(self)
+        visible_rect = event.rect()
+
+        # stratul static (rigla, clipuri, waveform-uri) vine din pixmap-uri pe bucati
+        first_chunk = visible_rect.left() // self.STATIC_CHUNK_WIDTH
+        last_chunk = visible_rect.right() // self.STATIC_CHUNK_WIDTH
+        for chunk_idx in range(first_chunk, last_chunk + 1):
+            painter.drawPixmap(chunk_idx * self.STATIC_CHUNK_WIDTH, 0, self._static_chunk(chunk_idx))
+
+        painter.setRenderHint(QPainter.Antialiasing)
+        track_y = 40
+        track_height = 60
+
         if self.ghost_clip:
             g_start = self.ms_to_px(self.ghost_clip['start'])
             g_width = self.ms_to_px(self.ghost_clip['duration'])
@@ -788,6 +950,7 @@ class TimelineTrackWidget(QWidget):
             painter.drawPolygon([QPoint(ph_x - 6, 0), QPoint(ph_x + 6, 0), QPoint(ph_x, 15)])
         
     def clear_selection(self):
-        if self.selected_index != -1:
+        if self.selected_index != -1 or self.multi_selection:
             self.selected_index = -1
+            self.multi_selection = []
             self.update()
\ No newline at end of file
@@ -2,6 +2,7 @@ import os
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QFileDialog
 from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QIcon
+from base.media_types import AUDIO_EXT
 
 class Toolbar(QWidget):
     files_selected = Signal(list);
@@ -81,7 +82,8 @@ class Toolbar(QWidget):
             """
         
     def _on_add_files(self):
-            filters = "Media files (*.png *.jpg *.bmp *.gif *.mp4 *.mov *.avi *.mkv *.mp3 *.wav);;All files (*)"
+            audio = " ".join("*" + ext for ext in sorted(AUDIO_EXT))
+            filters = f"Media files (*.png *.jpg *.bmp *.gif *.mp4 *.mov *.avi *.mkv {audio});;All files (*)"
             paths, _ = QFileDialog.getOpenFileNames(self, "Select files", os.path.expanduser("~"), filters)
             if paths:
                 self.files_selected.emit(paths)   
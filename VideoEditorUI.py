@@ -3,14 +3,23 @@ import os
 import time
 from PySide6.QtWidgets import (
     QGridLayout, QWidget, QApplication, QListWidget, 
-    QProgressDialog, QMessageBox, QFileDialog
+    QProgressDialog, QMessageBox, QFileDialog, QInputDialog
 )
-from PySide6.QtCore import Qt, QTimer, QUrl, QThread, Signal
+from PySide6.QtCore import Qt, QTimer, QThread, Signal
 
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PySide6.QtMultimedia import QMediaPlayer
 
 from Toolbar import Toolbar
 from MediaTabs import MediaTabs
+from WaveformWorker import WaveformWorker
+from FilmstripWorker import FilmstripWorker
+from ProxyWorker import ProxyWorker
+from ScrubEngine import ScrubEngine
+from AudioPlayerPool import AudioPlayerPool
+from AudioMixEngine import AudioMixEngine
+from JobScheduler import JobScheduler
+from base.ffmpeg_progress import format_progress
+from base.media_types import AUDIO_EXT
 from VideoPreview import VideoPreview
 from EnchancementsTabs import EnchancementsTabs
 from TimelineAndTracks  import TimelineAndTracks
@@ -26,7 +35,10 @@ except ImportError:
 class VideoEditorUI(QWidget):
     
     IMG_EXT = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
-    request_filter_processing = Signal(str, dict)
+    AUD_EXT = AUDIO_EXT
+    AUDIO_VOLUME = 0.7
+    AUDIO_PREWARM_MS = 1500
+    request_filter_processing = Signal(str, dict, object)
 
     def __init__(self):
         super().__init__()
@@ -58,7 +70,10 @@ class VideoEditorUI(QWidget):
         self._connected_timeline_player = None
         self.auto_scroll_active = True 
         
-        self.active_audio_players = {} 
+        # mixerul software ia locul playerelor per clip; pool-ul ramane pentru cazul fara numpy/placa
+        self.audio_engine = AudioMixEngine(self)
+        self.audio_pool = AudioPlayerPool(self)
+        self.audio_pool.player_loaded.connect(self._on_player_loaded)
 
         self.is_scrubbing = False 
         self.global_playback_speed = 1.0  
@@ -68,6 +83,10 @@ class VideoEditorUI(QWidget):
         self.lazy_scrub_timer.setSingleShot(True)
         self.lazy_scrub_timer.timeout.connect(self._perform_lazy_sync)
         self.pending_scrub_ms = -1
+        self.scrub_engine = ScrubEngine()
+        self.scrub_engine.chunk_ready.connect(self._on_scrub_chunk_ready)
+        self._scrub_target = None
+        self._last_scrub_ms = 0
         self.reverse_timer = QTimer(self)
         self.reverse_timer.setInterval(33)
         self.reverse_timer.timeout.connect(self._on_reverse_tick)
@@ -111,6 +130,7 @@ class VideoEditorUI(QWidget):
         cache_dir = os.path.join(base_dir, "filesFromTracks")
         
         self.filter_bridge = FilterBridge(cache_dir)
+        self.filter_bridge.render_cache.paths_in_use = self.timeline_container.paths_in_use
         self.filter_bridge.moveToThread(self.filter_thread)
         
 
@@ -118,6 +138,8 @@ class VideoEditorUI(QWidget):
         self.request_filter_processing.connect(self.filter_bridge.process_clip)
         self.filter_bridge.processing_finished.connect(self._on_filter_finished)
         self.filter_bridge.processing_error.connect(self._on_filter_error)
+        self.filter_bridge.processing_progress.connect(self._on_filter_progress)
+        self.filter_bridge.processing_cancelled.connect(self._on_filter_cancelled)
 
         self.filter_thread.start()
 
@@ -129,24 +151,16 @@ class VideoEditorUI(QWidget):
         self.progress_dialog = None
         
         self.filter_loading_dialog = None
+        self.filter_jobs = {}
+        self.filter_errors = []
+        self.filter_job_count = 0
 
     def _initiate_filter_processing(self, filter_stack):
-        selected_clip = None
-        active_track = self.timeline_container.get_active_track()
-        if active_track and active_track.selected_index != -1:
-            if 0 <= active_track.selected_index < len(active_track.clips):
-                selected_clip = active_track.clips[active_track.selected_index]
-
-        if not selected_clip:
+        targets = self.timeline_container.get_selected_clips()
+        if not targets:
             QMessageBox.warning(self, "No Clip Selected", "Please select a clip on the timeline first.")
             return
 
-        original_path = selected_clip.get('original_file')
-        if not original_path:
-            original_path = selected_clip.get('original_path')
-        if not original_path:
-            original_path = selected_clip['path']
-
         comp_video = filter_stack.get('Composition', {}).get('Video', {})
         overlay_data = comp_video.get('Overlay', {})
         blend_data = comp_video.get('Blend videos', {})
@@ -159,67 +173,143 @@ class VideoEditorUI(QWidget):
             target_secondary_path = blend_data.get('blend_path')
 
         if target_secondary_path and os.path.exists(target_secondary_path):
-            main_w, main_h = self.filter_bridge.get_video_dimensions(original_path)
-            sec_w, sec_h = self.filter_bridge.get_video_dimensions(target_secondary_path)
-
-            if main_w != sec_w or main_h != sec_h:
-                QMessageBox.warning(
-                    self, 
-                    "Resolution Mismatch", 
-                    f"Filrele de Compozitie (Overlay/Blend) necesita ca ambele video-uri sa aiba aceeasi rezolutie!\n\n"
-                    f"Clip Principal: {main_w}x{main_h}\n"
-                    f"Clip Secundar: {sec_w}x{sec_h}\n\n"
-                    "Te rog sa redimensionezi clipurile inainte de a aplica acest efect."
-                )
-                return 
+            sources = list(dict.fromkeys(self._filter_source(clip) for _, clip in targets))
+            JobScheduler.shared().submit(
+                lambda job: ([(p, self.filter_bridge.get_video_dimensions(p)) for p in sources],
+                             self.filter_bridge.get_video_dimensions(target_secondary_path)),
+                priority=JobScheduler.PRIORITY_INTERACTIVE,
+                on_done=lambda dims: self._start_filter_processing(targets, filter_stack, dims))
+        else:
+            self._start_filter_processing(targets, filter_stack)
+
+    def _filter_source(self, clip):
+        original_path = clip.get('original_file')
+        if not original_path:
+            original_path = clip.get('original_path')
+        if not original_path:
+            original_path = clip['path']
+        return original_path
+
+    def _start_filter_processing(self, targets, filter_stack, dims=None):
+        if dims is not None:
+            main_dims, (sec_w, sec_h) = dims
+            for path, (main_w, main_h) in main_dims:
+                if main_w != sec_w or main_h != sec_h:
+                    QMessageBox.warning(
+                        self, 
+                        "Resolution Mismatch", 
+                        f"Filrele de Compozitie (Overlay/Blend) necesita ca ambele video-uri sa aiba aceeasi rezolutie!\n\n"
+                        f"Clip Principal: {main_w}x{main_h} ({os.path.basename(path)})\n"
+                        f"Clip Secundar: {sec_w}x{sec_h}\n\n"
+                        "Te rog sa redimensionezi clipurile inainte de a aplica acest efect."
+                    )
+                    return 
 
-        self.filter_loading_dialog = QProgressDialog("Applying filters... Please wait.", None, 0, 0, self)
+        # clipurile cu aceeasi sursa se randeaza o singura data
+        by_source = {}
+        for track, clip in targets:
+            by_source.setdefault(self._filter_source(clip), []).append((track, clip))
+
+        self._close_filter_dialog()
+        if not self.filter_jobs:
+            self.filter_errors = []
+        jobs = []
+        for path, clips in by_source.items():
+            # un Apply nou pe acelasi clip anuleaza jobul vechi, inclusiv ffmpeg-ul pornit de el;
+            # joburile pornite pe alte clipuri continua si raman in dialog
+            for token in [t for t, (p, _) in self.filter_jobs.items() if p == path]:
+                del self.filter_jobs[token]
+            token = self.filter_bridge.begin_job(path)
+            self.filter_jobs[token] = (path, clips)
+            jobs.append((path, filter_stack, token))
+        self.filter_job_count = len(self.filter_jobs)
+
+        count = self.filter_job_count
+        if count == 1:
+            label = "Applying filters... Please wait."
+        else:
+            label = f"Applying filters to {count} clips... 0/{count}"
+        self.filter_loading_dialog = QProgressDialog(label, "Cancel", 0, 0 if count == 1 else count, self)
         self.filter_loading_dialog.setWindowTitle("Processing Video")
         self.filter_loading_dialog.setWindowModality(Qt.WindowModal)
-        self.filter_loading_dialog.setCancelButton(None)
+        self.filter_loading_dialog.canceled.connect(self._cancel_filter_jobs)
         self.filter_loading_dialog.show()
 
-        path_to_process = original_path if original_path else selected_clip['path']
-        self.request_filter_processing.emit(path_to_process, filter_stack)
+        if len(jobs) == 1:
+            self.request_filter_processing.emit(*jobs[0])
+        else:
+            self.filter_bridge.process_batch(jobs)
 
-    def _on_filter_finished(self, new_path, filter_stack):
-        if self.filter_loading_dialog:
-            self.filter_loading_dialog.close()
-            self.filter_loading_dialog = None
-        active_track = self.timeline_container.get_active_track()
-        if active_track and active_track.selected_index != -1:
-             clip = active_track.clips[active_track.selected_index]
-             if 'original_file' not in clip:
-                 clip['original_file'] = clip.get('original_path', clip['path'])
-             new_duration = self.timeline_container._get_file_duration(new_path)
-             active_track.update_clip_path_and_filters(active_track.selected_index, new_path, new_duration, filter_stack)
-             current_pos = self.timeline_container.time_slider.value()
-             self._synchronize_preview_with_timeline(current_pos)
-             
-             print(f"Filter applied. New path: {new_path}")
+    def _cancel_filter_jobs(self):
+        for token in list(self.filter_jobs):
+            token.cancel()
 
-    def _on_filter_error(self, error_msg):
+    def _close_filter_dialog(self):
         if self.filter_loading_dialog:
+            # close() emite canceled; deconectam ca sa nu anulam un job deja terminat
+            self.filter_loading_dialog.canceled.disconnect()
             self.filter_loading_dialog.close()
             self.filter_loading_dialog = None
-        QMessageBox.critical(self, "Processing Error", f"An error occurred:\n{error_msg}")
 
-    def _force_reset_audio_mixer(self):
-        for key, player in list(self.active_audio_players.items()):
-            try:
-                if player.playbackState() != QMediaPlayer.StoppedState:
-                    player.stop()
-                if player.audioOutput():
-                    player.audioOutput().setVolume(0)
-                player.setSource(QUrl()) 
-                if hasattr(player, 'audio_ref'):
-                    player.audio_ref.deleteLater()
-                player.deleteLater()
-            except: 
-                pass
-        self.active_audio_players.clear()
+    def _filter_job_done(self):
+        remaining = len(self.filter_jobs)
+        if remaining == 0:
+            self._close_filter_dialog()
+            if self.filter_errors:
+                QMessageBox.critical(self, "Processing Error", "An error occurred:\n" + "\n".join(self.filter_errors))
+                self.filter_errors = []
+        elif self.filter_loading_dialog and self.filter_job_count > 1:
+            done = self.filter_job_count - remaining
+            self.filter_loading_dialog.setValue(done)
+            self.filter_loading_dialog.setLabelText(f"Applying filters to {self.filter_job_count} clips... {done}/{self.filter_job_count}")
+
+    def _on_filter_finished(self, new_path, filter_stack, token):
+        job = self.filter_jobs.pop(token, None)
+        if job is None:
+            return
+        _, clips = job
+        self._filter_job_done()
+        for _, clip in clips:
+            if 'original_file' not in clip:
+                clip['original_file'] = clip.get('original_path', clip['path'])
+        JobScheduler.shared().submit(
+            lambda job: self.timeline_container._get_file_duration(new_path),
+            priority=JobScheduler.PRIORITY_INTERACTIVE,
+            on_done=lambda new_duration: self._apply_filtered_clips(clips, new_path, new_duration, filter_stack))
+
+    def _apply_filtered_clips(self, clips, new_path, new_duration, filter_stack):
+        for track, clip in clips:
+            # indicii se pot schimba cat timp ruleaza lotul, clipul se cauta dupa identitate
+            idx = next((i for i, c in enumerate(track.clips) if c is clip), -1)
+            if idx == -1:
+                continue
+            track.update_clip_path_and_filters(idx, new_path, new_duration, filter_stack)
+            self.timeline_container.attach_proxy(clip)
+        current_pos = self.timeline_container.time_slider.value()
+        self._synchronize_preview_with_timeline(current_pos)
+        
+        print(f"Filter applied. New path: {new_path}")
+
+    def _on_filter_progress(self, progress):
+        if self.filter_loading_dialog and self.filter_job_count == 1:
+            self.filter_loading_dialog.setMaximum(100)
+            self.filter_loading_dialog.setValue(min(99, int(progress['fraction'] * 100)))
+            self.filter_loading_dialog.setLabelText(f"Applying filters... {format_progress(progress)}")
+
+    def _on_filter_cancelled(self, path, token):
+        if self.filter_jobs.pop(token, None) is not None:
+            self._filter_job_done()
+
+    def _on_filter_error(self, error_msg, token):
+        if self.filter_jobs.pop(token, None) is None:
+            return
+        self.filter_errors.append(error_msg)
+        self._filter_job_done()
 
     def _on_timeline_structure_changed(self):
+        # playerele clipurilor sterse sau mutate pe alta sursa se elibereaza imediat
+        live_keys = {id(c) for track in self.timeline_container.track_widgets for c in track.clips}
+        self.audio_pool.release_missing(live_keys)
         self._refresh_slider()
         current_pos = self.timeline_container.time_slider.value()
         self._synchronize_preview_with_timeline(current_pos)
@@ -233,8 +323,36 @@ class VideoEditorUI(QWidget):
         self.timeline_container.set_global_playhead(val)
         self.auto_scroll_active = False 
         self.pending_scrub_ms = val
+        # cat timp slider-ul e tinut apasat, cadrele vin din cache; playerul se sincronizeaza la release
+        if self._show_scrub_frame(val) and self.timeline_container.time_slider.isSliderDown():
+            return
         self.lazy_scrub_timer.start()
 
+    def _show_scrub_frame(self, global_ms):
+        current_widget = self.video_preview.preview_tabs.widget(0)
+        clip = self._get_preview_clip_at(global_ms)
+        if not isinstance(current_widget, VideoTabContent) or clip is None:
+            return False
+        path = self._preview_path(clip)
+        if os.path.splitext(path)[1].lower() not in VideoTabContent.SUPPORTED_VIDEO_EXT:
+            return False
+
+        direction = 1 if global_ms >= self._last_scrub_ms else -1
+        self._last_scrub_ms = global_ms
+        self._scrub_target = (path, self._clip_local_ms(clip, global_ms))
+        image = self.scrub_engine.request(*self._scrub_target, direction)
+        if image is not None:
+            current_widget.show_scrub_frame(image)
+        return True
+
+    def _on_scrub_chunk_ready(self, path):
+        if self._scrub_target is None or self._scrub_target[0] != path:
+            return
+        image = self.scrub_engine.frame_at(*self._scrub_target)
+        current_widget = self.video_preview.preview_tabs.widget(0)
+        if image is not None and isinstance(current_widget, VideoTabContent):
+            current_widget.show_scrub_frame(image)
+
     def _handle_timeline_action(self, action, value):
         slider = self.timeline_container.time_slider
         
@@ -361,6 +479,7 @@ class VideoEditorUI(QWidget):
 
     def closeEvent(self, event):
         if hasattr(self, 'filter_thread') and self.filter_thread.isRunning():
+            self.filter_bridge.shutdown()
             self.filter_thread.quit()
             self.filter_thread.wait()
 
@@ -368,8 +487,16 @@ class VideoEditorUI(QWidget):
             self.export_worker.cancel()
             self.export_worker.wait()
 
-        self._force_reset_audio_mixer()
+        self.media_tabs.thumbnail_worker.shutdown()
+        WaveformWorker.shared().shutdown()
+        FilmstripWorker.shared().shutdown()
+        ProxyWorker.shared().shutdown()
+        self.scrub_engine.shutdown()
+        self.audio_engine.shutdown()
+        JobScheduler.shared().shutdown()
+        self.audio_pool.clear()
         
+        self.video_preview.discard_preloaded_tab()
         count = self.video_preview.preview_tabs.count()
         for i in range(count):
             widget = self.video_preview.preview_tabs.widget(i)
@@ -414,12 +541,8 @@ class VideoEditorUI(QWidget):
         self.auto_scroll_active = False
 
     def _on_place_clicked(self):
-        current_list_widget = self.media_tabs.media_tabs.currentWidget()
-        if not isinstance(current_list_widget, QListWidget): return
-        selected_items = current_list_widget.selectedItems()
-        if not selected_items: return
-        
-        insert_file_path = selected_items[0].data(Qt.UserRole)
+        insert_file_path = self.media_tabs.selected_path()
+        if not insert_file_path: return
         
         result_pos = self.timeline_container.insert_media_at_playhead(insert_file_path)
         
@@ -451,12 +574,7 @@ class VideoEditorUI(QWidget):
             if self.global_playing_state and self.global_playback_speed > 0:
                 slider = self.timeline_container.time_slider
                 current_pos = slider.value()
-                active_clip = None
-                for track in self.timeline_container.track_widgets:
-                    clip = track.get_clip_at_ms(current_pos)
-                    if clip and not clip.get('is_auto_gap', False):
-                        active_clip = clip
-                        break
+                active_clip = self._get_preview_clip_at(current_pos)
                 if active_clip:
                     clip_end_time = int(active_clip['start'] + active_clip['duration'])
                     if abs(current_pos - clip_end_time) < 300:
@@ -500,7 +618,8 @@ class VideoEditorUI(QWidget):
             self._refresh_slider()
         else:
             slider.setEnabled(False)
-            for p in self.active_audio_players.values(): p.stop()
+            self.audio_engine.pause()
+            self.audio_pool.set_active(())
 
     def _on_playback_state_changed(self, state):
         if self.is_scrubbing: return
@@ -515,8 +634,10 @@ class VideoEditorUI(QWidget):
             self.auto_scroll_active = True
         
         should_play_audio = self.global_playing_state and (self.global_playback_speed > 0)
+        if not should_play_audio:
+            self.audio_engine.pause()
         
-        for player in self.active_audio_players.values():
+        for player in self.audio_pool.active_players():
             if should_play_audio:
                 player.play()
             else:
@@ -544,12 +665,7 @@ class VideoEditorUI(QWidget):
                    self.timeline_container.set_global_playhead(max_slider_val)
                    return
 
-        target_clip = None
-        for track in self.timeline_container.track_widgets:
-            clip = track.get_clip_at_ms(approx_global_pos)
-            if clip and not clip.get('is_auto_gap', False):
-                target_clip = clip
-                break
+        target_clip = self._get_preview_clip_at(approx_global_pos)
         
         if isinstance(current_widget.player, ImagePlayer) and self.global_playing_state:
             dur = current_widget.player.duration()
@@ -566,10 +682,21 @@ class VideoEditorUI(QWidget):
                 self._synchronize_preview_with_timeline(jump_to)
                 return
 
-        if target_clip and os.path.abspath(target_clip['path']) == os.path.abspath(current_widget.file_path):
-            expected_local_time = approx_global_pos - target_clip['start']
+        if target_clip and os.path.abspath(self._preview_path(target_clip)) == os.path.abspath(current_widget.file_path):
+            source_in = target_clip.get('source_in', 0)
+            expected_local_time = approx_global_pos - target_clip['start'] + source_in
             if abs(ms - expected_local_time) < 1000:
-                global_pos = int(target_clip['start'] + ms)
+                global_pos = int(target_clip['start'] + ms - source_in)
+                clip_end_time = int(target_clip['start'] + target_clip['duration'])
+                if global_pos >= clip_end_time and self.global_playing_state and self.global_playback_speed > 0:
+                    # fisierul continua dupa punctul de out al clipului, deci sarim singuri la urmatorul
+                    next_pos = clip_end_time + 5
+                    slider.blockSignals(True)
+                    slider.setValue(next_pos)
+                    slider.blockSignals(False)
+                    self.timeline_container.set_global_playhead(next_pos)
+                    self._synchronize_preview_with_timeline(next_pos)
+                    return
                 slider.blockSignals(True)
                 slider.setValue(global_pos)
                 slider.blockSignals(False)
@@ -587,12 +714,7 @@ class VideoEditorUI(QWidget):
             slider.blockSignals(False)
             self.timeline_container.set_global_playhead(next_val)
             
-            upcoming_clip = None
-            for track in self.timeline_container.track_widgets:
-                c = track.get_clip_at_ms(next_val)
-                if c and not c.get('is_auto_gap', False):
-                    upcoming_clip = c
-                    break
+            upcoming_clip = self._get_preview_clip_at(next_val)
             
             if upcoming_clip:
                 self._synchronize_preview_with_timeline(next_val)
@@ -613,6 +735,7 @@ class VideoEditorUI(QWidget):
             self.timeline_container.ensure_cursor_visible(cursor_x)
         self.global_playing_state = False
         self.pending_scrub_ms = ms
+        self._show_scrub_frame(ms)
         self.lazy_scrub_timer.start()
 
     def _execute_deferred_seek(self):
@@ -629,97 +752,131 @@ class VideoEditorUI(QWidget):
         visual_clip = None
         
         if hasattr(self.timeline_container, 'track_widgets'):
+            visual_clip = self._get_preview_clip_at(global_ms)
             for track in self.timeline_container.track_widgets:
                 clip = track.get_clip_at_ms(global_ms)
                 if clip and not clip.get('is_auto_gap', False):
-                    if visual_clip is None:
-                        visual_clip = clip
                     clips_to_play.append(clip)
 
-        needed_ids = set()
+        needed = []
         for clip in clips_to_play:
             _, ext = os.path.splitext(clip['path'])
             if ext.lower() in self.IMG_EXT: continue
             
             if visual_clip and clip == visual_clip: continue
-            
-            clip_id = f"{clip['path']}_{clip['start']}"
-            needed_ids.add(clip_id)
-            
-            if clip_id not in self.active_audio_players:
-                player = QMediaPlayer(self)
-                audio = QAudioOutput(self)
-                player.setAudioOutput(audio)
-                
-                vol = 0.0 if mute else 0.7
-                audio.setVolume(vol)
-                
-                player.setSource(QUrl.fromLocalFile(clip['path']))
-                self.active_audio_players[clip_id] = player
-                
-                target_local_pos = int(max(0, global_ms - clip['start']))
-                player.waiting_pos = target_local_pos
-                player.mediaStatusChanged.connect(lambda s, p=player: self._on_player_loaded(s, p))
-            else:
-                player = self.active_audio_players[clip_id]
-                if player.audioOutput():
-                    vol = 0.0 if mute else 0.7
-                    player.audioOutput().setVolume(vol)
+            needed.append(clip)
+
+        needed_ids = {id(clip) for clip in needed}
+        upcoming = self._upcoming_audio_clips(global_ms, needed_ids) if was_playing else []
+
+        if self.audio_engine.available:
+            self.audio_engine.set_sources([{
+                'path': self._preview_path(clip),
+                'start_ms': clip['start'],
+                'end_ms': clip['start'] + clip['duration'],
+                'in_ms': clip.get('source_in', 0),
+                'gain': self.AUDIO_VOLUME
+            } for clip in needed + upcoming])
+            self.audio_engine.sync(global_ms, playing=was_playing and not mute and bool(needed or upcoming),
+                                   speed=self.global_playback_speed)
+            if self.audio_engine.available:
+                return
 
-                target_local_pos = int(max(0, global_ms - clip['start']))
+        vol = 0.0 if mute else self.AUDIO_VOLUME
+        rate = max(self.global_playback_speed, 0.0) or 1.0
+        for clip in needed:
+            target_local_pos = self._clip_local_ms(clip, global_ms)
+            player = self.audio_pool.acquire(id(clip), self._preview_path(clip), target_local_pos, protected=needed_ids)
+            player.pool_active = True
+            player.audioOutput().setVolume(vol)
+            # playerele merg cu viteza timeline-ului, altfel deriva si se repozitioneaza continuu
+            if player.playbackRate() != rate:
+                player.setPlaybackRate(rate)
+
+            if player.mediaStatus() in [QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia, QMediaPlayer.EndOfMedia]:
+                if abs(player.position() - target_local_pos) > 150:
+                    player.setPosition(target_local_pos)
                 
-                if player.mediaStatus() in [QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia, QMediaPlayer.EndOfMedia]:
-                    if abs(player.position() - target_local_pos) > 150:
-                        player.setPosition(target_local_pos)
-                    
-                    if was_playing and player.playbackState() != QMediaPlayer.PlayingState:
-                        player.play()
-                    elif not was_playing and player.playbackState() == QMediaPlayer.PlayingState:
-                        player.pause()
-
-        for clip_id, player in self.active_audio_players.items():
-            if clip_id not in needed_ids:
-                if player.playbackState() != QMediaPlayer.StoppedState:
-                    player.stop() 
-
-    def _on_player_loaded(self, status, player):
-        if status == QMediaPlayer.LoadedMedia or status == QMediaPlayer.BufferedMedia:
-            if hasattr(player, "waiting_pos"):
-                pos = player.waiting_pos
-                player.setPosition(pos)
-                del player.waiting_pos
-
-                if not self.is_scrubbing and self._connected_timeline_player and self._connected_timeline_player.playbackState() == QMediaPlayer.PlayingState:
+                if was_playing and player.playbackState() != QMediaPlayer.PlayingState:
                     player.play()
+                elif not was_playing and player.playbackState() == QMediaPlayer.PlayingState:
+                    player.pause()
+
+        prewarm_ids = {id(clip) for clip in upcoming}
+        for clip in upcoming:
+            self.audio_pool.prewarm(id(clip), self._preview_path(clip), self._clip_local_ms(clip, clip['start']),
+                                    protected=needed_ids | prewarm_ids)
+        self.audio_pool.set_active(needed_ids)
+
+    def _upcoming_audio_clips(self, global_ms, needed_ids):
+        # clipurile care incep in urmatoarele AUDIO_PREWARM_MS se pregatesc dinainte,
+        # ca trecerea sa nu astepte incarcarea sursei
+        upcoming = []
+        ahead_ms = global_ms + self.AUDIO_PREWARM_MS
+        visual_clip = self._get_preview_clip_at(ahead_ms)
+        for track in self.timeline_container.track_widgets:
+            clip = track.get_clip_at_ms(ahead_ms)
+            if not clip or clip.get('is_auto_gap', False) or clip['start'] <= global_ms:
+                continue
+            if id(clip) in needed_ids or clip == visual_clip:
+                continue
+            if os.path.splitext(clip['path'])[1].lower() in self.IMG_EXT:
+                continue
+            upcoming.append(clip)
+        return upcoming
+
+    def _preview_path(self, clip):
+        proxy = clip.get('proxy_path')
+        if proxy and os.path.exists(proxy):
+            return proxy
+        return clip['path']
+
+    def _clip_local_ms(self, clip, global_ms):
+        return int(max(0, global_ms - clip['start'])) + int(clip.get('source_in', 0))
+
+    def _is_audio_clip(self, clip):
+        if clip.get('is_audio_proxy', False):
+            return True
+        return os.path.splitext(clip['path'])[1].lower() in self.AUD_EXT
+
+    def _get_preview_clip_at(self, global_ms):
+        audio_clip = None
+        for track in self.timeline_container.track_widgets:
+            clip = track.get_clip_at_ms(global_ms)
+            if clip and not clip.get('is_auto_gap', False):
+                if not self._is_audio_clip(clip):
+                    return clip
+                if audio_clip is None:
+                    audio_clip = clip
+        return audio_clip
+
+    def _on_player_loaded(self, player):
+        if not player.pool_active:
+            return
+        if not self.is_scrubbing and self._connected_timeline_player and self._connected_timeline_player.playbackState() == QMediaPlayer.PlayingState:
+            player.play()
 
     def _synchronize_preview_with_timeline(self, global_ms):
         global_ms = int(global_ms)
         
         visual_clip = None
         if hasattr(self.timeline_container, 'track_widgets'):
-            for track in self.timeline_container.track_widgets:
-                clip = track.get_clip_at_ms(global_ms)
-                if clip and not clip.get('is_auto_gap', False):
-                    visual_clip = clip
-                    break
+            visual_clip = self._get_preview_clip_at(global_ms)
         
         current_widget = self.video_preview.preview_tabs.widget(0)
 
         final_path = ""
-        final_start = 0
         final_dur = 5000
         
         if visual_clip:
-            final_path = visual_clip['path']
-            final_start = int(visual_clip['start'])
+            final_path = self._preview_path(visual_clip)
             final_dur = int(visual_clip['duration'])
+            local_pos = self._clip_local_ms(visual_clip, global_ms)
         else:
             base_dir = os.path.dirname(os.path.abspath(__file__))
             final_path = os.path.join(base_dir, "icons", "blackCat.jpg")
-            final_start = global_ms
             final_dur = 5000
-
-        local_pos = int(max(0, global_ms - final_start))
+            local_pos = 0
         
         need_reload = True
         if isinstance(current_widget, VideoTabContent):
@@ -736,7 +893,7 @@ class VideoEditorUI(QWidget):
             self._sync_timeline_connection(0)
             new_tab.set_explicit_duration(final_dur)
             
-            if new_tab.player:
+            if new_tab.player and abs(new_tab.player.position() - local_pos) > 40:
                 new_tab.player.setProperty("pending_seek_ms", local_pos)
                 new_tab.player.setPosition(local_pos)
 
@@ -746,8 +903,39 @@ class VideoEditorUI(QWidget):
                 
                 if is_reversing or abs(self._connected_timeline_player.position() - local_pos) > 60:
                      self._connected_timeline_player.setPosition(local_pos)
+            current_widget.hide_scrub_frame()
 
+        self._scrub_target = None
         self._apply_global_state_to_preview()
+        self._preload_next_clip(global_ms)
+
+    def _next_preview_clip(self, global_ms):
+        # granitele care nu schimba clipul din preview (audio, goluri) sunt sarite
+        current = self._get_preview_clip_at(global_ms)
+        ms = global_ms
+        for _ in range(32):
+            boundaries = [b for b in (t.next_boundary_after(ms) for t in self.timeline_container.track_widgets) if b is not None]
+            if not boundaries:
+                break
+            ms = min(boundaries)
+            clip = self._get_preview_clip_at(ms)
+            if clip is not None and clip is not current:
+                return ms, clip
+        return None, None
+
+    def _preload_next_clip(self, global_ms):
+        # cat ruleaza clipul curent, urmatorul e deschis intr-un player separat si asteapta la punctul de intrare
+        boundary, next_clip = self._next_preview_clip(global_ms)
+        if next_clip is None:
+            self.video_preview.discard_preloaded_tab()
+            return
+        path = self._preview_path(next_clip)
+        if os.path.splitext(path)[1].lower() not in VideoTabContent.SUPPORTED_VIDEO_EXT:
+            return
+        current_widget = self.video_preview.preview_tabs.widget(0)
+        if isinstance(current_widget, VideoTabContent) and current_widget.file_path == os.path.abspath(path):
+            return
+        self.video_preview.preload_timeline_tab(path, self._clip_local_ms(next_clip, boundary))
 
     def _force_update_position(self, pos):
         self.timeline_container.time_slider.blockSignals(True)
@@ -784,18 +972,22 @@ class VideoEditorUI(QWidget):
         if not output_path.lower().endswith(".mp4"):
             output_path += ".mp4"
 
+        # single pass: un singur ffmpeg pentru tot timeline-ul, fara fisiere intermediare
+        modes = ["Segments in parallel", "Single pass (one ffmpeg filtergraph)"]
+        mode, ok = QInputDialog.getItem(self, "Export Mode", "Render the timeline as:", modes, 0, False)
+        if not ok:
+            return
+
         base_dir = os.path.dirname(os.path.abspath(__file__))
         temp_render_dir = os.path.join(base_dir, "temp_render")
         os.makedirs(temp_render_dir, exist_ok=True)
         
-        total_items = 0
-        for t in all_tracks: total_items += len(t.clips)
-
-        self.progress_dialog = QProgressDialog("Rendering Project...", "Cancel", 0, total_items + 5, self)
+        self.progress_dialog = QProgressDialog("Rendering Project...", "Cancel", 0, ExportWorker.PROGRESS_SCALE, self)
         self.progress_dialog.setWindowModality(Qt.WindowModal)
         self.progress_dialog.setMinimumDuration(0)
         
-        self.export_worker = ExportWorker(all_tracks, output_path, temp_render_dir, self.IMG_EXT)
+        self.export_worker = ExportWorker(all_tracks, output_path, temp_render_dir, self.IMG_EXT,
+                                          single_pass=(mode == modes[1]))
         
         self.export_worker.progress_update.connect(self._on_export_progress)
         self.export_worker.finished_success.connect(self._on_export_success)
@@ -28,6 +28,7 @@ class VideoPreview(QWidget):
         self.preview_tabs.setTabsClosable(True) 
 
         self._current_connected_tab = None
+        self.preloaded_timeline_tab = None
         
         base_dir = os.path.dirname(os.path.abspath(__file__))
         timeline_image_path = os.path.join(base_dir, "icons", "black.jpg")
@@ -156,13 +157,37 @@ class VideoPreview(QWidget):
             widget.cleanup()
         self.preview_tabs.removeTab(index)
 
+    def preload_timeline_tab(self, file_path, position_ms):
+        preloaded = self.preloaded_timeline_tab
+        if preloaded is None or preloaded.file_path != os.path.abspath(file_path):
+            self.discard_preloaded_tab()
+            preloaded = VideoTabContent(file_path, is_timeline=True, autoplay=False)
+            self.preloaded_timeline_tab = preloaded
+        preloaded.prepare_at(position_ms)
+        return preloaded
+
+    def discard_preloaded_tab(self):
+        if self.preloaded_timeline_tab is not None:
+            self.preloaded_timeline_tab.cleanup()
+            self.preloaded_timeline_tab.deleteLater()
+            self.preloaded_timeline_tab = None
+
     def load_into_timeline_tab(self, file_path):
         old_widget = self.preview_tabs.widget(0)
         if isinstance(old_widget, VideoTabContent):
             old_widget.cleanup()
         
         self.preview_tabs.removeTab(0)
-        new_content = VideoTabContent(file_path, is_timeline=True)
+        if old_widget is not None:
+            old_widget.deleteLater()
+
+        # daca urmatorul clip e deja deschis si pozitionat, doar il schimbam in tab
+        preloaded = self.preloaded_timeline_tab
+        if preloaded is not None and preloaded.file_path == os.path.abspath(file_path):
+            self.preloaded_timeline_tab = None
+            new_content = preloaded
+        else:
+            new_content = VideoTabContent(file_path, is_timeline=True)
         self.preview_tabs.insertTab(0, new_content, "Timeline")
         self.preview_tabs.tabBar().setTabButton(0, QTabBar.ButtonPosition.RightSide, None)
         self.main_timeline_tab = new_content 
@@ -10,16 +10,17 @@ from PySide6.QtMultimediaWidgets import QVideoWidget
 from PySide6.QtGui import QPixmap, QResizeEvent, QShowEvent
 
 from ImagePlayer import ImagePlayer
+from base.media_types import AUDIO_EXT
 
 class VideoTabContent(QWidget):
     player_state_changed = Signal(QMediaPlayer.PlaybackState)
     
     SUPPORTED_IMAGE_EXT = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
     SUPPORTED_VIDEO_EXT = {'.mp4', '.mov', '.avi', '.mkv'}
-    SUPPORTED_AUDIO_EXT = {'.mp3', '.wav', '.flac'}
+    SUPPORTED_AUDIO_EXT = AUDIO_EXT
 
 
-    def __init__(self, file_path, is_timeline=False):
+    def __init__(self, file_path, is_timeline=False, autoplay=True):
         super().__init__()
         self.setAttribute(Qt.WA_StyledBackground, True)
         self.setStyleSheet("background-color: black;") 
@@ -32,12 +33,16 @@ class VideoTabContent(QWidget):
         self.file_path = os.path.abspath(file_path)
         self.ext = os.path.splitext(file_path)[1].lower()
         self.is_timeline = is_timeline  
+        self.autoplay = autoplay
+        self._preload_pos = None
         
         self.player = None 
         self.audio_output = None
         self.video_widget = None
         self.visual_label = None
         self.display_pixmap = None 
+        self.scrub_label = None
+        self.scrub_image = None
 
         self._logical_rate = 1.0
         self.reverse_timer = QTimer(self)
@@ -56,6 +61,8 @@ class VideoTabContent(QWidget):
     def resizeEvent(self, event: QResizeEvent):
         if self.visual_label and self.display_pixmap:
             self._update_image_scaling()
+        if self.scrub_label and self.scrub_label.isVisible():
+            self._update_scrub_scaling()
         super().resizeEvent(event)
 
     def showEvent(self, event: QShowEvent):
@@ -75,6 +82,35 @@ class VideoTabContent(QWidget):
         )
         self.visual_label.setPixmap(scaled_pix)
 
+    def show_scrub_frame(self, image):
+        # cadrul de scrub inlocuieste temporar video-ul; playerul ramane incarcat
+        if self.scrub_label is None:
+            self.scrub_label = QLabel()
+            self.scrub_label.setAlignment(Qt.AlignCenter)
+            self.scrub_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+            self.layout.addWidget(self.scrub_label)
+        for widget in (self.video_widget, self.visual_label):
+            if widget is not None:
+                widget.hide()
+        self.scrub_image = image
+        self.scrub_label.show()
+        self._update_scrub_scaling()
+
+    def hide_scrub_frame(self):
+        if self.scrub_label is None or not self.scrub_label.isVisible():
+            return
+        self.scrub_label.hide()
+        self.scrub_image = None
+        for widget in (self.video_widget, self.visual_label):
+            if widget is not None:
+                widget.show()
+
+    def _update_scrub_scaling(self):
+        if self.scrub_image is None or self.width() <= 0 or self.height() <= 0:
+            return
+        pix = QPixmap.fromImage(self.scrub_image).scaled(self.width(), self.height(), Qt.KeepAspectRatio, Qt.FastTransformation)
+        self.scrub_label.setPixmap(pix)
+
     def _create_optimized_cache(self, input_path):
         base_dir = os.path.dirname(os.path.abspath(__file__))
         cache_dir = os.path.join(base_dir, "filesFromTracks")
@@ -148,7 +184,8 @@ class VideoTabContent(QWidget):
         self.player.setVideoOutput(self.video_widget)
         self.player.setSource(QUrl.fromLocalFile(self.file_path))
         self.audio_output.setVolume(0.7)
-        self.player.play()
+        if self.autoplay:
+            self.player.play()
         self.player.playbackStateChanged.connect(self.player_state_changed)
         self.player.mediaStatusChanged.connect(self._on_media_status_changed)
         self.player.positionChanged.connect(self._check_position_for_end)
@@ -334,7 +371,22 @@ class VideoTabContent(QWidget):
         if pos >= duration and self.player.playbackState() == QMediaPlayer.PlayingState:
             self._on_media_status_changed(QMediaPlayer.EndOfMedia)
 
+    def prepare_at(self, position_ms):
+        # playerul preincarcat asteapta oprit la punctul de intrare al clipului
+        if not isinstance(self.player, QMediaPlayer):
+            return
+        if self.player.mediaStatus() in (QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia):
+            if abs(self.player.position() - position_ms) > 40:
+                self.player.setPosition(int(position_ms))
+            self._preload_pos = None
+        else:
+            self._preload_pos = int(position_ms)
+
     def _on_media_status_changed(self, status):
+        if self._preload_pos is not None and status in (QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia):
+            self.player.setPosition(self._preload_pos)
+            self._preload_pos = None
+
         if self.is_timeline and status == QMediaPlayer.EndOfMedia:
              return
 
@@ -0,0 +1,195 @@
+import os
+import math
+import hashlib
+import subprocess
+import threading
+from collections import OrderedDict
+from PySide6.QtCore import QObject, Signal
+from JobScheduler import JobScheduler
+try:
+    import numpy as np
+except ImportError as e:
+    np = None
+    print(f"Waveforms disabled, numpy missing: {e}")
+
+class WaveformPeaks:
+    def __init__(self, base_rate, levels):
+        self.base_rate = base_rate
+        self.levels = levels
+
+    def level_for(self, pixels_per_second):
+        if pixels_per_second <= 0:
+            return len(self.levels) - 1
+        level = int(math.floor(math.log2(max(1.0, self.base_rate / pixels_per_second))))
+        return max(0, min(level, len(self.levels) - 1))
+
+    def columns(self, start_sec, pixels_per_second, count):
+        # intoarce (min, max) normalizate in [-1, 1] pentru `count` coloane incepand de la start_sec
+        level = self.level_for(pixels_per_second)
+        peaks = self.levels[level]
+        rate = self.base_rate / (2 ** level)
+
+        edges = np.floor((start_sec + np.arange(count + 1) / pixels_per_second) * rate).astype(np.int64)
+        edges = np.clip(edges, 0, len(peaks))
+        lo, hi = int(edges[0]), int(edges[-1])
+        if lo >= len(peaks):
+            return None
+
+        # reduceat pe felia vizibila: ultima coloana se opreste la marginea ei, nu la finalul fisierului
+        visible = peaks[lo:max(hi, lo + 1)]
+        starts = np.minimum(edges[:-1] - lo, len(visible) - 1)
+        mins = np.minimum.reduceat(visible[:, 0], starts) / 32768.0
+        maxs = np.maximum.reduceat(visible[:, 1], starts) / 32768.0
+        past_end = edges[:-1] >= len(peaks)
+        mins[past_end] = 0
+        maxs[past_end] = 0
+        return mins, maxs
+
+
+class WaveformWorker(QObject):
+    peaks_ready = Signal(str)
+
+    SAMPLE_RATE = 8000
+    SAMPLES_PER_PEAK = 80
+    MAX_LOADED = 32
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir, scheduler=None):
+        super().__init__()
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scheduler = scheduler or JobScheduler.shared()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._failed = set()
+        self._loaded = OrderedDict()
+        self._closed = False
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                base_dir = os.path.dirname(os.path.abspath(__file__))
+                cls._shared = cls(os.path.join(base_dir, "filesFromTracks"))
+            return cls._shared
+
+    def peaks_path(self, path):
+        st = os.stat(path)
+        key = hashlib.md5(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{key}.peaks.npz")
+
+    def peaks_for(self, path):
+        if np is None or path in self._failed:
+            return None
+        with self._lock:
+            peaks = self._loaded.get(path)
+            if peaks is not None:
+                self._loaded.move_to_end(path)
+                return peaks
+
+        try:
+            peaks_file = self.peaks_path(path)
+        except OSError:
+            return None
+        if os.path.exists(peaks_file):
+            try:
+                return self._remember(path, self._load(peaks_file))
+            except Exception as e:
+                print(f"Waveform cache unreadable for {path}: {e}")
+
+        with self._lock:
+            if not self._closed and path not in self._pending:
+                self._pending[path] = self._scheduler.submit(
+                    self._generate, path, peaks_file, priority=JobScheduler.PRIORITY_BACKGROUND)
+        return None
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._pending.values())
+        for job in jobs:
+            job.cancel()
+
+    def _remember(self, path, peaks):
+        with self._lock:
+            self._loaded[path] = peaks
+            self._loaded.move_to_end(path)
+            while len(self._loaded) > self.MAX_LOADED:
+                self._loaded.popitem(last=False)
+        return peaks
+
+    def _load(self, peaks_file):
+        with np.load(peaks_file) as data:
+            base_rate = float(data["base_rate"])
+            levels = [data[f"level{i}"] for i in range(int(data["level_count"]))]
+        return WaveformPeaks(base_rate, levels)
+
+    def _generate(self, job, path, peaks_file):
+        try:
+            base = self._decode_base_level(job, path)
+            if base is None:
+                return
+            levels = [base]
+            while len(levels[-1]) > 1:
+                prev = levels[-1]
+                if len(prev) % 2:
+                    prev = np.vstack([prev, prev[-1:]])
+                pairs = prev.reshape(-1, 2, 2)
+                levels.append(np.stack([pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)], axis=1))
+
+            base_rate = self.SAMPLE_RATE / self.SAMPLES_PER_PEAK
+            tmp_file = peaks_file[:-4] + ".part.npz"
+            arrays = {f"level{i}": level for i, level in enumerate(levels)}
+            np.savez(tmp_file, base_rate=base_rate, level_count=len(levels), **arrays)
+            os.replace(tmp_file, peaks_file)
+
+            self._remember(path, WaveformPeaks(base_rate, levels))
+            self.peaks_ready.emit(path)
+        except Exception as e:
+            if job.cancelled:
+                return
+            print(f"Waveform failed for {path}: {e}")
+            self._failed.add(path)
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+
+    def _decode_base_level(self, job, path):
+        cmd = [
+            'ffmpeg', '-v', 'error', '-i', path, '-vn', '-ac', '1',
+            '-ar', str(self.SAMPLE_RATE), '-f', 's16le', '-'
+        ]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        job.attach_process(proc)
+
+        block_bytes = self.SAMPLES_PER_PEAK * 2
+        chunk_bytes = block_bytes * 4096
+        chunks = []
+        leftover = b""
+        try:
+            while True:
+                if job.cancelled:
+                    proc.kill()
+                    return None
+                data = proc.stdout.read(chunk_bytes)
+                if not data:
+                    break
+                data = leftover + data
+                usable = len(data) - len(data) % block_bytes
+                leftover = data[usable:]
+                if usable:
+                    samples = np.frombuffer(data[:usable], dtype=np.int16).reshape(-1, self.SAMPLES_PER_PEAK)
+                    chunks.append(np.stack([samples.min(axis=1), samples.max(axis=1)], axis=1))
+            if len(leftover) >= 2:
+                samples = np.frombuffer(leftover[:len(leftover) - len(leftover) % 2], dtype=np.int16)
+                chunks.append(np.array([[samples.min(), samples.max()]], dtype=np.int16))
+        finally:
+            proc.stdout.close()
+            proc.wait()
+            job.detach_process(proc)
+
+        if proc.returncode != 0 or not chunks:
+            raise RuntimeError("ffmpeg could not decode audio")
+        return np.concatenate(chunks).astype(np.int16)
@@ -1,3 +1,7 @@
 from base.base_processor import BaseProcessor
+from base.filter_graph import FilterGraph
+from base.media_probe import MediaProbe
+from base.media_types import AUDIO_EXT
+from base.ffmpeg_progress import FFmpegProgress, CancelToken, ProcessingCancelled, format_progress, run_ffmpeg
 
-__all__ = ["BaseProcessor"]
\ No newline at end of file
+__all__ = ["BaseProcessor", "FilterGraph", "MediaProbe", "AUDIO_EXT", "FFmpegProgress", "CancelToken", "ProcessingCancelled", "format_progress", "run_ffmpeg"]
\ No newline at end of file
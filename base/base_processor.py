@@ -1,11 +1,30 @@
 from abc import ABC
-import subprocess
 import tempfile
 import os
 from PySide6.QtCore import QTimeLine
+from base.ffmpeg_progress import run_ffmpeg
+from base.media_probe import MediaProbe
 
 class BaseProcessor(ABC):
+    def _filter_graph(self, qTimeLine: QTimeLine):
+        return qTimeLine.property("filter_graph")
+
+    def _run_ffmpeg(self, qTimeLine: QTimeLine, cmd: list):
+        on_progress = qTimeLine.property("progress_callback")
+        total_sec = 0.0
+        if on_progress is not None:
+            try:
+                total_sec = MediaProbe.shared().probe(qTimeLine.property("input_file"))["duration"]
+            except Exception:
+                total_sec = 0.0
+        return run_ffmpeg(cmd, total_sec, on_progress, cancel_token=qTimeLine.property("cancel_token"))
+
     def _apply_ffmpeg(self, qTimeLine: QTimeLine, filter_str: str, filter_type: str = "video") -> QTimeLine:
+        graph = self._filter_graph(qTimeLine)
+        if graph is not None:
+            graph.add_filter(filter_str, filter_type)
+            return qTimeLine
+
         input_file = qTimeLine.property("input_file")
         original_file = qTimeLine.property("original_file")
 
@@ -39,7 +58,7 @@ class BaseProcessor(ABC):
         else:
             raise ValueError("filter_type must be 'video' or 'audio'")
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = self._run_ffmpeg(qTimeLine, cmd)
 
         if result.returncode != 0:
             if os.path.exists(output_file):
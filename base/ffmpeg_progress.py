@@ -0,0 +1,163 @@
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class ProcessingCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._procs = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            procs = list(self._procs)
+        for proc in procs:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise ProcessingCancelled("Procesare anulata")
+
+    def attach_process(self, proc: subprocess.Popen):
+        with self._lock:
+            self._procs.add(proc)
+        if self.cancelled:
+            proc.kill()
+
+    def detach_process(self, proc: subprocess.Popen):
+        with self._lock:
+            self._procs.discard(proc)
+
+
+class FFmpegProgress:
+    def __init__(self, total_sec: float = 0.0):
+        self.total_sec = max(0.0, float(total_sec or 0.0))
+        self.started = time.monotonic()
+        self.out_time_sec = 0.0
+        self.fps = 0.0
+        self.speed = 0.0
+        self.done = False
+        self._block = {}
+
+    def feed(self, line: str) -> Optional[dict]:
+        # -progress scrie blocuri key=value terminate de progress=continue/end
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        if key != "progress":
+            self._block[key] = value
+            return None
+
+        block, self._block = self._block, {}
+        # out_time_ms este tot in microsecunde, la fel ca out_time_us
+        for time_key in ("out_time_us", "out_time_ms"):
+            try:
+                self.out_time_sec = max(0.0, int(block[time_key]) / 1_000_000.0)
+                break
+            except (KeyError, ValueError):
+                continue
+        try:
+            self.fps = float(block.get("fps", self.fps))
+        except ValueError:
+            pass
+        try:
+            self.speed = float(block.get("speed", "").rstrip("x"))
+        except ValueError:
+            pass
+        self.done = value == "end"
+        return self.snapshot()
+
+    def fraction(self) -> float:
+        if self.done:
+            return 1.0
+        if self.total_sec <= 0:
+            return 0.0
+        return min(1.0, self.out_time_sec / self.total_sec)
+
+    def eta_sec(self) -> Optional[float]:
+        if self.done:
+            return 0.0
+        if self.total_sec <= 0:
+            return None
+        remaining = max(0.0, self.total_sec - self.out_time_sec)
+        if self.speed > 0:
+            return remaining / self.speed
+        fraction = self.fraction()
+        if fraction <= 0:
+            return None
+        return (time.monotonic() - self.started) * (1.0 - fraction) / fraction
+
+    def snapshot(self) -> dict:
+        return {
+            "fraction": self.fraction(),
+            "out_time_sec": self.out_time_sec,
+            "total_sec": self.total_sec,
+            "fps": self.fps,
+            "speed": self.speed,
+            "eta_sec": self.eta_sec(),
+            "done": self.done
+        }
+
+
+def format_progress(progress: dict) -> str:
+    parts = [f"{progress['fraction'] * 100:.0f}%"]
+    if progress.get("fps"):
+        parts.append(f"{progress['fps']:.0f} fps")
+    if progress.get("speed"):
+        parts.append(f"{progress['speed']:.2f}x")
+    eta = progress.get("eta_sec")
+    if eta is not None:
+        eta = int(eta)
+        parts.append(f"ETA {eta // 60}:{eta % 60:02d}")
+    return " | ".join(parts)
+
+
+def with_progress_args(cmd: List[str]) -> List[str]:
+    if "-progress" in cmd:
+        return list(cmd)
+    return [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+
+def run_ffmpeg(cmd: List[str], total_sec: float = 0.0,
+               on_progress: Optional[Callable[[dict], None]] = None,
+               on_process: Optional[Callable[[subprocess.Popen], None]] = None,
+               cancel_token: Optional[CancelToken] = None) -> subprocess.CompletedProcess:
+    cmd = with_progress_args(cmd)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, errors="replace")
+    if on_process is not None:
+        on_process(proc)
+    if cancel_token is not None:
+        cancel_token.attach_process(proc)
+
+    # stderr se citeste separat ca pipe-ul sa nu se umple si sa blocheze ffmpeg
+    stderr_chunks = []
+    stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    stderr_reader.start()
+
+    progress = FFmpegProgress(total_sec)
+    for line in proc.stdout:
+        snapshot = progress.feed(line)
+        if snapshot is not None and on_progress is not None:
+            on_progress(snapshot)
+    proc.stdout.close()
+    returncode = proc.wait()
+    stderr_reader.join()
+    proc.stderr.close()
+    if cancel_token is not None:
+        cancel_token.detach_process(proc)
+
+    return subprocess.CompletedProcess(cmd, returncode, "", "".join(stderr_chunks))
@@ -0,0 +1,141 @@
+import os
+import tempfile
+from typing import Callable, List, Optional, Tuple
+from base.ffmpeg_progress import CancelToken, run_ffmpeg
+from base.media_probe import MediaProbe
+
+
+class FilterGraph:
+    def __init__(self, input_file: str):
+        self.inputs = [input_file]
+        self.input_filters = {}
+        self.video_steps = []
+        self.audio_steps = []
+        self.time_scale = 1.0
+
+    def is_empty(self) -> bool:
+        return not self.video_steps and not self.audio_steps
+
+    def set_input_filter(self, path: str, filter_str: str):
+        self.input_filters[path] = filter_str
+
+    def add_input(self, path: str) -> int:
+        self.inputs.append(path)
+        return len(self.inputs) - 1
+
+    def input_label(self, idx: int, stream: str = "v") -> str:
+        if stream == "v" and self.input_filters.get(self.inputs[idx]):
+            return f"[in{idx}]"
+        return f"[{idx}:{stream}]"
+
+    def add_filter(self, filter_str: str, filter_type: str = "video"):
+        self._steps(filter_type).append(("filter", filter_str))
+
+    def add_node(self, node: str, filter_type: str = "video"):
+        # node foloseste {src} pentru stream-ul curent al lantului principal
+        self._steps(filter_type).append(("node", node))
+
+    def _steps(self, filter_type: str) -> list:
+        if filter_type == "video":
+            return self.video_steps
+        if filter_type == "audio":
+            return self.audio_steps
+        raise ValueError("filter_type must be 'video' or 'audio'")
+
+    def _is_simple(self) -> bool:
+        if len(self.inputs) > 1:
+            return False
+        for kind, _ in self.video_steps + self.audio_steps:
+            if kind != "filter":
+                return False
+        return not (self.video_steps and self.audio_steps)
+
+    def _chain(self, steps: list, stream: str) -> Tuple[List[str], str]:
+        parts = []
+        current = f"[0:{stream}]"
+        pending = []
+
+        for i, (kind, text) in enumerate(steps):
+            if kind == "filter":
+                pending.append(text)
+                continue
+            if pending:
+                label = f"[{stream}c{i}]"
+                parts.append(current + ",".join(pending) + label)
+                current = label
+                pending = []
+            label = f"[{stream}n{i}]"
+            parts.append(text.replace("{src}", current) + label)
+            current = label
+
+        if pending:
+            label = f"[{stream}out]"
+            parts.append(current + ",".join(pending) + label)
+            current = label
+
+        return parts, current
+
+    def build_command(self, output_file: str) -> List[str]:
+        cmd = ["ffmpeg"]
+        for path in self.inputs:
+            cmd.extend(["-i", path])
+
+        if self._is_simple():
+            if self.video_steps:
+                chain = ",".join(text for _, text in self.video_steps)
+                cmd.extend(["-vf", chain, "-c:a", "copy"])
+            else:
+                chain = ",".join(text for _, text in self.audio_steps)
+                cmd.extend(["-af", chain, "-c:v", "copy"])
+            cmd.extend(["-y", output_file])
+            return cmd
+
+        parts = []
+        for idx, path in enumerate(self.inputs[1:], start=1):
+            pre = self.input_filters.get(path)
+            if pre:
+                parts.append(f"[{idx}:v]{pre}[in{idx}]")
+
+        video_parts, video_out = self._chain(self.video_steps, "v")
+        audio_parts, audio_out = self._chain(self.audio_steps, "a")
+        parts.extend(video_parts)
+        parts.extend(audio_parts)
+
+        cmd.extend(["-filter_complex", ";".join(parts)])
+        cmd.extend(["-map", video_out if self.video_steps else "0:v?"])
+        cmd.extend(["-map", audio_out if self.audio_steps else "0:a?"])
+
+        if not self.video_steps:
+            cmd.extend(["-c:v", "copy"])
+        if not self.audio_steps:
+            cmd.extend(["-c:a", "copy"])
+        if len(self.inputs) > 1:
+            cmd.append("-shortest")
+
+        cmd.extend(["-y", output_file])
+        return cmd
+
+    def render(self, output_file: Optional[str] = None, on_progress: Optional[Callable[[dict], None]] = None,
+               cancel_token: Optional[CancelToken] = None) -> str:
+        input_file = self.inputs[0]
+        if not input_file or not os.path.exists(input_file):
+            raise ValueError("Fisier de input inexistent in FilterGraph")
+
+        if output_file is None:
+            output_file = tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(input_file)[1]).name
+
+        total_sec = 0.0
+        if on_progress is not None:
+            try:
+                total_sec = MediaProbe.shared().probe(input_file)["duration"] * self.time_scale
+            except Exception:
+                total_sec = 0.0
+
+        result = run_ffmpeg(self.build_command(output_file), total_sec, on_progress, cancel_token=cancel_token)
+
+        if result.returncode != 0:
+            if os.path.exists(output_file):
+                os.unlink(output_file)
+            raise RuntimeError(f"Eroare FFmpeg: {result.stderr}")
+
+        return output_file
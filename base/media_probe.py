@@ -0,0 +1,224 @@
+import os
+import json
+import atexit
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+
+class MediaProbe:
+    INDEX_NAME = "media_probe.json"
+    SAVE_DELAY_SEC = 2.0
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, self.INDEX_NAME)
+        self._lock = threading.Lock()
+        self.entries = {}
+        self._save_timer = None
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+        atexit.register(self.flush)
+
+    @classmethod
+    def shared(cls) -> "MediaProbe":
+        with cls._shared_lock:
+            if cls._shared is None:
+                project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                cls._shared = cls(os.path.join(project_dir, "filesFromTracks"))
+            return cls._shared
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding='utf-8') as f:
+                entries = json.load(f)
+            # intrarile scrise inainte de campurile de profil/nivel se sondeaza din nou
+            self.entries = {k: v for k, v in entries.items() if "video_extradata" in v}
+            # fisierele sterse sau modificate lasa in urma chei vechi; raman doar cele valide acum
+            for key in list(self.entries):
+                try:
+                    if key != self._key(key.rsplit("|", 2)[0]):
+                        del self.entries[key]
+                except OSError:
+                    del self.entries[key]
+        except Exception as e:
+            print(f"Media probe cache unreadable, starting empty: {e}")
+            self.entries = {}
+
+    def _store(self, key: str, info: dict):
+        # apelat cu _lock luat; o singura intrare per fisier, cele pentru versiuni vechi se scot
+        path = key.rsplit("|", 2)[0]
+        for old in [k for k in self.entries if k != key and k.rsplit("|", 2)[0] == path]:
+            del self.entries[old]
+        self.entries[key] = info
+        self._schedule_save()
+
+    def _schedule_save(self):
+        # mai multe sondari la rand (import de folder, export) se scriu pe disc o singura data
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY_SEC, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            self._save()
+
+    def _save(self):
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"Media probe cache not saved: {e}")
+
+    def _key(self, path: str) -> str:
+        st = os.stat(path)
+        return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+    def probe(self, path: str) -> dict:
+        if not path or not os.path.exists(path):
+            raise ValueError(f"Fisier inexistent: {path}")
+
+        key = self._key(path)
+        with self._lock:
+            info = self.entries.get(key)
+        if info is not None:
+            return info
+
+        cmd = ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-show_data_hash", "CRC32", "-of", "json", path]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Eroare ffprobe: {result.stderr}")
+
+        info = self._normalize(json.loads(result.stdout))
+        with self._lock:
+            self._store(key, info)
+        return info
+
+    def _normalize(self, data: dict) -> dict:
+        streams = data.get("streams", [])
+        video = next((s for s in streams if s.get("codec_type") == "video"), None)
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+        durations = [data.get("format", {}).get("duration")] + [s.get("duration") for s in streams]
+        duration = 0.0
+        for value in durations:
+            try:
+                duration = float(value)
+                break
+            except (TypeError, ValueError):
+                continue
+
+        info = {
+            "duration": duration,
+            "format": data.get("format", {}).get("format_name"),
+            "has_video": video is not None,
+            "has_audio": audio is not None,
+            "width": 0,
+            "height": 0,
+            "fps": 0.0,
+            "video_codec": None,
+            "video_profile": None,
+            "video_level": 0,
+            "video_extradata": None,
+            "constant_fps": False,
+            "pix_fmt": None,
+            "sample_aspect_ratio": None,
+            "audio_codec": None,
+            "sample_rate": 0,
+            "channels": 0,
+            "channel_layout": None,
+            "keyframes": None
+        }
+
+        if video is not None:
+            fps = self._rate(video.get("avg_frame_rate"))
+            info.update({
+                "width": int(video.get("width", 0)),
+                "height": int(video.get("height", 0)),
+                "fps": fps,
+                "video_codec": video.get("codec_name"),
+                "video_profile": video.get("profile"),
+                "video_level": int(video.get("level", 0) or 0),
+                "video_extradata": video.get("extradata_hash"),
+                "constant_fps": fps > 0 and abs(self._rate(video.get("r_frame_rate")) - fps) < 0.01,
+                "pix_fmt": video.get("pix_fmt"),
+                "sample_aspect_ratio": video.get("sample_aspect_ratio", "1:1")
+            })
+
+        if audio is not None:
+            info.update({
+                "audio_codec": audio.get("codec_name"),
+                "sample_rate": int(audio.get("sample_rate", 0) or 0),
+                "channels": int(audio.get("channels", 0) or 0),
+                "channel_layout": audio.get("channel_layout")
+            })
+
+        return info
+
+    def _rate(self, value: Optional[str]) -> float:
+        num, _, den = (value or "0/1").partition("/")
+        try:
+            return float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            return 0.0
+
+    def duration_ms(self, path: str) -> int:
+        return int(self.probe(path)["duration"] * 1000)
+
+    def dimensions(self, path: str) -> Tuple[int, int]:
+        info = self.probe(path)
+        return info["width"], info["height"]
+
+    def fps(self, path: str) -> float:
+        return self.probe(path)["fps"]
+
+    def audio_layout(self, path: str) -> Optional[dict]:
+        info = self.probe(path)
+        if not info["has_audio"]:
+            return None
+        return {
+            "codec": info["audio_codec"],
+            "sample_rate": info["sample_rate"],
+            "channels": info["channels"],
+            "channel_layout": info["channel_layout"]
+        }
+
+    def keyframes(self, path: str) -> List[float]:
+        info = self.probe(path)
+        if info["keyframes"] is not None:
+            return info["keyframes"]
+        if not info["has_video"]:
+            return []
+
+        # indexul de keyframe-uri cere citirea tuturor pachetelor, deci se face doar la cerere
+        cmd = [
+            "ffprobe", "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Eroare ffprobe: {result.stderr}")
+
+        keyframes = []
+        for line in result.stdout.splitlines():
+            pts_time, _, flags = line.partition(",")
+            if "K" in flags and pts_time not in ("", "N/A"):
+                keyframes.append(float(pts_time))
+        keyframes.sort()
+
+        key = self._key(path)
+        with self._lock:
+            info = dict(info, keyframes=keyframes)
+            self._store(key, info)
+        return keyframes
@@ -0,0 +1,2 @@
+# extensiile fisierelor doar audio; importul, timeline-ul, preview-ul si exportul trebuie sa fie de acord
+AUDIO_EXT = frozenset({'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'})
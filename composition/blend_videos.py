@@ -1,10 +1,10 @@
-import subprocess
 import tempfile
 import os
 from composition.composition_interface import Composition
+from base import BaseProcessor
 from PySide6.QtCore import QTimeLine
 
-class BlendVideos(Composition):
+class BlendVideos(Composition, BaseProcessor):
     def __init__(self, otherClip: QTimeLine, alpha: float = 0.5, mode: str = "overlay"):
         self.otherClip = otherClip
         self.alpha = max(0.0, min(1.0, float(alpha)))
@@ -24,6 +24,12 @@ class BlendVideos(Composition):
         if not input_file2 or not os.path.exists(input_file2):
             raise ValueError("Al doilea videoclip nu exista")
 
+        graph = self._filter_graph(videoClip)
+        if graph is not None:
+            blend_label = graph.input_label(graph.add_input(input_file2))
+            graph.add_node(f"{{src}}{blend_label}blend=all_mode={self.mode}:all_opacity={self.alpha}", "video")
+            return videoClip
+
         if original_file is None:
             videoClip.setProperty("original_file", input_file1)
             original_file = input_file1
@@ -45,7 +51,7 @@ class BlendVideos(Composition):
             output_file
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = self._run_ffmpeg(videoClip, cmd)
 
         if result.returncode != 0:
             if os.path.exists(output_file):
@@ -1,7 +1,6 @@
 from composition.composition_interface import Composition
 from base import BaseProcessor
 from PySide6.QtCore import QTimeLine
-import subprocess
 import tempfile
 import os
 
@@ -11,7 +10,22 @@ class Chorus(Composition, BaseProcessor):
         self.depth = max(0.0, min(1.0, float(depth)))
         self.mix = max(0.0, min(1.0, float(mix)))
 
+    def _audio_filter(self) -> str:
+        in_gain = 1.0 - self.mix
+        out_gain = self.mix
+        delay = self.delay_ms
+        decay = 0.4
+        speed = 0.25
+        depth = self.depth
+
+        return f"chorus={in_gain}:{out_gain}:{delay}:{decay}:{speed}:{depth}"
+
     def applyComposition(self, videoClip: QTimeLine) -> QTimeLine:
+        graph = self._filter_graph(videoClip)
+        if graph is not None:
+            graph.add_filter(self._audio_filter(), "audio")
+            return videoClip
+
         input_file = videoClip.property("input_file")
         original_file = videoClip.property("original_file")
 
@@ -22,14 +36,7 @@ class Chorus(Composition, BaseProcessor):
             videoClip.setProperty("original_file", input_file)
             original_file = input_file
 
-        in_gain = 1.0 - self.mix
-        out_gain = self.mix
-        delay = self.delay_ms
-        decay = 0.4
-        speed = 0.25
-        depth = self.depth
-        
-        audio_filter = f"chorus={in_gain}:{out_gain}:{delay}:{decay}:{speed}:{depth}"
+        audio_filter = self._audio_filter()
         filter_complex = f"[0:a]{audio_filter}[aout]"
 
         output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
@@ -47,7 +54,7 @@ class Chorus(Composition, BaseProcessor):
             output_file
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = self._run_ffmpeg(videoClip, cmd)
 
         if result.returncode != 0:
             if os.path.exists(output_file): os.unlink(output_file)
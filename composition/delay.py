@@ -1,7 +1,6 @@
 from composition.composition_interface import Composition
 from base import BaseProcessor
 from PySide6.QtCore import QTimeLine
-import subprocess
 import tempfile
 import os
 
@@ -10,7 +9,20 @@ class Delay(Composition, BaseProcessor):
         self.delay_ms = max(0, int(delay_ms))
         self.mix = max(0.0, min(1.0, float(mix)))
 
+    def _audio_filter(self) -> str:
+        in_gain = 1.0 - self.mix
+        out_gain = self.mix
+        delays = str(self.delay_ms)
+        decays = "1.0"
+
+        return f"aecho=in_gain={in_gain}:out_gain={out_gain}:delays={delays}:decays={decays}"
+
     def applyComposition(self, videoClip: QTimeLine) -> QTimeLine:
+        graph = self._filter_graph(videoClip)
+        if graph is not None:
+            graph.add_filter(self._audio_filter(), "audio")
+            return videoClip
+
         input_file = videoClip.property("input_file")
         original_file = videoClip.property("original_file")
 
@@ -21,12 +33,7 @@ class Delay(Composition, BaseProcessor):
             videoClip.setProperty("original_file", input_file)
             original_file = input_file
 
-        in_gain = 1.0 - self.mix
-        out_gain = self.mix
-        delays = str(self.delay_ms)
-        decays = "1.0"
-        
-        audio_filter = f"aecho=in_gain={in_gain}:out_gain={out_gain}:delays={delays}:decays={decays}"
+        audio_filter = self._audio_filter()
         filter_complex = f"[0:a]{audio_filter}[aout]"
 
         output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
@@ -44,7 +51,7 @@ class Delay(Composition, BaseProcessor):
             output_file
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = self._run_ffmpeg(videoClip, cmd)
 
         if result.returncode != 0:
             if os.path.exists(output_file): os.unlink(output_file)
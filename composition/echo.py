@@ -1,7 +1,6 @@
 from composition.composition_interface import Composition
 from base import BaseProcessor
 from PySide6.QtCore import QTimeLine
-import subprocess
 import tempfile
 import os
 
@@ -11,7 +10,20 @@ class Echo(Composition, BaseProcessor):
         self.decay = max(0.0, min(1.0, float(decay)))
         self.mix = max(0.0, min(1.0, float(mix)))
 
+    def _audio_filter(self) -> str:
+        in_gain = 1.0 - self.mix
+        out_gain = self.mix
+        delays = str(self.delay_ms)
+        decays = str(self.decay)
+
+        return f"aecho=in_gain={in_gain}:out_gain={out_gain}:delays={delays}:decays={decays}"
+
     def applyComposition(self, videoClip: QTimeLine) -> QTimeLine:
+        graph = self._filter_graph(videoClip)
+        if graph is not None:
+            graph.add_filter(self._audio_filter(), "audio")
+            return videoClip
+
         input_file = videoClip.property("input_file")
         original_file = videoClip.property("original_file")
 
@@ -22,12 +34,7 @@ class Echo(Composition, BaseProcessor):
             videoClip.setProperty("original_file", input_file)
             original_file = input_file
 
-        in_gain = 1.0 - self.mix
-        out_gain = self.mix
-        delays = str(self.delay_ms)
-        decays = str(self.decay)
-        
-        audio_filter = f"aecho=in_gain={in_gain}:out_gain={out_gain}:delays={delays}:decays={decays}"
+        audio_filter = self._audio_filter()
 
         filter_complex = f"[0:a]{audio_filter}[aout]"
 
@@ -47,7 +54,7 @@ class Echo(Composition, BaseProcessor):
             output_file
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = self._run_ffmpeg(videoClip, cmd)
 
         if result.returncode != 0:
             if os.path.exists(output_file):
@@ -1,11 +1,11 @@
-import subprocess
 import tempfile
 import os
 from typing import Tuple
 from composition.composition_interface import Composition
+from base import BaseProcessor
 from PySide6.QtCore import QTimeLine
 
-class Overlay(Composition):
+class Overlay(Composition, BaseProcessor):
     def __init__(self, otherClip: QTimeLine, alpha: float = 1.0, position: Tuple[int, int] = (0, 0)):
         self.otherClip = otherClip
         self.alpha = max(0.0, min(1.0, float(alpha)))
@@ -21,6 +21,18 @@ class Overlay(Composition):
         if not input_file2 or not os.path.exists(input_file2):
             raise ValueError("Al doilea videoclip nu exista")
 
+        graph = self._filter_graph(videoClip)
+        if graph is not None:
+            idx = graph.add_input(input_file2)
+            overlay_label = graph.input_label(idx)
+            x, y = self.position
+            if self.alpha < 1.0:
+                node = f"{overlay_label}format=rgba,colorchannelmixer=aa={self.alpha}[ovl{idx}];{{src}}[ovl{idx}]overlay={x}:{y}"
+            else:
+                node = f"{{src}}{overlay_label}overlay={x}:{y}"
+            graph.add_node(node, "video")
+            return videoClip
+
         if original_file is None:
             videoClip.setProperty("original_file", input_file1)
             original_file = input_file1
@@ -47,7 +59,7 @@ class Overlay(Composition):
             output_file
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = self._run_ffmpeg(videoClip, cmd)
 
         if result.returncode != 0:
             if os.path.exists(output_file):
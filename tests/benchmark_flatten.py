@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ExportWorker import ExportWorker
+
+## run from project root!
+
+class SyntheticTrack:
+    def __init__(self, clips):
+        self.clips = clips
+
+def build_timeline(total_clips, track_count=12, seed=0):
+    rng = random.Random(seed)
+    tracks = []
+    per_track = total_clips // track_count
+    for track_idx in range(track_count):
+        clips = []
+        position = rng.randint(0, 5000)
+        for n in range(per_track):
+            if rng.random() < 0.2:
+                gap = rng.randint(100, 3000)
+                clips.append({'path': 'black.jpg', 'start': position, 'duration': gap, 'is_auto_gap': True})
+                position += gap
+            duration = rng.randint(500, 8000)
+            path = f"media/source_{rng.randint(0, 40)}.mp4" if rng.random() < 0.9 else f"media/still_{n % 7}.png"
+            clips.append({'path': path, 'start': position, 'duration': duration, 'is_auto_gap': False})
+            position += duration
+        tracks.append(SyntheticTrack(clips))
+    return tracks
+
+def legacy_flattened_timeline(tracks):
+    cut_points = set()
+    cut_points.add(0)
+    visual_clips_map = []
+
+    for track_idx, track in enumerate(tracks):
+        for clip in track.clips:
+            path = clip['path']
+            is_audio_file = path.lower().endswith(('.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'))
+            is_proxy_audio = "_converted.mov" in path or "_converted.mp4" in path
+            if is_audio_file or is_proxy_audio:
+                continue
+            cut_points.add(clip['start'])
+            cut_points.add(clip['start'] + clip['duration'])
+            visual_clips_map.append({
+                'track_idx': track_idx,
+                'start': clip['start'],
+                'end': clip['start'] + clip['duration'],
+                'data': clip
+            })
+
+    sorted_points = sorted(list(cut_points))
+    segments = []
+    for i in range(len(sorted_points) - 1):
+        t_start = sorted_points[i]
+        t_end = sorted_points[i+1]
+        duration = t_end - t_start
+        if duration <= 0: continue
+        winner_clip_data = None
+        candidates = []
+        for item in visual_clips_map:
+            if item['start'] <= t_start and item['end'] >= t_end:
+                candidates.append(item)
+        candidates.sort(key=lambda x: x['track_idx'])
+        for cand in candidates:
+            clip_info = cand['data']
+            if not clip_info.get('is_auto_gap', False):
+                winner_clip_data = clip_info
+                break
+        if winner_clip_data:
+            segments.append({'path': winner_clip_data['path'], 'source_start_ms': t_start - winner_clip_data['start'],
+                             'duration_ms': duration, 'is_gap': False})
+        else:
+            segments.append({'path': None, 'source_start_ms': 0, 'duration_ms': duration, 'is_gap': True})
+    return segments
+
+def benchmark_flatten(total_clips):
+    print(f"\nFlattening {total_clips} clips...")
+    tracks = build_timeline(total_clips)
+    worker = ExportWorker(tracks, "out.mp4", "temp_render", {'.png', '.jpg'})
+
+    t0 = time.perf_counter()
+    legacy = legacy_flattened_timeline(tracks)
+    legacy_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    swept = worker._sweep_segments()
+    merged = worker._calculate_flattened_timeline()
+    sweep_time = time.perf_counter() - t0
+
+    assert swept == legacy, "Sweep-line segments differ from the legacy flattening"
+    assert merged == worker._merge_contiguous_segments(legacy), "Merged segments differ"
+    print(f"legacy: {legacy_time:.3f}s, {len(legacy)} segments")
+    print(f"sweep:  {sweep_time:.3f}s, {len(merged)} segments after merge ({legacy_time / max(sweep_time, 1e-9):.0f}x)")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    for size in sizes:
+        benchmark_flatten(size)
@@ -1,15 +1,36 @@
 import os
 import sys
 import shutil
+import tempfile
+import random
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from PySide6.QtCore import QTimeLine
+from PySide6.QtCore import QTimeLine, Signal, QEvent
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication, QWidget
 from filters import BlurFilter, EdgeDetect, KernelFiltering, NoiseReduction, Volume, Tempo
 from transformations import CropTransform, Rotate, ScaleTransform, Transpose, PaddingTransform, ChangeFPS, PlaybackSpeed
 from timing import FadeInOut
 from text_operation import DrawText
 from timeline_operation import CutVideo, ConcatVideo
 from composition import Overlay, BlendVideos, Chorus, Delay, Echo
+from base import FilterGraph, MediaProbe, FFmpegProgress, run_ffmpeg
+from base.ffmpeg_progress import CancelToken
+from RenderCache import RenderCache
+from ExportWorker import ExportWorker
+from JobScheduler import JobScheduler
+from ScrubEngine import ScrubEngine
+from FileImporterWorker import FileImporterWorker
+from AudioMixEngine import AudioMixEngine
+from AudioPlayerPool import AudioPlayerPool
+from TimelineTrackWidget import TimelineTrackWidget
+from FilterBridge import FilterBridge
+from VideoEditorUI import VideoEditorUI
+from VideoPreview import VideoPreview
 
 ## run from project root!
 
@@ -382,6 +403,744 @@ def test_echo():
     print(f"Echo passed! Output: {dest_file}")
     return timeline
 
+def test_filter_graph():
+    print("\nTesting FilterGraph...")
+    timeline = QTimeLine()
+    timeline.setProperty("input_file", "tests/test_video.mp4")
+    timeline.setProperty("filter_graph", FilterGraph("tests/test_video.mp4"))
+
+    timeline = CropTransform(x=100, y=50, width=1080, height=620).applyTransformation(timeline)
+    timeline = BlurFilter(radius=5).applyFilter(timeline)
+    timeline = Volume(gain_db=-3).applyFilter(timeline)
+    timeline = Echo(delay_ms=500, decay=0.6).applyComposition(timeline)
+
+    graph = timeline.property("filter_graph")
+    assert timeline.property("input_file") == "tests/test_video.mp4", "FilterGraph must not render per processor"
+    assert len(graph.video_steps) == 2 and len(graph.audio_steps) == 2, "FilterGraph did not collect all fragments"
+
+    output_file = graph.render()
+    assert os.path.exists(output_file), "FilterGraph output file does not exist"
+
+    dest_file = "tests/output_filter_graph.mp4"
+    shutil.copy2(output_file, dest_file)
+    print(f"FilterGraph passed! Output: {dest_file}")
+    return timeline
+
+def test_render_cache():
+    print("\nTesting RenderCache...")
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache = RenderCache(cache_dir, max_bytes=250)
+        assert RenderCache.shared(cache_dir) is RenderCache.shared(cache_dir + os.sep), "RenderCache.shared must be one instance per directory"
+
+        source = os.path.join(cache_dir, "source.mp4")
+        with open(source, "wb") as f:
+            f.write(b"source" * 10)
+        keys = cache.stack_keys(cache.source_key(source), [{'op': 'Blur', 'radius': 5}, {'op': 'Volume', 'gain': -3.0}])
+        assert cache.lookup_longest(keys) == (0, None), "Empty cache must miss"
+
+        def render(key, size):
+            temp = os.path.join(cache_dir, f"temp_{key[:6]}")
+            with open(temp, "wb") as f:
+                f.write(b"x" * size)
+            return cache.store(key, temp, os.path.join(cache_dir, f"fx_{key[:6]}.mp4"))
+
+        first = render(keys[0], 100)
+        assert cache.lookup_longest(keys) == (1, first), "Prefix of the stack was not found"
+        full = render(keys[1], 100)
+        assert cache.lookup_longest(keys) == (2, full), "Full stack was not found"
+        assert cache.stats['misses'] == 1 and cache.stats['prefix_hits'] == 1 and cache.stats['hits'] == 1
+
+        # peste limita: cel mai vechi fisier se sterge, mai putin cel folosit pe timeline
+        cache.entries[keys[0]]['last_used'] = 0
+        cache.paths_in_use = lambda: {os.path.abspath(first)}
+        other = cache.stack_keys(cache.source_key(source), [{'op': 'Blur', 'radius': 9}])
+        render(other[0], 100)
+        assert os.path.exists(first) and not os.path.exists(full), "Eviction must skip files in use"
+        assert cache.stats['evictions'] == 1
+
+        reloaded = RenderCache(cache_dir)
+        assert set(reloaded.entries) == set(cache.entries), "Index was not persisted"
+
+        # lookup-urile nu rescriu indexul imediat, doar dupa SAVE_DELAY_SEC sau la flush
+        os.remove(cache.index_path)
+        cache.lookup_longest(keys)
+        assert not os.path.exists(cache.index_path), "Lookup must not rewrite the index"
+        cache.flush()
+        assert RenderCache(cache_dir).stats == cache.stats, "flush() must persist the lookup counters"
+    finally:
+        RenderCache._shared.clear()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    print("RenderCache passed!")
+
+def _decoded_frame_hashes(path):
+    result = subprocess.run(["ffmpeg", "-v", "error", "-i", path, "-map", "0:v", "-f", "framemd5", "-"],
+                            capture_output=True, text=True)
+    assert result.returncode == 0 and not result.stderr.strip(), f"Decode errors in {path}: {result.stderr[:300]}"
+    return [line.rsplit(",", 1)[1].strip() for line in result.stdout.splitlines() if line and not line.startswith("#")]
+
+def test_export_stream_copy():
+    print("\nTesting ExportWorker stream copy...")
+    work_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(work_dir, "source.mp4")
+        still = os.path.join(work_dir, "still.png")
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc2=s=1920x1080:r=30:d=6",
+                        "-f", "lavfi", "-i", "sine=d=6", "-c:a", "aac", "-c:v", "libx264", "-profile:v", "high", "-bf", "3", "-g", "30", "-keyint_min", "30",
+                        "-sc_threshold", "0", "-pix_fmt", "yuv420p", source], check=True)
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=640x480", "-frames:v", "1", still],
+                       check=True)
+
+        class Track:
+            def __init__(self, clips):
+                self.clips = clips
+
+        def export(clips, name):
+            output = os.path.join(work_dir, name)
+            worker = ExportWorker([Track(clips)], output, os.path.join(work_dir, f"temp_{name}"), {'.png'}, max_workers=1)
+            plans = worker._plan_export_copies(worker._calculate_flattened_timeline())
+            worker.run()
+            return output, plans
+
+        # margini recodate + imagine + bucata aliniata pe keyframe: concat-ul ar amesteca SPS/PPS diferite
+        mixed, plans = export([{'path': source, 'start': 0, 'duration': 4000, 'source_in': 450},
+                               {'path': still, 'start': 4000, 'duration': 1000},
+                               {'path': source, 'start': 5000, 'duration': 1000, 'source_in': 0}], "mixed.mp4")
+        assert plans == [None, None, None], "Mixed copy + re-encode timeline must be fully re-encoded"
+        assert len(_decoded_frame_hashes(mixed)) == 180, "Mixed export has the wrong frame count"
+
+        copied, plans = export([{'path': source, 'start': 0, 'duration': 3000, 'source_in': 0},
+                                {'path': source, 'start': 3000, 'duration': 2000, 'source_in': 2000},
+                                {'path': source, 'start': 5000, 'duration': 1000, 'source_in': 5000}], "copied.mp4")
+        assert all(plans), "Keyframe-aligned cuts of one source must be stream copied"
+        source_frames = _decoded_frame_hashes(source)
+        expected = source_frames[0:90] + source_frames[60:120] + source_frames[150:180]
+        assert _decoded_frame_hashes(copied) == expected, "Stream copied export does not decode to the source frames"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("ExportWorker stream copy passed!")
+
+def test_ffmpeg_progress():
+    print("\nTesting FFmpegProgress...")
+    progress = FFmpegProgress(total_sec=3)
+    # out_time_ms are aceeasi unitate ca out_time_us (microsecunde), nu milisecunde
+    block = ["frame=45", "fps=30.00", "out_time_ms=1500000", "out_time=00:00:01.500000", "speed=2.00x"]
+    assert all(progress.feed(line + "\n") is None for line in block), "Only progress= lines close a block"
+    snapshot = progress.feed("progress=continue\n")
+    assert snapshot['out_time_sec'] == 1.5 and snapshot['fraction'] == 0.5, f"Wrong position: {snapshot}"
+    assert snapshot['fps'] == 30.0 and snapshot['speed'] == 2.0 and snapshot['eta_sec'] == 0.75
+    assert not snapshot['done']
+
+    # la inceput ffmpeg scrie N/A; valorile vechi se pastreaza
+    for line in ["out_time_us=N/A", "out_time_ms=N/A", "speed=N/A", "fps=N/A"]:
+        progress.feed(line)
+    snapshot = progress.feed("progress=continue")
+    assert snapshot['out_time_sec'] == 1.5 and snapshot['speed'] == 2.0 and snapshot['fps'] == 30.0
+
+    progress.feed("out_time_us=2900000")
+    snapshot = progress.feed("progress=end")
+    assert snapshot['done'] and snapshot['fraction'] == 1.0 and snapshot['eta_sec'] == 0.0, "progress=end must finish the job"
+    assert FFmpegProgress(total_sec=0).feed("progress=continue")['eta_sec'] is None, "Unknown duration has no ETA"
+
+    snapshots = []
+    result = run_ffmpeg(["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=160x120:r=25:d=2", "-f", "null", "-"],
+                        total_sec=2, on_progress=snapshots.append)
+    assert result.returncode == 0, result.stderr
+    assert snapshots and snapshots[-1]['done'], "run_ffmpeg did not report progress=end"
+    assert [s['out_time_sec'] for s in snapshots] == sorted(s['out_time_sec'] for s in snapshots)
+    assert abs(snapshots[-1]['out_time_sec'] - 2.0) < 0.1, f"Final position {snapshots[-1]['out_time_sec']} is not the clip length"
+    print("FFmpegProgress passed!")
+
+def test_export_single_pass():
+    print("\nTesting ExportWorker single pass...")
+    work_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(work_dir, "source.mp4")
+        still = os.path.join(work_dir, "still.png")
+        music = os.path.join(work_dir, "music.wav")
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=320x240:r=30:d=4",
+                        "-f", "lavfi", "-i", "sine=d=4", "-c:a", "aac", "-pix_fmt", "yuv420p", source], check=True)
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=640x480", "-frames:v", "1", still],
+                       check=True)
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "sine=f=880:d=3", music], check=True)
+
+        class Track:
+            def __init__(self, clips):
+                self.clips = clips
+
+        # video, gol, imagine, apoi aceeasi sursa mai departe; muzica se suprapune peste sunetul clipului
+        tracks = [Track([{'path': source, 'start': 0, 'duration': 2000, 'source_in': 0},
+                         {'path': still, 'start': 3000, 'duration': 1000},
+                         {'path': source, 'start': 4000, 'duration': 1000, 'source_in': 2500}]),
+                  Track([{'path': music, 'start': 1500, 'duration': 2000, 'source_in': 0}])]
+        output = os.path.join(work_dir, "single.mp4")
+        worker = ExportWorker(tracks, output, os.path.join(work_dir, "temp"), {'.png'}, single_pass=True)
+        cmd = worker._build_single_pass_command(worker._calculate_flattened_timeline())
+        graph = cmd[cmd.index('-filter_complex') + 1]
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+
+        assert inputs.count(source) == 2 and inputs.count(still) == 1 and inputs.count(music) == 1, \
+            f"Each source must be opened once per stream: {inputs}"
+        assert "[0:v]split=2" in graph and "trim=start=2.5:duration=1.0" in graph, "Second cut must reuse the first input"
+        assert "color=c=black:s=1920x1080:r=30:d=1.0" in graph, "Gap must be rendered as black"
+        assert "loop=loop=29:size=1" in graph, "Image must be held for exactly 30 frames"
+        assert "concat=n=4:v=1:a=0[vout]" in graph
+        assert "asplit=2" in graph and "adelay=1500|1500" in graph and "amix=inputs=3" in graph, \
+            "Overlapping audio must be delayed and mixed"
+
+        worker.MAX_SINGLE_PASS_INPUTS = 3
+        assert worker._build_single_pass_command(worker._calculate_flattened_timeline()) is None, \
+            "Too many inputs must fall back to the chunked export"
+        worker.MAX_SINGLE_PASS_INPUTS = ExportWorker.MAX_SINGLE_PASS_INPUTS
+
+        failures = []
+        worker.finished_error.connect(failures.append)
+        worker.run()
+        assert not failures, failures
+        frames = _decoded_frame_hashes(output)
+        assert len(frames) == 150, "Single pass export has the wrong frame count"
+        # luminozitatea medie pe cadru: golul e negru, imaginea nu
+        gray = subprocess.run(["ffmpeg", "-v", "error", "-i", output, "-vf", "scale=16:9,format=gray", "-f", "rawvideo", "-"],
+                              capture_output=True, check=True).stdout
+        luma = [sum(gray[i * 144:(i + 1) * 144]) / 144 for i in range(150)]
+        assert max(luma[60:90]) < 20 and min(luma[90:120]) > 40, "Gap and image are not in their own slots"
+        audio = subprocess.run(["ffmpeg", "-v", "error", "-i", output, "-map", "0:a", "-ac", "1", "-ar", "48000",
+                                "-f", "s16le", "-"], capture_output=True, check=True).stdout
+        assert abs(len(audio) / 2 / 48000 - 5.0) < 0.1, f"Audio length {len(audio) / 96000:.2f}s does not match the video"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("ExportWorker single pass passed!")
+
+def test_file_importer():
+    print("\nTesting FileImporterWorker dedup...")
+    work_dir = tempfile.mkdtemp()
+    try:
+        cache_dir = os.path.join(work_dir, "cache")
+        os.makedirs(cache_dir)
+
+        def import_file(path):
+            worker = FileImporterWorker(path, cache_dir)
+            worker.SAMPLE_BYTES = 4
+            results = []
+            worker.finished_success.connect(lambda original, cached: results.append(cached))
+            worker.run()
+            return results[0]
+
+        # acelasi continut, extensie scrisa diferit: o singura copie in cache
+        upper = os.path.join(work_dir, "clip.MP4")
+        lower = os.path.join(work_dir, "other", "clip.mp4")
+        os.makedirs(os.path.dirname(lower))
+        for path in (upper, lower):
+            with open(path, "wb") as f:
+                f.write(b"a" * 64)
+        cached = import_file(upper)
+        assert os.path.dirname(cached) == cache_dir and cached.endswith(".mp4")
+        assert import_file(lower) == cached, "Same media was cached twice"
+
+        # aceeasi marime si aceleasi esantioane, alt continut la mijloc: nu se confunda
+        different = os.path.join(work_dir, "other", "clip2.mp4")
+        with open(different, "wb") as f:
+            f.write(b"a" * 16 + b"b" * 8 + b"a" * 40)
+        other = import_file(different)
+        assert other != cached, "Different content resolved to the cached file of another recording"
+        with open(other, "rb") as f:
+            assert b"b" in f.read()
+        assert len(os.listdir(cache_dir)) == 2
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("FileImporterWorker dedup passed!")
+
+def _wait_for(condition, timeout=10):
+    app = QApplication.instance() or QApplication([])
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for scheduler callbacks"
+        app.processEvents()
+        time.sleep(0.01)
+
+def test_job_scheduler():
+    print("\nTesting JobScheduler...")
+    scheduler = JobScheduler(max_workers=2)
+    try:
+        order = []
+        done = []
+        first_gate, second_gate = threading.Event(), threading.Event()
+        started = threading.Semaphore(0)
+
+        def blocker(job, gate):
+            started.release()
+            gate.wait(10)
+
+        def record(job, name):
+            order.append(name)
+            return name
+
+        # ambii workeri ocupati, ca ordinea din coada sa se vada la eliberare
+        scheduler.submit(blocker, first_gate)
+        scheduler.submit(blocker, second_gate)
+        assert started.acquire(timeout=5) and started.acquire(timeout=5)
+        for name, priority in [("background", JobScheduler.PRIORITY_BACKGROUND), ("normal_1", JobScheduler.PRIORITY_NORMAL),
+                               ("interactive", JobScheduler.PRIORITY_INTERACTIVE), ("normal_2", JobScheduler.PRIORITY_NORMAL)]:
+            scheduler.submit(record, name, priority=priority, on_done=done.append)
+        cancelled = scheduler.submit(record, "cancelled", priority=JobScheduler.PRIORITY_INTERACTIVE,
+                                     on_done=done.append, on_error=done.append)
+        scheduler.cancel(cancelled)
+
+        first_gate.set()
+        _wait_for(lambda: len(done) == 4)
+        assert order == ["interactive", "normal_1", "normal_2", "background"], f"Wrong execution order: {order}"
+        assert sorted(done) == sorted(order), "on_done must get the job result"
+        second_gate.set()
+        _wait_for(lambda: scheduler.pending_count() == 0)
+        assert "cancelled" not in order, "Cancelled job was executed"
+
+        # un worker ramane liber pentru joburile interactive cat timp ruleaza joburi de fundal
+        background_gate = threading.Event()
+        for _ in range(2):
+            scheduler.submit(blocker, background_gate, priority=JobScheduler.PRIORITY_BACKGROUND)
+        assert started.acquire(timeout=5)
+        assert not started.acquire(timeout=0.3), "Background jobs took every worker"
+        result = []
+        scheduler.submit(lambda job: "ready", priority=JobScheduler.PRIORITY_INTERACTIVE, on_done=result.append)
+        _wait_for(lambda: result == ["ready"])
+        background_gate.set()
+        assert started.acquire(timeout=5)
+
+        errors = []
+        def fail(job):
+            raise ValueError("broken input")
+        scheduler.submit(fail, on_error=errors.append, on_done=done.append)
+        _wait_for(lambda: errors == ["broken input"])
+    finally:
+        scheduler.shutdown()
+
+    # shared() cerut simultan din mai multe thread-uri: o singura instanta, in thread-ul principal
+    instances = []
+    barrier = threading.Barrier(8)
+    def fetch():
+        barrier.wait()
+        instances.append(JobScheduler.shared())
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(s) for s in instances}) == 1, "Concurrent shared() calls created several schedulers"
+    assert instances[0].thread() == QApplication.instance().thread(), "Shared scheduler must live in the main thread"
+    print("JobScheduler passed!")
+
+def test_media_probe():
+    print("\nTesting MediaProbe cache...")
+    cache_dir = tempfile.mkdtemp()
+    try:
+        clip = os.path.join(cache_dir, "clip.mp4")
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=320x240:r=25:d=1",
+                        "-pix_fmt", "yuv420p", clip], check=True)
+        probe = MediaProbe(cache_dir)
+        probe.SAVE_DELAY_SEC = 60
+        first_key = probe._key(clip)
+        assert probe.dimensions(clip) == (320, 240)
+        assert probe.probe(clip) is probe.entries[first_key], "Second probe of an unchanged file must hit the cache"
+        assert not os.path.exists(probe.index_path), "Index must be saved on a debounce, not after every probe"
+
+        # fisier rescris: cheia se schimba, intrarea veche dispare
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=640x480:r=25:d=2",
+                        "-pix_fmt", "yuv420p", clip], check=True)
+        os.utime(clip, ns=(os.stat(clip).st_atime_ns, os.stat(clip).st_mtime_ns + 10**9))
+        assert probe._key(clip) != first_key
+        assert probe.dimensions(clip) == (640, 480), "Changed file was served from the stale entry"
+        assert list(probe.entries) == [probe._key(clip)], "Entry for the old version of the file was not dropped"
+
+        probe.flush()
+        assert os.path.exists(probe.index_path), "flush() must write the index"
+        reloaded = MediaProbe(cache_dir)
+        assert reloaded.entries == probe.entries, "Index was not persisted"
+        os.remove(clip)
+        assert MediaProbe(cache_dir).entries == {}, "Entries of deleted files must be dropped on load"
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    print("MediaProbe cache passed!")
+
+def test_track_index():
+    print("\nTesting TimelineTrackWidget index...")
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(6)
+    track = TimelineTrackWidget()
+    pos = 0
+    for i in range(200):
+        pos += rng.choice([0, 0, rng.randint(1, 3000)])
+        duration = rng.randint(100, 5000)
+        track.insert_clip_physically({'path': f"clip_{i}.mp4", 'start': pos, 'duration': duration, 'name': f"clip_{i}", 'is_auto_gap': False})
+        pos += duration
+
+    def check():
+        clips = track.clips
+        user = [(i, c['start'], c['start'] + c['duration']) for i, c in enumerate(clips) if not c.get('is_auto_gap', False)]
+        end = max([e for _, _, e in user], default=0)
+        assert track.get_content_end_ms() == end, "Content end differs from a linear scan"
+        for _ in range(300):
+            ms = rng.randint(-100, end + 1000)
+            linear = next((c for c in clips if c['start'] <= ms < c['start'] + c['duration']), None)
+            assert track.get_clip_at_ms(ms) is linear, f"Clip lookup at {ms} differs from a linear scan"
+            left = track.ms_to_px(ms) + rng.randint(-50, 50)
+            right = left + rng.choice([0, 1, 511, rng.randint(0, 5000)])
+            drawn = [i for i, c in enumerate(clips) if not (track.ms_to_px(c['start']) + track.ms_to_px(c['duration']) < left
+                                                             or track.ms_to_px(c['start']) > right)]
+            assert sorted(track.clips_in_px_range(left, right)) == drawn, f"Visible clips in {left}..{right} differ"
+            boundaries = [v for _, s, e in user for v in (s, e) if v > ms]
+            assert track.next_boundary_after(ms) == (min(boundaries) if boundaries else None), f"Next boundary after {ms} differs"
+
+            duration = rng.randint(50, 4000)
+            exclude = rng.choice([-1, rng.choice(user)[0]])
+            overlap = any(s < ms + duration and e > ms for i, s, e in user if i != exclude)
+            assert track.is_overlapping(ms, duration, exclude) == overlap, f"Overlap at {ms} differs from a linear scan"
+
+            # la egalitate intre doua puncte indexul poate alege altul, dar distanta trebuie sa fie aceeasi
+            threshold = track.px_to_ms(15)
+            points = [0] + [v for i, s, e in user if i != exclude for v in (s, e)]
+            diffs = [abs(ms - p) for p in points] + [abs(ms + duration - p) for p in points]
+            best = min(d for d in diffs if d < threshold) if min(diffs) < threshold else None
+            snapped, indicator = track._calculate_snap_position(ms, duration, exclude)
+            if best is None:
+                assert indicator is None and snapped == ms, f"Snap at {ms} must not move the clip"
+            else:
+                assert indicator is not None and abs(snapped - ms) == best, f"Snap at {ms} differs from a linear scan"
+
+    check()
+    # mutatorii modifica start-ul pe loc si pastreaza numarul de clipuri; indexul trebuie totusi refacut
+    track.shift_clips_after(track.get_content_end_ms() // 2, 1234)
+    check()
+    victim = next(c for c in track.clips if not c.get('is_auto_gap', False))
+    assert track.remove_clip_by_path_and_start(victim['path'], victim['start'])
+    check()
+    track.set_duration_and_fill_gaps(track.get_content_end_ms() + 5000)
+    check()
+    for zoom in (3, 400):
+        track.pixels_per_second = zoom
+        check()
+    print("TimelineTrackWidget index passed!")
+
+def test_split_clip():
+    print("\nTesting nondestructive split...")
+    app = QApplication.instance() or QApplication([])
+    track = TimelineTrackWidget()
+    filters = [{'op': 'Blur', 'radius': 5}]
+    track.insert_clip_physically({'path': "fx_clip.mp4", 'original_path': "clip.mp4", 'start': 1000, 'duration': 4000,
+                                  'source_in': 2000, 'source_out': 6000, 'filters': filters, 'name': "clip.mp4", 'is_auto_gap': False})
+    track.selected_index = next(i for i, c in enumerate(track.clips) if not c.get('is_auto_gap', False))
+    track.playhead_pos_ms = 2500
+    assert track.split_clip_at_playhead()
+
+    part1, part2 = [c for c in track.clips if not c.get('is_auto_gap', False)]
+    assert (part1['start'], part1['duration'], part1['source_in'], part1['source_out']) == (1000, 1500, 2000, 3500)
+    assert (part2['start'], part2['duration'], part2['source_in'], part2['source_out']) == (2500, 2500, 3500, 6000)
+    for part in (part1, part2):
+        assert part['path'] == "fx_clip.mp4" and part['original_path'] == "clip.mp4" and part['filters'] == filters, "Split lost clip fields"
+
+    # a doua taiere, pe partea a doua, porneste de la source_in-ul ei, nu de la inceputul fisierului
+    track.selected_index = track.clips.index(part2)
+    track.playhead_pos_ms = 4000
+    assert track.split_clip_at_playhead()
+    parts = [c for c in track.clips if not c.get('is_auto_gap', False)]
+    assert [(c['source_in'], c['source_out']) for c in parts] == [(2000, 3500), (3500, 5000), (5000, 6000)]
+    assert sum(c['duration'] for c in parts) == 4000
+
+    # un clip mutat pe alt track prin suprapunere isi pastreaza toate campurile
+    other = TimelineTrackWidget()
+    other.insert_clip_physically(dict(parts[1], start=0))
+    moved = next(c for c in other.clips if not c.get('is_auto_gap', False))
+    assert moved['start'] == 0 and all(moved[k] == parts[1][k] for k in ('source_in', 'source_out', 'filters', 'original_path'))
+    print("Nondestructive split passed!")
+
+class _FilterJobsHost(QWidget):
+    # doar partea din VideoEditorUI care leaga token-urile de clipuri, fara restul interfetei
+    request_filter_processing = Signal(str, dict, object)
+
+    _filter_source = VideoEditorUI._filter_source
+    _start_filter_processing = VideoEditorUI._start_filter_processing
+    _cancel_filter_jobs = VideoEditorUI._cancel_filter_jobs
+    _close_filter_dialog = VideoEditorUI._close_filter_dialog
+    _filter_job_done = VideoEditorUI._filter_job_done
+    _on_filter_finished = VideoEditorUI._on_filter_finished
+    _apply_filtered_clips = VideoEditorUI._apply_filtered_clips
+    _on_filter_cancelled = VideoEditorUI._on_filter_cancelled
+    _on_filter_error = VideoEditorUI._on_filter_error
+
+    def __init__(self, bridge):
+        super().__init__()
+        self.filter_bridge = bridge
+        self.filter_loading_dialog = None
+        self.filter_jobs = {}
+        self.filter_errors = []
+        self.filter_job_count = 0
+        self.timeline_container = SimpleNamespace(_get_file_duration=lambda path: 1000,
+                                                  attach_proxy=lambda clip: None,
+                                                  time_slider=SimpleNamespace(value=lambda: 0))
+        self.request_filter_processing.connect(bridge.process_clip)
+        bridge.processing_finished.connect(self._on_filter_finished)
+        bridge.processing_error.connect(self._on_filter_error)
+        bridge.processing_cancelled.connect(self._on_filter_cancelled)
+
+    def _synchronize_preview_with_timeline(self, pos):
+        pass
+
+def test_filter_batch():
+    print("\nTesting batch filter processing...")
+    app = QApplication.instance() or QApplication([])
+    work_dir = tempfile.mkdtemp()
+    try:
+        sources = []
+        for name in ("a.mp4", "b.mp4"):
+            path = os.path.join(work_dir, name)
+            subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=160x120:r=30:d=1",
+                            "-c:v", "libx264", "-pix_fmt", "yuv420p", path], check=True)
+            sources.append(path)
+
+        # un singur worker: al doilea job asteapta in coada si vede anularea inainte sa porneasca
+        bridge = FilterBridge(os.path.join(work_dir, "cache"), max_workers=1)
+        host = _FilterJobsHost(bridge)
+        track = TimelineTrackWidget()
+        for n, path in enumerate(sources):
+            track.insert_clip_physically({'path': path, 'start': n * 1000, 'duration': 1000, 'source_in': 0,
+                                          'source_out': 1000, 'name': os.path.basename(path), 'is_auto_gap': False})
+        clip_a, clip_b = [c for c in track.clips if not c.get('is_auto_gap', False)]
+        filter_stack = {'Filters': {'Video': {'Blur': {'enabled': True, 'Radius': 2}}}}
+
+        host._start_filter_processing([(track, clip_a), (track, clip_b)], filter_stack)
+        assert len(host.filter_jobs) == 2, "Expected one job per source"
+        token_b = next(t for t, (p, _) in host.filter_jobs.items() if p == sources[1])
+        token_b.cancel()
+
+        _wait_for(lambda: not host.filter_jobs and clip_a['path'] != sources[0], timeout=60)
+        assert os.path.exists(clip_a['path']) and "_FX_" in os.path.basename(clip_a['path']), \
+            f"Surviving clip was not updated: {clip_a['path']}"
+        assert clip_a['original_file'] == sources[0]
+        # clipul anulat ramane pe sursa lui, fara filtre
+        assert clip_b['path'] == sources[1] and 'original_file' not in clip_b, "Cancelled clip was modified"
+        assert not host.filter_errors, f"Unexpected filter errors: {host.filter_errors}"
+        bridge.shutdown()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("Batch filter processing passed!")
+
+class _RecordingScheduler:
+    # tine joburile in asteptare ca testul sa vada exact ce s-a cerut si ce s-a anulat
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, key, priority=JobScheduler.PRIORITY_NORMAL):
+        job = CancelToken()
+        self.jobs.append((key, priority, job))
+        return job
+
+    def live_chunks(self):
+        return sorted(key[1] for key, _, job in self.jobs if not job.cancelled)
+
+def test_scrub_engine():
+    print("\nTesting ScrubEngine...")
+    app = QApplication.instance() or QApplication([])
+    chunk_ms = ScrubEngine.FRAMES_PER_CHUNK * 1000 // ScrubEngine.FPS
+
+    # schimbarea directiei anuleaza bucatile prefetch ramase in urma, nu si pe cea de sub playhead
+    scheduler = _RecordingScheduler()
+    engine = ScrubEngine(scheduler)
+    engine.request("a.mp4", 5 * chunk_ms, direction=1)
+    assert scheduler.live_chunks() == [5, 6, 7], f"Unexpected forward prefetch: {scheduler.live_chunks()}"
+    assert [p for (_, c), p, _ in scheduler.jobs if c == 5] == [JobScheduler.PRIORITY_INTERACTIVE]
+    engine.request("a.mp4", 5 * chunk_ms, direction=-1)
+    assert scheduler.live_chunks() == [3, 4, 5], f"Stale chunks survived reversal: {scheduler.live_chunks()}"
+    assert [c for (_, c), _, _ in scheduler.jobs].count(5) == 1, "Chunk under the playhead was resubmitted"
+    assert sorted(c for (_, c), _, job in scheduler.jobs if job.cancelled) == [6, 7]
+    # alt fisier sub playhead: tot ce era pentru sursa veche se anuleaza
+    engine.request("b.mp4", 0, direction=1)
+    assert all(job.cancelled for (path, _), _, job in scheduler.jobs if path == "a.mp4")
+    assert set(engine._pending) == {("b.mp4", 0), ("b.mp4", 1), ("b.mp4", 2)}
+
+    # cache-ul nu trece de MAX_FRAMES si pastreaza cadrele din jurul playhead-ului, din sursa curenta
+    image = QImage(4, 4, QImage.Format_RGB888)
+    engine._store("a.mp4", 0, [image] * ScrubEngine.FRAMES_PER_CHUNK)
+    focus = 10 * ScrubEngine.FRAMES_PER_CHUNK
+    engine.request("b.mp4", focus * 1000 / ScrubEngine.FPS)
+    for chunk in range(4, 16):
+        engine._store("b.mp4", chunk * ScrubEngine.FRAMES_PER_CHUNK, [image] * ScrubEngine.FRAMES_PER_CHUNK)
+        assert len(engine._frames) <= ScrubEngine.MAX_FRAMES, f"Frame cache grew to {len(engine._frames)}"
+    assert len(engine._frames) == ScrubEngine.MAX_FRAMES
+    assert all(path == "b.mp4" for path, _ in engine._frames), "Frames of the previous source were kept"
+    kept = sorted(i for _, i in engine._frames)
+    assert max(abs(i - focus) for i in kept) <= ScrubEngine.MAX_FRAMES // 2, "Kept frames far from the playhead"
+    assert engine.frame_at("b.mp4", focus * 1000 / ScrubEngine.FPS) is image
+    engine.shutdown()
+
+    # decodare reala: bucata de sub playhead ajunge in cache la rezolutia de scrub
+    work_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(work_dir, "scrub.mp4")
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=320x240:r=30:d=3",
+                        "-c:v", "libx264", "-pix_fmt", "yuv420p", path], check=True)
+        engine = ScrubEngine(JobScheduler(max_workers=2))
+        engine.request(path, 500)
+        _wait_for(lambda: engine.frame_at(path, 500) is not None, timeout=30)
+        frame = engine.frame_at(path, 500)
+        assert (frame.width(), frame.height()) == (ScrubEngine.FRAME_WIDTH, ScrubEngine.FRAME_HEIGHT)
+        _wait_for(lambda: not engine._pending, timeout=30)
+        # fisierul are 3s = 36 de cadre; bucata a treia e dupa final si nu se mai cere
+        assert len(engine._frames) == 36, f"Unexpected decoded frame count: {len(engine._frames)}"
+        assert (path, 2) in engine._empty_chunks
+        engine.shutdown()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("ScrubEngine passed!")
+
+def test_preloaded_timeline_tab():
+    print("\nTesting VideoPreview preloaded tab...")
+    app = QApplication.instance() or QApplication([])
+    work_dir = tempfile.mkdtemp()
+    try:
+        clip_a, clip_b = os.path.join(work_dir, "current.mp4"), os.path.join(work_dir, "next.mp4")
+        for path in (clip_a, clip_b):
+            subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=s=160x120:r=30:d=3",
+                            "-c:v", "libx264", "-pix_fmt", "yuv420p", path], check=True)
+        preview = VideoPreview(5)
+        deleted = []
+
+        first = preview.preload_timeline_tab(clip_a, 1500)
+        first.destroyed.connect(lambda: deleted.append("first"))
+        assert preview.preloaded_timeline_tab is first and first._preload_pos == 1500
+        # acelasi clip doar se repozitioneaza, nu se deschide din nou
+        assert preview.preload_timeline_tab(clip_a, 2000) is first and first._preload_pos == 2000
+
+        # alt clip cerut in avans: tabul nefolosit se opreste si se elibereaza
+        second = preview.preload_timeline_tab(clip_b, 0)
+        assert preview.preloaded_timeline_tab is second
+        assert first.player.source().isEmpty(), "Discarded tab still holds its source"
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        assert deleted == ["first"], "Discarded tab was not deleted"
+
+        # timeline-ul a sarit pe alt clip: cel preincarcat ramane nefolosit pana la discard
+        loaded = preview.load_into_timeline_tab(clip_a)
+        assert loaded is not second and preview.preloaded_timeline_tab is second
+        second.destroyed.connect(lambda: deleted.append("second"))
+        preview.discard_preloaded_tab()
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        assert preview.preloaded_timeline_tab is None and deleted == ["first", "second"]
+        assert not loaded.player.source().isEmpty(), "Discard touched the tab in use"
+        assert preview.main_timeline_tab is loaded
+
+        # clipul preincarcat si folosit devine tabul timeline-ului, iar discard nu il mai atinge
+        third = preview.preload_timeline_tab(clip_b, 500)
+        assert preview.load_into_timeline_tab(clip_b) is third
+        assert preview.preloaded_timeline_tab is None and preview.main_timeline_tab is third
+        preview.discard_preloaded_tab()
+        assert not third.player.source().isEmpty(), "Discard cleaned up the tab that was used"
+        preview.reset_timeline_to_black()
+        preview.deleteLater()
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("VideoPreview preloaded tab passed!")
+
+def test_audio_mix_engine():
+    print("\nTesting AudioMixEngine.mix...")
+    engine = AudioMixEngine()
+    if not engine.available:
+        print("numpy missing, AudioMixEngine skipped")
+        return
+    import numpy as np
+    engine.BLOCK_SEC = 1
+    frames = engine.block_frames
+
+    # sursa = zgomot stereo, canalul drept inversat; fiecare bloc se pune direct in cache, fara ffmpeg
+    noise = np.random.default_rng(25).integers(-8000, 8000, 3 * frames).astype(np.int16)
+    source = np.stack([noise, -noise], axis=1)
+    for path in ("a.wav", "b.wav"):
+        for block in range(3):
+            engine._store((path, block), source[block * frames:(block + 1) * frames])
+
+    sources = [{'path': "a.wav", 'start_ms': 1000, 'end_ms': 3000, 'in_ms': 500, 'gain': 0.5},
+               {'path': "b.wav", 'start_ms': 2000, 'end_ms': 2500, 'in_ms': 0, 'gain': 2.0}]
+    engine.set_sources(sources)
+    out = engine.mix(0, engine.ms_to_frames(4000))
+    assert out.dtype == np.int16 and out.shape == (engine.ms_to_frames(4000), 2)
+
+    expected = np.zeros(out.shape, dtype=np.float32)
+    for src in sources:
+        start, end, first = (engine.ms_to_frames(src[k]) for k in ('start_ms', 'end_ms', 'in_ms'))
+        expected[start:end] += source[first:first + end - start] / 32768.0 * src['gain']
+    expected = np.clip(expected, -1.0, 1.0) * 32767
+    # sursa a trece peste granita de bloc la 1.5 s pe timeline; nu trebuie sa apara niciun salt
+    assert np.abs(out.astype(np.float32) - expected).max() <= 1, "Mix does not match the offset and gain of each source"
+    assert engine.stats['underruns'] == 0
+
+    # o bucata ceruta la mijloc da acelasi rezultat ca mixul intreg
+    part = engine.mix(engine.ms_to_frames(1900), 9600)
+    assert np.array_equal(part, out[engine.ms_to_frames(1900):engine.ms_to_frames(1900) + 9600])
+
+    # la viteza 2 se scrie fiecare al doilea cadru al mixului, iar cursorul merge de doua ori mai repede
+    engine._cursor = engine.ms_to_frames(1200)
+    engine._speed = 2.0
+    fast = engine.render(4800)
+    assert np.abs(fast.astype(np.int32) - out[engine.ms_to_frames(1200):engine.ms_to_frames(1400):2]).max() <= 1, \
+        "2x playback must resample the timeline mix"
+    assert engine._cursor == engine.ms_to_frames(1400)
+    engine._speed = 0.5
+    slow = engine.render(4800)
+    assert np.array_equal(slow[::2], out[engine.ms_to_frames(1400):engine.ms_to_frames(1450)])
+    engine._speed = 1.0
+
+    # suma peste 0 dBFS se taie, nu se intoarce prin overflow
+    engine.set_sources([{'path': "a.wav", 'start_ms': 0, 'end_ms': 1000, 'gain': 100.0}])
+    loud = engine.mix(0, frames)
+    assert loud.max() == 32767 and loud.min() == -32767, "Mix must clip instead of wrapping around"
+
+    # bloc lipsa: liniste si underrun contorizat
+    engine.set_sources([{'path': "missing.wav", 'start_ms': 0, 'end_ms': 1000}])
+    assert not engine.mix(0, 4800).any() and engine.stats['underruns'] == 1
+    engine.shutdown()
+    print("AudioMixEngine.mix passed!")
+
+def test_audio_player_pool():
+    print("\nTesting AudioPlayerPool...")
+    app = QApplication.instance() or QApplication([])
+    pool = AudioPlayerPool(max_players=3)
+    try:
+        a = pool.acquire("a", "a.mp3", 0)
+        b = pool.acquire("b", "b.mp3", 0)
+        c = pool.acquire("c", "c.mp3", 0)
+        assert len({id(a), id(b), id(c)}) == 3 and pool.stats['created'] == 3
+        assert pool.acquire("a", "a.mp3", 500) is a and pool.stats['reused'] == 1, "Same key and path must reuse the player"
+
+        # la capacitate: se scoate cel mai vechi player neprotejat; ordinea LRU e acum b, c, a
+        d = pool.acquire("d", "d.mp3", 0, protected={"b", "d"})
+        assert d is c and pool.stats['evicted'] == 1 and pool.stats['created'] == 3, "Protected or recently used player was evicted"
+        assert d.pool_path == "d.mp3"
+        assert pool.acquire("e", "e.mp3", 0, protected={"a", "b", "d", "e"}) not in (a, b, d), "Protected players must never be taken"
+        assert pool.metrics()['loaded'] == 4, "All players protected: the pool may grow past capacity"
+
+        # peste capacitate, set_active elibereaza cele mai vechi inactive (ordinea LRU: b, a, d, e)
+        pool.set_active({"d", "e"})
+        metrics = pool.metrics()
+        assert metrics['loaded'] == 3 and metrics['released'] == 1 and list(pool._players) == ["a", "d", "e"], f"Wrong trim: {metrics}"
+        assert [p.pool_active for p in pool._players.values()] == [False, True, True]
+
+        # un player inactiv care are deja sursa deschisa se preia fara reincarcare
+        reloaded = pool.stats['reloaded']
+        assert pool.acquire("a2", "a.mp3", 0, protected={"a2"}) is a and pool.stats['reloaded'] == reloaded
+        warm = pool.prewarm("f", "f.mp3", 1500, protected={"e", "a2", "f"})
+        assert warm is d and pool.stats['evicted'] == 2, "Prewarm must evict the least recently used unprotected player"
+        assert warm.audioOutput().volume() == 0 and not warm.pool_active and pool.stats['prewarmed'] == 1
+        assert pool.prewarm("f", "f.mp3", 1500) is warm and pool.stats['prewarmed'] == 1
+
+        e = pool._players["e"]
+        pool.release_missing({"a2", "f"})
+        assert list(pool._players) == ["a2", "f"] and pool.metrics()['free'] == 1
+        assert e.pool_path is None and not e.pool_active
+        created = pool.stats['created']
+        assert pool.acquire("g", "g.mp3", 0) is e and pool.stats['created'] == created, "Free player was not reused"
+    finally:
+        pool.clear()
+    assert pool.metrics()['live'] == 0
+    print("AudioPlayerPool passed!")
+
 if __name__ == "__main__":
     print("=" * 60)
     print("TESTING ALL MODULES")
@@ -410,6 +1169,21 @@ if __name__ == "__main__":
         test_chorus()
         test_delay()
         test_echo()
+        test_filter_graph()
+        test_render_cache()
+        test_file_importer()
+        test_job_scheduler()
+        test_ffmpeg_progress()
+        test_media_probe()
+        test_export_stream_copy()
+        test_export_single_pass()
+        test_track_index()
+        test_split_clip()
+        test_filter_batch()
+        test_scrub_engine()
+        test_preloaded_timeline_tab()
+        test_audio_mix_engine()
+        test_audio_player_pool()
 
         print("\n" + "=" * 60)
         print("ALL TESTS PASSED!")
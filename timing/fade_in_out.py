@@ -1,6 +1,5 @@
-import subprocess
-import json
 from timing.timing_interface import Timing
+from base.media_probe import MediaProbe
 from PySide6.QtCore import QTimeLine
 
 class FadeInOut(Timing):
@@ -12,35 +11,26 @@ class FadeInOut(Timing):
             raise ValueError("Type trebuie sa fie 'in', 'out' sau 'both'")
 
     def _get_video_duration(self, input_file: str) -> float:
-        cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "json",
-            input_file
-        ]
+        return MediaProbe.shared().probe(input_file)["duration"]
 
-        result  = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Eroare ffprobe: {result.stderr}")
-
-        data = json.loads(result.stdout)
-        return float(data["format"]["duration"])
+    def _get_stream_duration(self, qTimeLine: QTimeLine) -> float:
+        video_duration = self._get_video_duration(qTimeLine.property("input_file"))
+        graph = self._filter_graph(qTimeLine)
+        if graph is not None:
+            video_duration *= graph.time_scale
+        return video_duration
 
     def applyOperation(self, qTimeLine: QTimeLine) -> QTimeLine:
-        input_file = qTimeLine.property("input_file")
-
         if self.type == "in":
             filter_str = f"fade=t=in:st=0:d={self.duration}"
 
         elif self.type == "out":
-            video_duration = self._get_video_duration(input_file)
+            video_duration = self._get_stream_duration(qTimeLine)
             start_time = video_duration - self.duration
             filter_str = f"fade=t=out:st={start_time}:d={self.duration}"
 
         else:
-            video_duration = self._get_video_duration(input_file)
+            video_duration = self._get_stream_duration(qTimeLine)
             start_time = video_duration - self.duration
             filter_str = f"fade=t=in:st=0:d={self.duration},fade=t=out:st={start_time}:d={self.duration}"
 
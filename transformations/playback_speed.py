@@ -6,6 +6,10 @@ class PlaybackSpeed(Transformations):
         self.factor = max(0.5, min(4.0, float(factor)))
 
     def applyTransformation(self, qTimeLine: QTimeLine) -> QTimeLine:
+        graph = self._filter_graph(qTimeLine)
+        if graph is not None:
+            graph.time_scale /= self.factor
+
         video_pts = 1.0 / self.factor
         video_filter = f"setpts={video_pts}*PTS"
         qTimeLine = self._apply_ffmpeg(qTimeLine, video_filter, "video")